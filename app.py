@@ -2,8 +2,9 @@ import tkinter as tk
 from components.font.font_manager import FontManager
 from components.menu_actions.paragraph_actions import CodeBlockAction, HeadingAction, OrderedListAction, QuoteAction, UnorderedListAction
 from components.menu_actions.theme_actions import FontSelectAction, FontSizeDecreaseAction, FontSizeIncreaseAction, FontSizeResetAction
-from components.menu_actions.view_actions import ToggleRenderModeAction
+from components.menu_actions.view_actions import CommandPaletteAction, NextSectionAction, PreviousSectionAction, ToggleOutlineAction, ToggleRenderModeAction, ToggleSidebarAction
 from core.component_manager import ComponentManager
+from core.startup_profiler import StartupProfiler
 from core.layout_manager import LayoutManager
 from components.toolbar.menu_manager import MenuManager
 from components.toolbar.component_tool import ComponentTool
@@ -11,23 +12,94 @@ from components.statusbar.component_status import ComponentStatus
 from components.notebook.component_notebook import ComponentNotebook
 from components.notebook.component_text_area import ComponentTextArea
 from components.notebook.component_render_area import ComponentRenderArea
+from components.outline.component_outline import ComponentOutline
+from components.highlight.component_highlighter import ComponentHighlighter
+from components.undo.component_undo import ComponentUndo
+from components.search.component_search import ComponentSearch
+from components.project_search.component_project_search import ComponentProjectSearch
 from components.editor.component_editor import TextEditor
-from components.menu_actions.file_actions import NewFileAction, OpenFileAction, SaveAsFileAction, SaveFileAction
-from components.menu_actions.edit_actions import CopyAction, PasteAction, CutAction
+from components.session.component_session import ComponentSession
+from components.palette.component_command_palette import ComponentCommandPalette
+from components.quick_open.component_quick_open import ComponentQuickOpen
+from components.menu_actions.file_actions import CloseTabAction, NewFileAction, OpenFileAction, QuickOpenAction, SaveAsFileAction, SaveFileAction
+from components.menu_actions.edit_actions import CopyAction, PasteAction, CutAction, FindAction, FindNextAction, FindPreviousAction, ProjectSearchAction, RedoAction, ReplaceAction, UndoAction
 from components.menu_actions.format_actions import StrikeAction, StrongAction, EmphasisAction, UnderlineAction, CodeAction
 
+# 主题菜单中提供的常用字体
+COMMON_FONTS = ["微软雅黑", "宋体", "黑体", "Arial", "Times New Roman", "Courier New"]
+
+# 菜单动作组件 {组件名: 组件类}，均在首次使用时才创建
+MENU_ACTIONS = {
+    "new_file_action": NewFileAction,
+    "open_file_action": OpenFileAction,
+    "quick_open_action": QuickOpenAction,
+    "close_tab_action": CloseTabAction,
+    "save_file_action": SaveFileAction,
+    "save_as_file_action": SaveAsFileAction,
+    "copy_action": CopyAction,
+    "paste_action": PasteAction,
+    "cut_action": CutAction,
+    "undo_action": UndoAction,
+    "redo_action": RedoAction,
+    "find_action": FindAction,
+    "replace_action": ReplaceAction,
+    "find_next_action": FindNextAction,
+    "find_previous_action": FindPreviousAction,
+    "project_search_action": ProjectSearchAction,
+    "strong_action": StrongAction,
+    "emphasis_action": EmphasisAction,
+    "underline_action": UnderlineAction,
+    "code_action": CodeAction,
+    "strike_action": StrikeAction,
+    "toggle_render_mode_action": ToggleRenderModeAction,
+    "toggle_sidebar_action": ToggleSidebarAction,
+    "toggle_outline_action": ToggleOutlineAction,
+    "next_section_action": NextSectionAction,
+    "previous_section_action": PreviousSectionAction,
+    "command_palette_action": CommandPaletteAction,
+    "heading_action": HeadingAction,
+    "quote_action": QuoteAction,
+    "unordered_list_action": UnorderedListAction,
+    "ordered_list_action": OrderedListAction,
+    "code_block_action": CodeBlockAction,
+    "font_size_increase_action": FontSizeIncreaseAction,
+    "font_size_decrease_action": FontSizeDecreaseAction,
+    "font_size_reset_action": FontSizeResetAction,
+}
+
+
+def font_action_name(font_name: str) -> str:
+    """字体选择动作的组件名"""
+    safe_name = font_name.replace(" ", "_").replace("-", "_")
+    return f"font_{safe_name}_action"
+
+
 class MarkdownEditorApp:
     """主应用类"""
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Berrypad")
-        self.root.geometry("1200x700")
-        self.root.iconbitmap("berrypad.ico")
+    def __init__(self, restore_session: bool = True):
+        """
+        Args:
+            restore_session: 是否恢复上次的会话（基准测试等场景传入 False，从欢迎页开始）
+        """
+        self.restore_session = restore_session
+        self.profiler = StartupProfiler()
+        with self.profiler.measure("tk_root"):
+            self.root = tk.Tk()
+            self.root.title("Berrypad")
+            self.root.geometry("1200x700")
+            try:
+                self.root.iconbitmap("berrypad.ico")
+            except tk.TclError:
+                pass  # X11 不支持 .ico 图标，忽略即可
+        self.profiler.watch(self.root)
+
         # 初始化核心组件
-        self.layout_manager = LayoutManager(self.root)
+        with self.profiler.measure("layout_manager"):
+            self.layout_manager = LayoutManager(self.root)
         self.component_manager = ComponentManager(self.root, self.layout_manager)
         self.menu_manager = MenuManager(self.component_manager)
-        self.font_manager = FontManager(self.component_manager)
+        with self.profiler.measure("font_manager"):
+            self.font_manager = FontManager(self.component_manager)
         
         # 注册基础组件
         self._register_core_components()
@@ -36,49 +108,42 @@ class MarkdownEditorApp:
         self._register_menu_actions()
         
         # 注册默认菜单
-        self._register_default_menus()
+        with self.profiler.measure("menus"):
+            self._register_default_menus()
         
         # 注册编辑器组件
         self._register_editor()
+        self.profiler.mark("constructed")
     
     def _register_core_components(self) -> None:
         """注册核心组件"""
-        component_tool = ComponentTool(self.component_manager, self.menu_manager)
-        component_status = ComponentStatus(self.component_manager, self.layout_manager, self.font_manager)
-        
+        with self.profiler.measure("component_tool"):
+            component_tool = ComponentTool(self.component_manager, self.menu_manager)
+        with self.profiler.measure("component_status"):
+            component_status = ComponentStatus(self.component_manager, self.layout_manager, self.font_manager)
+
+    def _register_lazy(self, name: str, factory) -> None:
+        """注册延迟组件，并记录其实际创建耗时"""
+        def create():
+            with self.profiler.measure(name):
+                return factory()
+        self.component_manager.register_lazy(name, create)
     
     def _register_menu_actions(self) -> None:
-        """注册菜单动作组件"""
-        actions = [
-            NewFileAction("new_file_action", self.component_manager),
-            OpenFileAction("open_file_action", self.component_manager),
-            SaveFileAction("save_file_action", self.component_manager),
-            SaveAsFileAction("save_as_file_action", self.component_manager),
-            CopyAction("copy_action", self.component_manager),
-            PasteAction("paste_action", self.component_manager),
-            CutAction("cut_action", self.component_manager),
-            StrongAction("strong_action", self.component_manager),
-            EmphasisAction("emphasis_action", self.component_manager),
-            UnderlineAction("underline_action", self.component_manager),
-            CodeAction("code_action", self.component_manager),
-            StrikeAction("strike_action", self.component_manager),
-            ToggleRenderModeAction("toggle_render_mode_action", self.component_manager),
-            HeadingAction("heading_action", self.component_manager),
-            QuoteAction("quote_action", self.component_manager),
-            UnorderedListAction("unordered_list_action", self.component_manager),
-            OrderedListAction("ordered_list_action", self.component_manager),
-            CodeBlockAction("code_block_action", self.component_manager),
-            FontSizeIncreaseAction("font_size_increase_action", self.component_manager),
-            FontSizeDecreaseAction("font_size_decrease_action", self.component_manager),
-            FontSizeResetAction("font_size_reset_action", self.component_manager),
-        ]
+        """注册菜单动作组件（延迟到首次执行时创建）"""
+        for name, action_class in MENU_ACTIONS.items():
+            self._register_lazy(name, lambda name=name, cls=action_class: cls(name, self.component_manager))
         # 为常用字体创建动作组件
-        common_fonts = ["微软雅黑", "宋体", "黑体", "Arial", "Times New Roman", "Courier New"]
-        for font_name in common_fonts:
-            # 创建安全的组件名称
-            safe_name = font_name.replace(" ", "_").replace("-", "_")
-            action = FontSelectAction(f"font_{safe_name}_action", self.component_manager, font_name)
-            actions.append(action)
+        for font_name in COMMON_FONTS:
+            name = font_action_name(font_name)
+            self._register_lazy(
+                name,
+                lambda name=name, font_name=font_name: FontSelectAction(name, self.component_manager, font_name)
+            )
+
+    def _action(self, name: str, method: str = "execute"):
+        """返回执行动作组件方法的回调，组件在回调首次触发时才创建"""
+        return lambda: getattr(self.component_manager.get_component(name), method)()
     
     def _register_default_menus(self) -> None:
         """注册默认菜单"""
@@ -87,10 +152,12 @@ class MarkdownEditorApp:
             menu_name="file_menu",
             button_text="文件",
             menu_items=[
-                ("新建", self.component_manager.get_component("new_file_action").execute, "<Control-n>"),
-                ("打开", self.component_manager.get_component("open_file_action").execute, "<Control-o>"),
-                ("保存", self.component_manager.get_component("save_file_action").execute, "<Control-s>"),
-                ("另存为", self.component_manager.get_component("save_as_file_action").execute, "<Control-Shift-S>")
+                ("新建", self._action("new_file_action"), "<Control-n>"),
+                ("打开", self._action("open_file_action"), "<Control-o>"),
+                ("快速打开", self._action("quick_open_action"), "<Control-p>"),
+                ("保存", self._action("save_file_action"), "<Control-s>"),
+                ("另存为", self._action("save_as_file_action"), "<Control-Shift-S>"),
+                ("关闭标签页", self._action("close_tab_action"), "<Control-w>")
             ],
             menu_shortcut="<Control-F>"
         )
@@ -100,9 +167,18 @@ class MarkdownEditorApp:
             menu_name="edit_menu",
             button_text="编辑",
             menu_items=[
-                ("复制", self.component_manager.get_component("copy_action").execute, "<Control-c>"),
-                ("粘贴", self.component_manager.get_component("paste_action").execute, "<Control-v>"),
-                ("剪切", self.component_manager.get_component("cut_action").execute, "<Control-x>")
+                ("复制", self._action("copy_action"), "<Control-c>"),
+                ("粘贴", self._action("paste_action"), "<Control-v>"),
+                ("剪切", self._action("cut_action"), "<Control-x>"),
+                ("---", None, None),  # 分隔线
+                ("撤销", self._action("undo_action"), "<Control-z>"),
+                ("重做", self._action("redo_action"), "<Control-y>"),
+                ("---", None, None),  # 分隔线
+                ("查找", self._action("find_action"), "<Control-f>"),
+                ("替换", self._action("replace_action"), "<Control-r>"),
+                ("查找下一个", self._action("find_next_action"), "<F3>"),
+                ("查找上一个", self._action("find_previous_action"), "<Shift-F3>"),
+                ("在项目中搜索", self._action("project_search_action"), "<Control-Shift-G>")
             ],
             menu_shortcut="<Control-E>"
         )
@@ -112,17 +188,17 @@ class MarkdownEditorApp:
             menu_name="paragraph_menu",
             button_text="标题",
             menu_items=[
-                ("标题 1", self.component_manager.get_component("heading_action").execute_1, "<Control-Key-1>"),
-                ("标题 2", self.component_manager.get_component("heading_action").execute_2, "<Control-Key-2>"),
-                ("标题 3", self.component_manager.get_component("heading_action").execute_3, "<Control-Key-3>"),
-                ("标题 4", self.component_manager.get_component("heading_action").execute_4, "<Control-Key-4>"),
-                ("标题 5", self.component_manager.get_component("heading_action").execute_5, "<Control-Key-5>"),
-                ("标题 6", self.component_manager.get_component("heading_action").execute_6, "<Control-Key-6>"),
+                ("标题 1", self._action("heading_action", "execute_1"), "<Control-Key-1>"),
+                ("标题 2", self._action("heading_action", "execute_2"), "<Control-Key-2>"),
+                ("标题 3", self._action("heading_action", "execute_3"), "<Control-Key-3>"),
+                ("标题 4", self._action("heading_action", "execute_4"), "<Control-Key-4>"),
+                ("标题 5", self._action("heading_action", "execute_5"), "<Control-Key-5>"),
+                ("标题 6", self._action("heading_action", "execute_6"), "<Control-Key-6>"),
                 ("---", None, None),  # 分隔线
-                ("引用", self.component_manager.get_component("quote_action").execute, "<Control-q>"),
-                ("无序列表", self.component_manager.get_component("unordered_list_action").execute, "<Control-bracketleft>"),
-                ("有序列表", self.component_manager.get_component("ordered_list_action").execute, "<Control-bracketright>"),
-                ("代码块", self.component_manager.get_component("code_block_action").execute, "<Control-Shift-K>")
+                ("引用", self._action("quote_action"), "<Control-q>"),
+                ("无序列表", self._action("unordered_list_action"), "<Control-bracketleft>"),
+                ("有序列表", self._action("ordered_list_action"), "<Control-bracketright>"),
+                ("代码块", self._action("code_block_action"), "<Control-Shift-K>")
             ],
             menu_shortcut=""
         )
@@ -132,11 +208,11 @@ class MarkdownEditorApp:
             menu_name="format_menu",
             button_text="格式",
             menu_items=[
-                ("加粗", self.component_manager.get_component("strong_action").execute, "<Control-b>"),
-                ("斜体", self.component_manager.get_component("emphasis_action").execute, "<Control-l>"),
-                ("下划线", self.component_manager.get_component("underline_action").execute, "<Control-u>"),
-                ("代码行", self.component_manager.get_component("code_action").execute, "<Control-k>"),
-                ("删除线", self.component_manager.get_component("strike_action").execute, "<Control-d>")
+                ("加粗", self._action("strong_action"), "<Control-b>"),
+                ("斜体", self._action("emphasis_action"), "<Control-l>"),
+                ("下划线", self._action("underline_action"), "<Control-u>"),
+                ("代码行", self._action("code_action"), "<Control-k>"),
+                ("删除线", self._action("strike_action"), "<Control-d>")
             ],
             menu_shortcut=""
         )
@@ -146,29 +222,29 @@ class MarkdownEditorApp:
             menu_name="view_menu",
             button_text="视图",
             menu_items=[
-                ("退出渲染", self.component_manager.get_component("toggle_render_mode_action").execute, "<Control-/>")
+                ("退出渲染", self._action("toggle_render_mode_action"), "<Control-/>"),
+                ("左侧边栏", self._action("toggle_sidebar_action"), "<Control-Shift-B>"),
+                ("大纲栏", self._action("toggle_outline_action"), "<Control-Shift-O>"),
+                ("---", None, None),  # 分隔线
+                ("上一章节", self._action("previous_section_action"), "<Alt-Up>"),
+                ("下一章节", self._action("next_section_action"), "<Alt-Down>"),
+                ("---", None, None),  # 分隔线
+                ("命令面板", self._action("command_palette_action"), "<Control-Shift-P>")
             ],
             menu_shortcut="<Control-V>"
         )
 
         # 主题菜单
-        # 先创建字体选择项列表
         font_menu_items = [
-            ("增大字体", self.component_manager.get_component("font_size_increase_action").execute, "<Control-plus>"),
-            ("减小字体", self.component_manager.get_component("font_size_decrease_action").execute, "<Control-minus>"),
-            ("重置字体", self.component_manager.get_component("font_size_reset_action").execute, "<Control-0>"),
+            ("增大字体", self._action("font_size_increase_action"), "<Control-plus>"),
+            ("减小字体", self._action("font_size_decrease_action"), "<Control-minus>"),
+            ("重置字体", self._action("font_size_reset_action"), "<Control-0>"),
             ("---", None, None),  # 分隔线
         ]
         
         # 添加常用字体选项
-        common_fonts = ["微软雅黑", "宋体", "黑体", "Arial", "Times New Roman", "Courier New"]
-        for font_name in common_fonts:
-            safe_name = font_name.replace(" ", "_").replace("-", "_")
-            font_menu_items.append((
-                font_name, 
-                self.component_manager.get_component(f"font_{safe_name}_action").execute, 
-                None
-            ))
+        for font_name in COMMON_FONTS:
+            font_menu_items.append((font_name, self._action(font_action_name(font_name)), None))
         
         self.menu_manager.register_menu(
             menu_name="theme_menu",
@@ -180,24 +256,70 @@ class MarkdownEditorApp:
     def _register_editor(self) -> None:
         """注册编辑器相关组件"""
         # 注册Notebook组件
-        notebook_component = ComponentNotebook(self.component_manager)
+        with self.profiler.measure("component_notebook"):
+            notebook_component = ComponentNotebook(self.component_manager)
         
         # 注册文本区域组件
-        text_area_component = ComponentTextArea(self.component_manager, self.font_manager)
+        with self.profiler.measure("text_area"):
+            text_area_component = ComponentTextArea(self.component_manager, self.font_manager)
         
-        # 注册渲染区域组件
-        render_area_component = ComponentRenderArea(self.component_manager)
+        # 注册撤销/重做组件（需在首次编辑之前订阅编辑流）
+        with self.profiler.measure("component_undo"):
+            undo_component = ComponentUndo(self.component_manager)
         
         # 注册主编辑器组件
-        text_editor = TextEditor(self.component_manager)
+        with self.profiler.measure("text_editor"):
+            text_editor = TextEditor(self.component_manager)
+
+        # 注册侧边栏大纲组件
+        with self.profiler.measure("component_outline"):
+            outline_component = ComponentOutline(self.component_manager)
+
+        # 注册编辑区语法高亮组件
+        with self.profiler.measure("component_highlighter"):
+            highlighter_component = ComponentHighlighter(self.component_manager, self.font_manager)
+
+        # 注册查找/替换组件（对话框在首次使用时创建）
+        with self.profiler.measure("component_search"):
+            search_component = ComponentSearch(self.component_manager)
+
+        # 注册侧边栏项目搜索组件（索引在选择目录后才加载）
+        with self.profiler.measure("component_project_search"):
+            project_search_component = ComponentProjectSearch(self.component_manager)
+
+        # 注册命令面板组件（面板在首次打开时创建）
+        with self.profiler.measure("component_command_palette"):
+            command_palette_component = ComponentCommandPalette(
+                self.component_manager, self.menu_manager, self.font_manager
+            )
+
+        # 注册快速打开组件（路径索引在首次打开时才扫描，文件同时提供给命令面板）
+        with self.profiler.measure("component_quick_open"):
+            quick_open_component = ComponentQuickOpen(self.component_manager)
         
-        # 将组件放置到正确的布局区域
+        # 渲染区域延迟到首帧绘制之后的空闲时间创建
+        # （两次 after_idle：第一轮空闲处理完成几何计算与首帧绘制后才轮到创建）
+        self._register_lazy("render_area", self._create_render_area)
+        self.root.after_idle(
+            lambda: self.root.after_idle(lambda: self.component_manager.get_component("render_area"))
+        )
+        
+        # 注册会话组件，恢复上次打开的文档；没有可恢复的文档时创建欢迎页
+        with self.profiler.measure("component_session"):
+            session_component = ComponentSession(self.component_manager, self.font_manager)
+        with self.profiler.measure("session_restore"):
+            restored = self.restore_session and session_component.restore()
+        if not restored:
+            with self.profiler.measure("welcome_tab"):
+                notebook_component.add_tab("Welcome")
 
+    def _create_render_area(self) -> ComponentRenderArea:
+        """创建渲染区域组件，并渲染当前标签页已有的内容"""
+        render_area_component = ComponentRenderArea(self.component_manager, self.font_manager)
         render_area_component.create_render_area()  # 创建渲染区域
-        
-        # 创建初始标签页
-        notebook_component.add_tab("Welcome")
+        render_area_component.refresh_current_tab()  # 补上创建前错过的内容
+        return render_area_component
     
     def run(self) -> None:
         """运行应用"""
-        self.root.mainloop()
\ No newline at end of file
+        self.root.mainloop()
@@ -0,0 +1 @@
+"""Berrypad 性能基准与回归测试"""
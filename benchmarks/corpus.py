@@ -0,0 +1,290 @@
+"""
+可复现的 Markdown 合成语料生成器
+
+按给定随机种子与块类型权重，流式生成标题、列表、引用、代码块、长段落、
+病态强调（大量未闭合的 * / _ / `）以及中日韩文本混合的文档，规模从 KB 到数百 MB。
+同一组 (大小, 种子, 权重) 总是生成逐字节相同的内容。
+
+用法：
+    python -m benchmarks.corpus out.md --size 100MB --seed 7 --mix paragraph=4,cjk=2,emphasis=1
+"""
+import argparse
+import os
+import random
+import re
+import sys
+from typing import Callable, Dict, Iterator, List, Optional
+
+from utils.app_dirs import get_cache_dir
+
+# 生成规则变化时递增，使缓存的夹具文件失效
+CORPUS_VERSION = 1
+
+# 各块类型的默认权重
+DEFAULT_MIX = {
+    "heading": 1.0,
+    "paragraph": 4.0,
+    "list": 2.0,
+    "quote": 1.0,
+    "code": 1.0,
+    "emphasis": 0.5,
+    "cjk": 1.5,
+    "hr": 0.2,
+}
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog render parser editor preview block inline "
+    "token buffer widget latency cache index section heading list quote fence syntax "
+    "markdown tkinter python event layout scroll cursor undo redo search replace font"
+).split()
+
+# 常用汉字与日文假名，用于中日韩文本
+CJK_CHARS = (
+    "的一是不了人我在有他这中大来上个国到说们为子和你地出道也时年得就那要下以生会自着去之过家学"
+    "对可她里后小么心多天而能好都然没日于起还发成事只作当想看文无开手十用主行方又如前所本见经头面"
+    "公同三已老从动两长知民样现分将外但身些与高意进把法此实回二理美点月明其种声全工己话儿者向情部"
+    "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん"
+)
+CJK_PUNCTUATION = "，，，、；：。"
+
+CODE_LANGUAGES = ["python", "json", "bash", "yaml", ""]
+
+FIXTURES_DIR_NAME = "corpus"
+
+# 预置夹具 {名称: 生成参数}，基准测试按名称取用
+FIXTURES = {
+    "small": {"size": 10 * 1024, "seed": 1},
+    "medium": {"size": 100 * 1024, "seed": 2},
+    "large": {"size": 1024 * 1024, "seed": 3},
+    "doc_1mb": {"size": 1024 * 1024, "seed": 11},
+    "doc_10mb": {"size": 10 * 1024 * 1024, "seed": 12},
+    "doc_100mb": {"size": 100 * 1024 * 1024, "seed": 13},
+    "emphasis_100kb": {"size": 100 * 1024, "seed": 21, "mix": {"emphasis": 1.0, "paragraph": 1.0}},
+    "cjk_100kb": {"size": 100 * 1024, "seed": 22, "mix": {"cjk": 4.0, "heading": 0.5, "list": 0.5}},
+    "code_100kb": {"size": 100 * 1024, "seed": 23, "mix": {"code": 4.0, "paragraph": 1.0, "heading": 0.5}},
+}
+
+
+class CorpusGenerator:
+    """合成语料生成器 - 逐块生成 Markdown 文本"""
+
+    def __init__(self, seed: int = 0, mix: Optional[Dict[str, float]] = None):
+        self.rng = random.Random(seed)
+        mix = dict(DEFAULT_MIX if mix is None else mix)
+        unknown = set(mix) - set(DEFAULT_MIX)
+        if unknown:
+            raise ValueError(f"未知的块类型: {', '.join(sorted(unknown))}")
+        self._kinds: List[str] = [kind for kind, weight in mix.items() if weight > 0]
+        self._weights: List[float] = [mix[kind] for kind in self._kinds]
+        if not self._kinds:
+            raise ValueError("块类型权重不能全为 0")
+        self._makers: Dict[str, Callable[[], str]] = {
+            "heading": self._heading,
+            "paragraph": self._paragraph,
+            "list": self._list,
+            "quote": self._quote,
+            "code": self._code,
+            "emphasis": self._emphasis,
+            "cjk": self._cjk,
+            "hr": self._hr,
+        }
+
+    # ------------------------------------------------------------ 文本片段
+
+    def _words(self, count: int) -> str:
+        return " ".join(self.rng.choices(WORDS, k=count))
+
+    def _decorate(self, text: str) -> str:
+        """为一段文本随机加上行内格式"""
+        choice = self.rng.random()
+        if choice < 0.10:
+            return f"**{text}**"
+        if choice < 0.18:
+            return f"*{text}*"
+        if choice < 0.24:
+            return f"`{text}`"
+        if choice < 0.27:
+            return f"~~{text}~~"
+        if choice < 0.29:
+            return f"***{text}***"
+        return text
+
+    def _sentence(self) -> str:
+        parts = [self._decorate(self._words(self.rng.randint(2, 6))) for _ in range(self.rng.randint(1, 4))]
+        sentence = " ".join(parts)
+        return sentence[0].upper() + sentence[1:] + "."
+
+    def _cjk_sentence(self) -> str:
+        length = self.rng.randint(8, 40)
+        chars = self.rng.choices(CJK_CHARS, k=length)
+        # 随机插入逗号
+        for _ in range(length // 12):
+            chars.insert(self.rng.randrange(1, len(chars)), self.rng.choice(CJK_PUNCTUATION))
+        return "".join(chars) + "。"
+
+    # ------------------------------------------------------------ 块
+
+    def _heading(self) -> str:
+        level = self.rng.choices(range(1, 7), weights=[1, 4, 4, 2, 1, 1])[0]
+        title = self._words(self.rng.randint(1, 6)).title()
+        return f"{'#' * level} {title}\n"
+
+    def _paragraph(self) -> str:
+        # 长段落：若干行，每行若干句
+        lines = [" ".join(self._sentence() for _ in range(self.rng.randint(1, 5)))
+                 for _ in range(self.rng.randint(1, 8))]
+        return "\n".join(lines) + "\n"
+
+    def _list(self) -> str:
+        ordered = self.rng.random() < 0.3
+        marker = self.rng.choice("-*+")
+        items = []
+        for i in range(self.rng.randint(2, 8)):
+            prefix = f"{i + 1}." if ordered else marker
+            items.append(f"{prefix} {self._sentence()}")
+        return "\n".join(items) + "\n"
+
+    def _quote(self) -> str:
+        return "\n".join(f"> {self._sentence()}" for _ in range(self.rng.randint(1, 4))) + "\n"
+
+    def _code(self) -> str:
+        language = self.rng.choice(CODE_LANGUAGES)
+        lines = []
+        for _ in range(self.rng.randint(3, 20)):
+            indent = "    " * self.rng.randint(0, 2)
+            name, value = self.rng.choice(WORDS), self.rng.randint(0, 9999)
+            lines.append(self.rng.choice([
+                f"{indent}{name} = {value}",
+                f"{indent}def {name}_{value}(arg):",
+                f"{indent}return \"{self._words(2)}\"",
+                f"{indent}# {self._words(4)}",
+                f'{indent}"{name}": {value},',
+                f"{indent}{name}: {self._words(2)}",
+                f"{indent}echo {name} | grep {value}",
+            ]))
+        return f"```{language}\n" + "\n".join(lines) + "\n```\n"
+
+    def _emphasis(self) -> str:
+        """病态强调：大量未闭合或交错的强调标记，考验行内解析的回溯"""
+        run = self.rng.randint(20, 200)
+        pattern = self.rng.randrange(5)
+        if pattern == 0:
+            text = "*" * run + self._words(3)
+        elif pattern == 1:
+            text = " ".join(f"*{word}" for word in self.rng.choices(WORDS, k=run))
+        elif pattern == 2:
+            text = "".join(f"**{word}*_" for word in self.rng.choices(WORDS, k=run // 4 + 1))
+        elif pattern == 3:
+            # 以单词开头，避免被当作代码围栏
+            text = self._words(1) + " " + "`" * run + " " + "_" * run
+        else:
+            text = "~" * run + self._words(2) + "*" * (run // 2)
+        return text + "\n"
+
+    def _cjk(self) -> str:
+        sentences = [self._cjk_sentence() for _ in range(self.rng.randint(2, 10))]
+        # 偶尔混入英文与行内格式
+        if self.rng.random() < 0.5:
+            sentences.insert(self.rng.randrange(len(sentences)), self._decorate(self._words(3)))
+        return "".join(sentences) + "\n"
+
+    def _hr(self) -> str:
+        return self.rng.choice(["---", "***", "___"]) + "\n"
+
+    # ------------------------------------------------------------ 输出
+
+    def iter_blocks(self) -> Iterator[str]:
+        """无限生成块文本（每块以换行结尾，块之间以空行分隔）"""
+        while True:
+            kind = self.rng.choices(self._kinds, weights=self._weights)[0]
+            yield self._makers[kind]() + "\n"
+
+    def iter_chunks(self, size: int, chunk_size: int = 1024 * 1024) -> Iterator[str]:
+        """按约 chunk_size 字节分批生成，总量达到 size 字节（UTF-8）即停止"""
+        header = "# Synthetic Corpus\n\n"
+        parts, total, pending = [header], len(header), len(header)
+        for block in self.iter_blocks():
+            if total >= size:
+                break
+            parts.append(block)
+            length = len(block.encode("utf-8"))
+            total += length
+            pending += length
+            if pending >= chunk_size:
+                yield "".join(parts)
+                parts, pending = [], 0
+        if parts:
+            yield "".join(parts)
+
+
+def generate(size: int, seed: int = 0, mix: Optional[Dict[str, float]] = None) -> str:
+    """生成约 size 字节的文档"""
+    return "".join(CorpusGenerator(seed, mix).iter_chunks(size))
+
+
+def write_corpus(path: str, size: int, seed: int = 0, mix: Optional[Dict[str, float]] = None) -> int:
+    """流式写出文档（不在内存中拼接整篇），返回写入的字节数"""
+    written = 0
+    with open(path, "w", encoding="utf-8", newline="\n") as file:
+        for chunk in CorpusGenerator(seed, mix).iter_chunks(size):
+            file.write(chunk)
+            written += len(chunk.encode("utf-8"))
+    return written
+
+
+def fixture_path(name: str) -> str:
+    """获取夹具文件路径，首次使用时生成并缓存到应用缓存目录"""
+    params = FIXTURES[name]
+    directory = os.path.join(get_cache_dir(), FIXTURES_DIR_NAME)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}-v{CORPUS_VERSION}-{params['seed']}-{params['size']}.md")
+    if not os.path.exists(path):
+        tmp_path = f"{path}.tmp"
+        write_corpus(tmp_path, params["size"], params["seed"], params.get("mix"))
+        os.replace(tmp_path, path)
+    return path
+
+
+def load_fixture(name: str) -> str:
+    """读取夹具内容"""
+    with open(fixture_path(name), "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def parse_size(text: str) -> int:
+    """解析 10KB / 5MB / 1GB / 1234 形式的大小"""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?)B?\s*", text.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"无效的大小: {text}")
+    number, unit = match.groups()
+    return int(float(number) * {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}[unit])
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """解析 heading=1,cjk=2 形式的权重"""
+    mix = {}
+    for item in filter(None, text.split(",")):
+        kind, _, weight = item.partition("=")
+        try:
+            mix[kind.strip()] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"无效的权重: {item}")
+    return mix
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="corpus", description="生成可复现的 Markdown 合成语料")
+    parser.add_argument("output", help="输出文件路径")
+    parser.add_argument("--size", type=parse_size, default=parse_size("1MB"), help="目标大小，如 10KB、100MB")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--mix", type=parse_mix, default=None,
+                        help=f"块类型权重，如 paragraph=4,cjk=2（可用类型: {', '.join(DEFAULT_MIX)}）")
+    args = parser.parse_args(argv)
+
+    written = write_corpus(args.output, args.size, args.seed, args.mix)
+    print(f"已生成 {written} 字节: {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,503 @@
+"""
+Berrypad 性能基准与回归测试
+
+无显示环境下自动启动 Xvfb，测量冷启动、大文件打开、按键延迟、标签页切换与渲染耗时，
+以及反复打开关闭标签页后的内存残留，结果保存为 JSON，便于在不同提交之间对比。
+
+用法（在仓库根目录执行）：
+    python -m benchmarks.run_benchmarks                  # 完整运行，结果写入 benchmarks/results/<提交>.json
+    python -m benchmarks.run_benchmarks --quick          # 快速运行（跳过 100 MB 文件等耗时场景）
+    python -m benchmarks.run_benchmarks --only render    # 只运行指定场景
+    python -m benchmarks.run_benchmarks --compare base.json head.json
+
+超过 LIMITS 中绝对上限的指标（如关闭标签页后的内存残留）会使命令以非零状态退出。
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from benchmarks import corpus
+from benchmarks.virtual_display import VirtualDisplay
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+# 对比时超过该比例视为性能回退
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+# 指标的绝对上限 {指标名: 上限}，任一样本超过时视为失败
+LIMITS = {
+    "tab_close.retained_kib": 256,  # 打开并关闭全部标签页后残留的 Python 内存
+    "tab_close.retained_widgets": 0,  # 残留的 Tk 组件数
+    "tab_close.retained_commands": 16,  # 残留的 Tcl 命令数（组件命令、绑定与回调；容许少量挂起的 after 回调）
+    "tab_close.retained_entries": 0,  # 各组件中残留的按标签页保存的条目数
+    "tab_rename.stale_previews": 0,  # 改名后编辑，预览未更新的次数
+    "tab_rename.orphaned_entries": 0,  # 改名后仍按旧名称保存的预览与预渲染记录数
+}
+
+
+# ---------------------------------------------------------------- 工具函数
+
+def _summarize(samples: List[float]) -> Dict:
+    """统计样本（毫秒）"""
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))
+    return {
+        "n": len(ordered),
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[p95_index],
+        "max": ordered[-1],
+    }
+
+
+def _timed(func: Callable) -> float:
+    """执行函数并返回耗时（毫秒）"""
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def _git_revision() -> Dict:
+    """当前提交与工作区是否有未提交修改"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip())
+        return {"commit": commit, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": "unknown", "dirty": None}
+
+
+# ---------------------------------------------------------------- 应用驱动
+
+@contextmanager
+def _running_app():
+    """在当前进程中启动应用，等待渲染区域就绪后交给场景使用，结束时销毁"""
+    from app import MarkdownEditorApp
+
+    app = MarkdownEditorApp(restore_session=False)
+    app.root.update()
+    _settle(app)
+    # 渲染区域在首帧之后的空闲时间创建，这里直接取出以保证已就绪
+    render_area = app.component_manager.get_component("render_area")
+    # 渲染计划不写入磁盘缓存，避免前一次运行的缓存影响本次的测量
+    render_area.markdown_renderer.plan_cache.persist = False
+    _settle(app)
+    try:
+        yield app
+    finally:
+        app.root.destroy()
+
+
+def _settle(app) -> None:
+    """处理完所有挂起的事件与空闲回调"""
+    app.root.update_idletasks()
+    app.root.update()
+
+
+def _flush_render(app) -> None:
+    """立即执行挂起的防抖渲染，使预览与编辑区一致"""
+    render_area = app.component_manager.get_component("render_area")
+    if render_area and render_area._render_debounce_id:
+        app.root.after_cancel(render_area._render_debounce_id)
+        notebook = app.component_manager.get_component("component_notebook")
+        content = notebook.tab_content_cache.get(notebook.get_current_tab_name(), "")
+        render_area._on_text_updated(content)
+    app.root.update_idletasks()
+
+
+def _active_text(app):
+    return app.component_manager.get_component("text_area").text_area
+
+
+def _widget_count(widget) -> int:
+    return 1 + sum(_widget_count(child) for child in widget.winfo_children())
+
+
+def _per_tab_entries(app) -> int:
+    """各组件中按标签名或文本组件保存的条目总数"""
+    get = app.component_manager.get_component
+    notebook = get("component_notebook")
+    text_editor = get("text_editor")
+    render_area = get("render_area")
+    sizes = [
+        len(notebook._tabs), len(notebook.tab_content_cache),
+        len(text_editor.tab_file_paths), len(text_editor._loaders),
+        len(get("text_area").loading_widgets),
+        len(render_area._slots), len(render_area.prerenderer._recent), len(render_area.prerenderer._plans),
+    ]
+    for name, attribute in (("component_outline", "_indexes"), ("component_highlighter", "_documents"),
+                            ("component_undo", "_histories"), ("component_session", "_pending_tabs")):
+        component = get(name)
+        if component is not None:
+            sizes.append(len(getattr(component, attribute)))
+    return sum(sizes)
+
+
+# ---------------------------------------------------------------- 场景
+
+def bench_cold_start(repeat: int) -> Dict:
+    """冷启动：新进程从解释器启动到首帧绘制且预览区就绪"""
+    wall, ready, imports = [], [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup_probe"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        wall.append((time.perf_counter() - start) * 1000)
+        probe = json.loads(output.strip().splitlines()[-1])
+        ready.append(probe["ready_ms"])
+        imports.append(probe["import_ms"])
+    return {
+        "cold_start.wall": _summarize(wall),
+        "cold_start.app_ready": _summarize(ready),
+        "cold_start.imports": _summarize(imports),
+    }
+
+
+def bench_open_file(sizes_mb: List[int]) -> Dict:
+    """打开文件：从调用 open_file 到编辑区载入完成且预览渲染完成"""
+    results = {}
+    for size_mb in sizes_mb:
+        path = corpus.fixture_path(f"doc_{size_mb}mb")
+
+        with _running_app() as app:
+            text_editor = app.component_manager.get_component("text_editor")
+
+            def open_and_wait():
+                text_editor.open_file(path)
+                while text_editor.get_file_path_for_tab(os.path.basename(path)) != path:
+                    app.root.update()
+                _settle(app)
+                _flush_render(app)
+
+            results[f"open_file.{size_mb}MB"] = _summarize([_timed(open_and_wait)])
+    return results
+
+
+def bench_keystroke(keystrokes: int, fixture: str) -> Dict:
+    """按键延迟：插入一个字符后处理完事件与（防抖）预览渲染的主线程耗时；预览隐藏时只剩编辑区的开销"""
+    results = {}
+    content = corpus.load_fixture(fixture)
+    for preview in (True, False):
+        with _running_app() as app:
+            if not preview:
+                app.layout_manager.toggle_render_area(False)
+            text = _active_text(app)
+            text.insert("1.0", content)
+            _settle(app)
+            _flush_render(app)
+            text.mark_set("insert", "end-1c")
+
+            def keystroke():
+                text.insert("insert", "x")
+                _settle(app)
+                _flush_render(app)
+
+            samples = [_timed(keystroke) for _ in range(keystrokes)]
+            results[f"keystroke.preview_{'on' if preview else 'off'}"] = _summarize(samples)
+    return results
+
+
+def bench_tab_switch(tab_counts: List[int], fixture: str, rounds: int) -> Dict:
+    """标签页切换：N 个已载入内容的标签页之间轮流切换"""
+    results = {}
+    content = corpus.load_fixture(fixture)
+    for count in tab_counts:
+        with _running_app() as app:
+            notebook = app.component_manager.get_component("component_notebook")
+            names = []
+            for i in range(count):
+                name = f"bench_{i}.md"
+                notebook.add_tab(name)
+                _active_text(app).insert("1.0", content)
+                _settle(app)
+                names.append(name)
+            _flush_render(app)
+
+            samples = []
+            for i in range(rounds * count):
+                name = names[i % count]
+
+                def switch():
+                    notebook.switch_tab_by_name(name)
+                    _settle(app)
+                    _flush_render(app)
+
+                samples.append(_timed(switch))
+            results[f"tab_switch.{count}_tabs"] = _summarize(samples)
+    return results
+
+
+def bench_render(fixtures: List[str], repeat: int) -> Dict:
+    """渲染耗时：纯解析，解析加 Tk 预览渲染，以及命中渲染计划缓存时的预览渲染"""
+    from components.markdown.markdown_parser import MarkdownParser
+
+    results = {}
+    with _running_app() as app:
+        renderer = app.component_manager.get_component("render_area").markdown_renderer
+        for label in fixtures:
+            content = corpus.load_fixture(label)
+            lines = content.split("\n")
+            parse = [_timed(lambda: list(MarkdownParser().iter_blocks(lines))) for _ in range(repeat)]
+
+            def render(cached: bool):
+                if not cached:
+                    renderer.plan_cache.clear_memory()
+                renderer.update_content(content)
+                app.root.update_idletasks()
+
+            full = [_timed(lambda: render(False)) for _ in range(repeat)]
+            cached = [_timed(lambda: render(True)) for _ in range(repeat)]
+            results[f"render.parse.{label}"] = _summarize(parse)
+            results[f"render.preview.{label}"] = _summarize(full)
+            results[f"render.cached.{label}"] = _summarize(cached)
+    return results
+
+
+def bench_tab_close(count: int, fixture: str, warmup: int = 20) -> Dict:
+    """
+    关闭标签页：打开 N 个标签页（载入内容并渲染预览）后逐个关闭，测量单次打开加关闭的耗时，
+    以及全部关闭后相对基线残留的 Python 内存、Tk 组件、Tcl 命令与按标签页保存的条目
+    """
+    results = {}
+    base_content = corpus.load_fixture(fixture)
+    with _running_app() as app:
+        notebook = app.component_manager.get_component("component_notebook")
+        text_editor = app.component_manager.get_component("text_editor")
+        root = app.root
+
+        def open_and_close(i: int) -> None:
+            name = f"bench_close_{i}.md"
+            notebook.add_tab(name)
+            _settle(app)
+            text = _active_text(app)
+            text.insert("1.0", f"{base_content}\n\n# 标签页 {i}\n")
+            text.edit_reset()  # 与载入文件相同，关闭时不询问是否保存
+            _settle(app)
+            _flush_render(app)
+            text_editor.close_tab(name)
+            _settle(app)
+
+        def measure() -> Dict:
+            _settle(app)
+            gc.collect()
+            return {
+                "python": tracemalloc.get_traced_memory()[0],
+                "widgets": _widget_count(root),
+                "commands": len(root.tk.splitlist(root.tk.call("info", "commands"))),
+                "entries": _per_tab_entries(app),
+            }
+
+        # 先打开关闭若干次，填满字体、计划缓存、预览池等有上限的共享缓存，再记录基线
+        for i in range(warmup):
+            open_and_close(i)
+        tracemalloc.start()
+        try:
+            baseline = measure()
+            samples = [_timed(lambda i=i: open_and_close(warmup + i)) for i in range(count)]
+            after = measure()
+        finally:
+            tracemalloc.stop()
+
+    results[f"tab_close.open_close_{count}"] = _summarize(samples)
+    for key in ("widgets", "commands", "entries"):
+        results[f"tab_close.retained_{key}"] = _summarize([float(after[key] - baseline[key])])
+    results["tab_close.retained_kib"] = _summarize([(after["python"] - baseline["python"]) / 1024])
+    return results
+
+
+def bench_tab_rename(rounds: int, fixture: str) -> Dict:
+    """
+    标签页改名（另存为）：改名后继续编辑，测量编辑到预览更新的耗时，
+    并统计预览未跟上编辑的次数以及仍留在旧名称下的预览与预渲染记录
+    """
+    content = corpus.load_fixture(fixture)
+    with _running_app() as app:
+        notebook = app.component_manager.get_component("component_notebook")
+        render_area = app.component_manager.get_component("render_area")
+
+        def fire_debounced_render() -> None:
+            # 与防抖定时器到期时相同：渲染到发起更新的标签页的预览
+            if render_area._render_debounce_id:
+                app.root.after_cancel(render_area._render_debounce_id)
+                tab_name = render_area._render_debounce_tab
+                render_area._on_text_updated(notebook.tab_content_cache.get(tab_name, ""), tab_name=tab_name)
+            app.root.update_idletasks()
+
+        samples = []
+        stale = orphaned = 0
+        for i in range(rounds):
+            old_name, new_name = f"bench_rename_{i}.md", f"bench_saved_{i}.md"
+            notebook.add_tab(old_name)
+            _settle(app)
+            _active_text(app).insert("1.0", content)
+            _settle(app)
+            fire_debounced_render()
+            notebook.set_tab_name(old_name, new_name)  # 另存为改名走的路径
+
+            def edit():
+                _active_text(app).insert("end-1c", f"\n\n# 另存为 {i}\n")
+                _settle(app)
+                fire_debounced_render()
+
+            samples.append(_timed(edit))
+            slot = render_area._slots.get(new_name)
+            if slot is None or slot.content != notebook.tab_content_cache.get(new_name):
+                stale += 1
+            orphaned += (old_name in render_area._slots) + (old_name in render_area.prerenderer._recent)
+            notebook.close_tab(new_name)
+            _settle(app)
+
+    return {
+        "tab_rename.edit_render": _summarize(samples),
+        "tab_rename.stale_previews": _summarize([float(stale)]),
+        "tab_rename.orphaned_entries": _summarize([float(orphaned)]),
+    }
+
+
+def bench_prerender(copies: int, documents: int) -> Dict:
+    """
+    空闲预渲染：按时间片为多个大文档构建渲染计划，测量每个时间片的实际耗时
+
+    先构建的计划一直留在计划缓存中，时间片的长尾反映了大量存活的块对 GC 完整回收的影响。
+    """
+    from components.markdown.markdown_parser import MarkdownParser
+    from components.markdown.plan_cache import PlanCache
+    from components.notebook.prerenderer import IdlePreRenderer, PlanJob
+
+    base_content = corpus.load_fixture("large")
+    plan_cache = PlanCache(memory_entries=documents, persist=False)
+    parser = MarkdownParser()
+    samples = []
+    for i in range(documents):
+        job = PlanJob(base_content * copies + f"\n# 文档 {i}\n", parser)
+        done = False
+        while not done:
+            start = time.perf_counter()
+            done = job.step(start + IdlePreRenderer.SLICE_BUDGET, plan_cache)
+            samples.append((time.perf_counter() - start) * 1000)
+    return {f"prerender.slice.{copies}mb_x{documents}": _summarize(samples)}
+
+
+SCENARIOS = ["cold_start", "open_file", "keystroke", "tab_switch", "render", "tab_close", "tab_rename", "prerender"]
+
+
+def run(scenarios: List[str], quick: bool) -> Dict:
+    """运行选定的场景，返回 {指标名: 统计}"""
+    results = {}
+    for scenario in scenarios:
+        print(f"运行场景: {scenario}", file=sys.stderr)
+        if scenario == "cold_start":
+            results.update(bench_cold_start(repeat=3 if quick else 10))
+        elif scenario == "open_file":
+            results.update(bench_open_file([1, 10] if quick else [1, 10, 100]))
+        elif scenario == "keystroke":
+            results.update(bench_keystroke(keystrokes=20 if quick else 100, fixture="medium"))
+        elif scenario == "tab_switch":
+            results.update(bench_tab_switch([2, 10] if quick else [2, 10, 50], fixture="small", rounds=2))
+        elif scenario == "render":
+            fixtures = ["small", "medium", "emphasis_100kb", "cjk_100kb", "code_100kb"]
+            if not quick:
+                fixtures.append("large")
+            results.update(bench_render(fixtures, repeat=3 if quick else 5))
+        elif scenario == "tab_close":
+            results.update(bench_tab_close(200 if quick else 1000, fixture="small"))
+        elif scenario == "tab_rename":
+            results.update(bench_tab_rename(rounds=5 if quick else 20, fixture="small"))
+        elif scenario == "prerender":
+            results.update(bench_prerender(copies=2 if quick else 10, documents=4 if quick else 6))
+    return results
+
+
+def check_limits(results: Dict) -> int:
+    """检查指标的绝对上限，存在超限时返回 1"""
+    failures = 0
+    for name, limit in LIMITS.items():
+        if name in results and results[name]["max"] > limit:
+            print(f"{name}: {results[name]['max']:.2f} 超过上限 {limit}", file=sys.stderr)
+            failures += 1
+    return 1 if failures else 0
+
+
+# ---------------------------------------------------------------- 结果对比
+
+def compare(base_path: str, head_path: str, threshold: float) -> int:
+    """对比两次结果的中位数，存在回退时返回 1"""
+    with open(base_path, encoding="utf-8") as file:
+        base = json.load(file)
+    with open(head_path, encoding="utf-8") as file:
+        head = json.load(file)
+
+    regressions = 0
+    print(f"{'指标':<32} {'基线(ms)':>12} {'当前(ms)':>12} {'变化':>9}")
+    for name in sorted(set(base["results"]) | set(head["results"])):
+        old = base["results"].get(name, {}).get("median")
+        new = head["results"].get(name, {}).get("median")
+        if old is None or new is None:
+            print(f"{name:<32} {old if old is not None else '-':>12} {new if new is not None else '-':>12}")
+            continue
+        change = (new - old) / old if old else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  <- 回退"
+            regressions += 1
+        print(f"{name:<32} {old:12.2f} {new:12.2f} {change:+8.1%}{flag}")
+    return 1 if regressions else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="run_benchmarks", description="Berrypad 性能基准")
+    parser.add_argument("--quick", action="store_true", help="缩小规模，快速运行")
+    parser.add_argument("--only", nargs="+", choices=SCENARIOS, help="只运行指定场景")
+    parser.add_argument("-o", "--output", help="结果 JSON 路径，默认 benchmarks/results/<提交>.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="对比两份结果 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="视为回退的中位数增幅，默认 0.10")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return compare(*args.compare, threshold=args.threshold)
+
+    with VirtualDisplay():
+        import tkinter as tk
+        results = run(args.only or SCENARIOS, quick=args.quick)
+
+    revision = _git_revision()
+    report = {
+        "meta": {
+            **revision,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "quick": args.quick,
+            "python": platform.python_version(),
+            "tk": str(tk.TkVersion),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{revision['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False)
+    print(f"结果已写入: {output}", file=sys.stderr)
+    return check_limits(results)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+冷启动探针 - 由基准测试在独立子进程中运行
+
+启动应用，等待首帧绘制与渲染区域创建完成后，将时间线以 JSON 写到标准输出并退出
+"""
+import json
+import sys
+import time
+
+PROBE_TIMEOUT_MS = 30000
+
+
+def main() -> int:
+    started = time.perf_counter()
+    from app import MarkdownEditorApp
+    import_ms = (time.perf_counter() - started) * 1000
+
+    app = MarkdownEditorApp(restore_session=False)
+    root = app.root
+    result = {"import_ms": import_ms}
+
+    def ready() -> bool:
+        timeline = app.profiler.to_dict()
+        painted = "first_paint" in timeline["milestones"]
+        rendered = any(record["name"] == "render_area" for record in timeline["components"])
+        return painted and rendered
+
+    def poll() -> None:
+        if ready() or app.profiler.elapsed() > PROBE_TIMEOUT_MS:
+            result["ready_ms"] = app.profiler.elapsed()
+            result["timeline"] = app.profiler.to_dict()
+            root.destroy()
+        else:
+            root.after(1, poll)
+
+    root.after(1, poll)
+    root.mainloop()
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
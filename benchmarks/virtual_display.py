@@ -0,0 +1,93 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import os
+import shutil
+import subprocess
+import sys
+import time
+from typing import Optional
+
+
+class VirtualDisplay:
+    """
+    无显示环境下启动 Xvfb 虚拟显示，供 Tk 在 CI / 服务器上运行
+
+    已有 DISPLAY 或非 X11 平台时不做任何事情
+    """
+
+    def __init__(self, width: int = 1280, height: int = 800, depth: int = 24, timeout: float = 5.0):
+        self.width = width
+        self.height = height
+        self.depth = depth
+        self.timeout = timeout
+        self.display: Optional[int] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._old_display: Optional[str] = None
+
+    @staticmethod
+    def needed() -> bool:
+        """当前环境是否需要虚拟显示"""
+        if sys.platform.startswith(("win", "darwin")):
+            return False
+        return not os.environ.get("DISPLAY")
+
+    @staticmethod
+    def _free_display_number(start: int = 90) -> int:
+        """查找未被占用的显示编号"""
+        number = start
+        while os.path.exists(f"/tmp/.X{number}-lock") or os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            number += 1
+        return number
+
+    def start(self) -> "VirtualDisplay":
+        """启动 Xvfb 并设置 DISPLAY 环境变量"""
+        if not self.needed():
+            return self
+
+        xvfb = shutil.which("Xvfb")
+        if not xvfb:
+            raise RuntimeError("未设置 DISPLAY 且未找到 Xvfb，请安装 xvfb 或在图形环境中运行")
+
+        self.display = self._free_display_number()
+        self._process = subprocess.Popen(
+            [xvfb, f":{self.display}", "-screen", "0", f"{self.width}x{self.height}x{self.depth}", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+        # 等待 X 套接字出现
+        socket_path = f"/tmp/.X11-unix/X{self.display}"
+        deadline = time.monotonic() + self.timeout
+        while not os.path.exists(socket_path):
+            if self._process.poll() is not None or time.monotonic() > deadline:
+                self.stop()
+                raise RuntimeError(f"Xvfb 启动失败 (:{self.display})")
+            time.sleep(0.05)
+
+        self._old_display = os.environ.get("DISPLAY")
+        os.environ["DISPLAY"] = f":{self.display}"
+        logger.info(f"已启动虚拟显示 :{self.display}")
+        return self
+
+    def stop(self) -> None:
+        """关闭 Xvfb 并还原 DISPLAY"""
+        if self._process is None:
+            return
+        self._process.terminate()
+        try:
+            self._process.wait(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            self._process.kill()
+        self._process = None
+
+        if self._old_display is None:
+            os.environ.pop("DISPLAY", None)
+        else:
+            os.environ["DISPLAY"] = self._old_display
+
+    def __enter__(self) -> "VirtualDisplay":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,81 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from components.markdown.batch_export import BatchExporter
+from components.markdown.html_writer import export_files
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """构建命令行参数解析器"""
+    parser = argparse.ArgumentParser(prog="berrypad", description="Berrypad 命令行工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="将 Markdown 导出为 HTML（不启动 GUI）",
+        description="berrypad export in.md out.html 或 berrypad export a.md b.md ... -o 输出目录"
+    )
+    export_parser.add_argument("inputs", nargs="+", help="输入的 Markdown 文件（单文件时可追加输出路径）")
+    export_parser.add_argument("-o", "--output-dir", help="输出目录，默认与源文件同目录")
+    export_parser.add_argument("-j", "--jobs", type=int, default=None, help="并行进程数，默认使用全部 CPU 核心")
+    export_parser.set_defaults(handler=_run_export)
+
+    build_parser = subparsers.add_parser(
+        "build",
+        help="批量导出整个目录，跳过内容未变化的文件",
+        description="berrypad build 源目录 输出目录 [--format html|txt]"
+    )
+    build_parser.add_argument("src_dir", help="Markdown 源目录（递归遍历）")
+    build_parser.add_argument("out_dir", help="输出目录，清单缓存保存在该目录下")
+    build_parser.add_argument("-f", "--format", choices=["html", "txt"], default="html", help="导出格式")
+    build_parser.add_argument("-j", "--jobs", type=int, default=None, help="并行进程数，默认使用全部 CPU 核心")
+    build_parser.add_argument("--force", action="store_true", help="忽略清单缓存，全部重新渲染")
+    build_parser.set_defaults(handler=_run_build)
+    return parser
+
+
+def _run_export(args: argparse.Namespace) -> int:
+    """执行导出子命令"""
+    inputs = args.inputs
+    if not args.output_dir and len(inputs) == 2 and inputs[1].lower().endswith((".html", ".htm")):
+        pairs = [(inputs[0], inputs[1])]
+    else:
+        pairs = []
+        for src in inputs:
+            name = os.path.splitext(os.path.basename(src))[0] + ".html"
+            dst_dir = args.output_dir or os.path.dirname(src)
+            pairs.append((src, os.path.join(dst_dir, name)))
+
+    failed = 0
+    for src, error in export_files(pairs, jobs=args.jobs):
+        if error:
+            failed += 1
+            print(f"导出失败: {src} - {error}", file=sys.stderr)
+    print(f"已导出 {len(pairs) - failed}/{len(pairs)} 个文件")
+    return 1 if failed else 0
+
+
+def _run_build(args: argparse.Namespace) -> int:
+    """执行目录批量导出子命令"""
+    exporter = BatchExporter(args.src_dir, args.out_dir, fmt=args.format, jobs=args.jobs)
+    stats = exporter.run(force=args.force)
+    for src, error in stats["failed"]:
+        print(f"导出失败: {src} - {error}", file=sys.stderr)
+    print(f"已渲染 {stats['rendered']} 个，跳过未变化 {stats['skipped']} 个，"
+          f"清理 {stats['removed']} 个，失败 {len(stats['failed'])} 个")
+    return 1 if stats["failed"] else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    args = _build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,24 @@
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 
+from components.editor.file_loader import FileLoader
 from components.editor.markdown_formatter import MarkdownFormatter
 from core.component_basic import ComponentBasic
 from core.component_manager import ComponentManager
 
 class TextEditor(ComponentBasic):
     """文本编辑器组件"""
+
+    STREAM_THRESHOLD = 1024 * 1024  # 不小于该字节数的文件在后台分块读取并逐步插入
+    STREAM_POLL_INTERVAL = 10  # 分块载入时轮询读取线程的间隔（毫秒）
+    STREAM_BUDGET = 0.030  # 每次轮询最多占用主线程插入文本的时间（秒）
+
     def __init__(self, manager: ComponentManager):
         super().__init__(name="text_editor", manager=manager)
         self.tab_file_paths = {}  # 每个标签页对应的文件路径 {tab_name: file_path}
+        self._loaders = {}  # 正在分块载入的文本组件 {text_widget: FileLoader}
 
         # 初始化Markdown格式化器
         self.markdown_formatter = MarkdownFormatter(manager)
@@ -24,6 +32,7 @@ class TextEditor(ComponentBasic):
         self.manager.subscribe("file.open", self._on_open_file)
         self.manager.subscribe("file.save", self._on_save_file)
         self.manager.subscribe("file.save_as", self._on_save_as_file)
+        self.manager.subscribe("file.close_tab", self.close_tab)
         self.manager.subscribe("edit.copy", self._on_copy)
         self.manager.subscribe("edit.paste", self._on_paste)
         self.manager.subscribe("edit.cut", self._on_cut)
@@ -32,10 +41,20 @@ class TextEditor(ComponentBasic):
         """订阅标签页相关事件"""
         self.manager.subscribe("tab_switched", self._on_tab_switched)
         self.manager.subscribe("new_tab_generated", self._on_new_tab_generated)
+        self.manager.subscribe("tab_closing", self._on_tab_closing)
     
-    def _on_new_tab_generated(self, tab_name: str) -> None:
+    def _on_new_tab_generated(self, tab_name: str, select: bool = True) -> None:
         """处理新标签页创建事件"""
         self.tab_file_paths[tab_name] = None  # 新标签页没有关联文件
+
+    def _on_tab_closing(self, tab_name: str, tab_frame) -> None:
+        """标签页关闭时丢弃其文件路径，并停止尚未完成的分块载入"""
+        self.tab_file_paths.pop(tab_name, None)
+        text_area_component = self.manager.get_component("text_area")
+        text_area = text_area_component.check_direct_text_child(tab_frame) if text_area_component else None
+        loader = self._loaders.pop(text_area, None)
+        if loader is not None:
+            loader.cancel()
     
     def _on_tab_switched(self, new_tab_frame) -> None:
         """处理标签页切换事件"""
@@ -64,9 +83,11 @@ class TextEditor(ComponentBasic):
         """新建文件 - 创建新标签页"""
         notebook = self.manager.get_component("component_notebook")
         if notebook:
-            # 生成唯一标签名
-            tab_count = len(notebook._tabs) + 1
-            tab_name = f"Untitled {tab_count}" # TODO: 可优化
+            # 生成唯一标签名（取最小的未使用序号，关闭标签页后序号可以复用）
+            tab_count = 1
+            while notebook.get_tab_by_name(f"Untitled {tab_count}") is not None:
+                tab_count += 1
+            tab_name = f"Untitled {tab_count}"
             new_tab = notebook.add_tab(tab_name)
             
             # 初始化该标签页的文件路径
@@ -78,64 +99,201 @@ class TextEditor(ComponentBasic):
                 status_component.set_status(f"已创建新文件: {tab_name}")
                 status_component.set_encoding("UTF-8")
     
+    def close_tab(self, tab_name: str = None) -> None:
+        """
+        关闭标签页（默认为当前标签页），有未保存的修改时先询问是否保存
+
+        关闭最后一个标签页后新建一个空白标签页，编辑区始终有可用的文本组件。
+        """
+        notebook = self.manager.get_component("component_notebook")
+        if not notebook or not notebook.notebook.tabs():
+            return
+        tab_name = tab_name or notebook.get_current_tab_name()
+        frame = notebook.get_tab_by_name(tab_name)
+        if frame is None:
+            return
+
+        text_area_component = self.manager.get_component("text_area")
+        undo_component = self.manager.get_component("component_undo")
+        text_area = text_area_component.check_direct_text_child(frame) if text_area_component else None
+        if text_area is not None and undo_component and undo_component.is_modified(text_area):
+            notebook.switch_tab_by_name(tab_name)  # 先切换过去，让用户看到要关闭的文档
+            answer = messagebox.askyesnocancel("关闭标签页", f"“{tab_name}”有未保存的修改，是否保存？")
+            if answer is None:
+                return
+            if answer:
+                self._on_save_file()
+                if undo_component.is_modified(text_area):
+                    return  # 保存被取消或失败
+                tab_name = notebook.get_current_tab_name()  # 另存为可能改变了标签名
+
+        notebook.close_tab(tab_name)
+        if not notebook.notebook.tabs():
+            self._on_new_file()
+
     def _on_open_file(self) -> None:
         """打开文件"""
+        # 打开文件选择对话框
+        file_path = filedialog.askopenfilename(
+            title="打开文件",
+            filetypes=[
+                ("Markdown文件", "*.md"),
+                ("文本文件", "*.txt"),
+                ("所有文件", "*.*")
+            ]
+        )
+        
+        if file_path:  # 用户选择了文件
+            self.open_file(file_path)
+
+    def open_file(self, file_path: str, line: int = None) -> None:
+        """
+        按路径打开文件到标签页（已存在同名标签页时更新其内容）
+
+        Args:
+            file_path: 文件路径
+            line: 打开后跳转到的行号（可选）
+        """
         try:
-            # 打开文件选择对话框
-            file_path = filedialog.askopenfilename(
-                title="打开文件",
-                filetypes=[
-                    ("Markdown文件", "*.md"),
-                    ("文本文件", "*.txt"),
-                    ("所有文件", "*.*")
-                ]
-            )
+            if os.path.getsize(file_path) >= self.STREAM_THRESHOLD:
+                self._open_file_streaming(file_path, line)
+                return
+            # 读取文件内容
+            with open(file_path, 'r', encoding='utf-8') as file:
+                content = file.read()
             
-            if file_path:  # 用户选择了文件
-                # 读取文件内容
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-                
-                # 获取或创建Notebook组件
-                notebook = self.manager.get_component("component_notebook")
-                if not notebook:
-                    return
-                
-                # 生成标签名（使用文件名）
-                file_name = os.path.basename(file_path)
-                tab_name = file_name
-                
-                # 检查是否已存在同名标签页
-                existing_tab = notebook.get_tab_by_name(tab_name)
-                if existing_tab:
-                    # 如果存在，切换到该标签页并更新内容
-                    notebook.switch_tab_by_name(tab_name)
-                    text_area = self._get_active_text_area()
-                    if text_area:
-                        text_area.delete(1.0, tk.END)
-                        text_area.insert(1.0, content)
-                    
-                    # 更新该标签页的文件路径
-                    self.tab_file_paths[tab_name] = file_path
-                else:
-                    # 创建新标签页
-                    new_tab = notebook.add_tab(tab_name)
-                    # 等待文本区域创建完成后再设置内容
-                    self.manager.root.after(100, lambda: self.set_file_path(tab_name, content, file_path))
+            # 获取或创建Notebook组件
+            notebook = self.manager.get_component("component_notebook")
+            if not notebook:
+                return
+            
+            # 生成标签名（使用文件名）
+            file_name = os.path.basename(file_path)
+            tab_name = file_name
+            
+            # 检查是否已存在同名标签页
+            existing_tab = notebook.get_tab_by_name(tab_name)
+            if existing_tab:
+                # 如果存在，切换到该标签页并更新内容
+                notebook.switch_tab_by_name(tab_name)
+                text_area = self._get_active_text_area()
+                if text_area:
+                    text_area.delete(1.0, tk.END)
+                    text_area.insert(1.0, content)
+                    text_area.edit_reset()  # 载入文件不作为可撤销的编辑
                 
-                # 更新状态栏
-                status_component = self.manager.get_component("component_status")
-                if status_component:
-                    status_component.set_status(f"已打开文件: {file_path}")
-                    status_component.set_encoding("UTF-8")
-                    # 更新光标位置（简单示例）
-                    status_component.set_cursor_position(1, 1)
+                # 更新该标签页的文件路径
+                self.tab_file_paths[tab_name] = file_path
+                if line:
+                    self.goto_line(line)
+            else:
+                # 创建新标签页
+                new_tab = notebook.add_tab(tab_name)
+                # 等待文本区域创建完成后再设置内容
+                def load_content():
+                    self.set_file_path(tab_name, content, file_path)
+                    if line:
+                        self.goto_line(line)
+                self.manager.root.after(100, load_content)
+            
+            # 更新状态栏
+            status_component = self.manager.get_component("component_status")
+            if status_component:
+                status_component.set_status(f"已打开文件: {file_path}")
+                status_component.set_encoding("UTF-8")
+                # 更新光标位置（简单示例）
+                status_component.set_cursor_position(1, 1)
                 
         except UnicodeDecodeError:
             messagebox.showerror("错误", "文件编码不支持，请选择UTF-8编码的文件")
         except Exception as e:
             messagebox.showerror("错误", f"打开文件失败: {str(e)}")
 
+    def _open_file_streaming(self, file_path: str, line: int = None) -> None:
+        """在后台分块读取大文件，读到的内容分批插入标签页，期间界面保持响应"""
+        notebook = self.manager.get_component("component_notebook")
+        text_area_component = self.manager.get_component("text_area")
+        if not notebook or not text_area_component:
+            return
+        tab_name = os.path.basename(file_path)
+        frame = notebook.get_tab_by_name(tab_name)
+        created = frame is None  # 读取失败时关闭为此新建的标签页
+        if not created:
+            notebook.switch_tab_by_name(tab_name)
+        else:
+            frame = notebook.add_tab(tab_name)
+        text_area = text_area_component.check_direct_text_child(frame)
+        if text_area is None:
+            return
+        self.tab_file_paths[tab_name] = file_path
+
+        previous = self._loaders.pop(text_area, None)
+        if previous is not None:
+            previous.cancel()
+        loader = FileLoader(file_path)
+        self._loaders[text_area] = loader
+        text_area.delete("1.0", tk.END)
+        text_area_component.begin_bulk_load(text_area)
+        loader.start()
+
+        status_component = self.manager.get_component("component_status")
+        if status_component:
+            status_component.set_status(f"正在打开文件: {file_path}")
+            status_component.set_encoding("UTF-8")
+        self._poll_stream(text_area, loader, line, created)
+
+    def _poll_stream(self, text_area: tk.Text, loader: FileLoader, line: int = None, created: bool = False) -> None:
+        """把读取线程已读到的内容插入文本组件，插完后结束载入"""
+        if self._loaders.get(text_area) is not loader or not text_area.winfo_exists():
+            loader.cancel()  # 已被新的载入取代，或标签页已关闭
+            return
+        deadline = time.perf_counter() + self.STREAM_BUDGET
+        while time.perf_counter() < deadline:
+            chunks = loader.take()
+            if not chunks:
+                break
+            text_area.insert("end-1c", chunks[0])
+        if not loader.done:
+            self.manager.root.after(self.STREAM_POLL_INTERVAL, lambda: self._poll_stream(text_area, loader, line, created))
+            return
+
+        del self._loaders[text_area]
+        text_area_component = self.manager.get_component("text_area")
+        text_area_component.end_bulk_load(text_area)
+        text_area.edit_reset()  # 载入文件不作为可撤销的编辑
+        status_component = self.manager.get_component("component_status")
+        if loader.error is not None:
+            self._discard_partial_load(text_area, created)
+            if isinstance(loader.error, UnicodeDecodeError):
+                messagebox.showerror("错误", "文件编码不支持，请选择UTF-8编码的文件")
+            else:
+                messagebox.showerror("错误", f"打开文件失败: {str(loader.error)}")
+            return
+        text_area.mark_set(tk.INSERT, "1.0")
+        if line and text_area is text_area_component.text_area:
+            self.goto_line(line)
+        if status_component:
+            status_component.set_status(f"已打开文件: {loader.path}")
+            status_component.set_cursor_position(line or 1, 1)
+
+    def _discard_partial_load(self, text_area: tk.Text, created: bool) -> None:
+        """
+        丢弃读取中途失败时已插入的部分内容
+
+        残缺的文本若仍关联原文件且没有修改标记，一次保存就会截断原文件：
+        为此新建的标签页直接关闭，复用的标签页清空内容并解除文件关联。
+        """
+        notebook = self.manager.get_component("component_notebook")
+        tab_name = notebook.notebook.tab(text_area.master, 'text')
+        if created:
+            notebook.close_tab(tab_name)
+            if not notebook.notebook.tabs():
+                self._on_new_file()
+        else:
+            text_area.delete("1.0", tk.END)
+            text_area.edit_reset()
+            self.tab_file_paths[tab_name] = None
+
     def _on_save_file(self) -> None:
         """保存文件"""
         try:
@@ -161,6 +319,7 @@ class TextEditor(ComponentBasic):
                 # 直接保存到原文件
                 with open(current_file_path, 'w', encoding='utf-8') as file:
                     file.write(content)
+                self._mark_saved(text_area)
                 
                 # 更新状态栏
                 status_component = self.manager.get_component("component_status")
@@ -207,6 +366,7 @@ class TextEditor(ComponentBasic):
                 # 保存文件
                 with open(file_path, 'w', encoding='utf-8') as file:
                     file.write(content)
+                self._mark_saved(text_area)
                 
                 # 更新该标签页的文件路径
                 self.tab_file_paths[current_tab_name] = file_path
@@ -227,6 +387,11 @@ class TextEditor(ComponentBasic):
         except Exception as e:
             messagebox.showerror("错误", f"保存文件失败: {str(e)}")
     
+    def _mark_saved(self, text_area: tk.Text) -> None:
+        undo_component = self.manager.get_component("component_undo")
+        if undo_component:
+            undo_component.mark_saved(text_area)
+    
     def _on_copy(self) -> None:
         """复制"""
         try:
@@ -268,10 +433,27 @@ class TextEditor(ComponentBasic):
         if text_area:
             text_area.delete(1.0, tk.END)
             text_area.insert(1.0, content)
+            text_area.edit_reset()  # 载入文件不作为可撤销的编辑
         
         # 更新文件路径映射
         self.tab_file_paths[tab_name] = file_path
     
+    def goto_line(self, line: int) -> None:
+        """将光标移动到当前标签页的指定行并滚动到可见位置"""
+        text_area = self._get_active_text_area()
+        if not text_area:
+            return
+        index = f"{line}.0"
+        text_area.mark_set(tk.INSERT, index)
+        text_area.tag_remove(tk.SEL, "1.0", tk.END)
+        text_area.tag_add(tk.SEL, index, f"{line}.end")
+        text_area.see(index)
+        text_area.focus_set()
+
+        status_component = self.manager.get_component("component_status")
+        if status_component:
+            status_component.set_cursor_position(line, 1)
+
     def get_file_path_for_tab(self, tab_name: str) -> str:
         """获取指定标签页的文件路径"""
         return self.tab_file_paths.get(tab_name)
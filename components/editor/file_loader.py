@@ -0,0 +1,62 @@
+import queue
+import threading
+from typing import List, Optional
+
+
+class FileLoader:
+    """
+    后台分块读取文本文件
+
+    读取线程按固定字符数解码（UTF-8，统一换行符）并放入有界队列，
+    主线程每次只取出一部分插入文本组件，界面在载入大文件时保持响应。
+    """
+
+    CHUNK_CHARS = 256 * 1024
+    MAX_QUEUED_CHUNKS = 16  # 队列上限，主线程来不及插入时读取线程等待，避免整个文件堆在内存中
+
+    def __init__(self, path: str):
+        self.path = path
+        self.error: Optional[Exception] = None  # 读取失败时的异常（OSError / UnicodeDecodeError）
+        self._chunks: queue.Queue = queue.Queue(maxsize=self.MAX_QUEUED_CHUNKS)
+        self._finished = threading.Event()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """停止读取，丢弃尚未取走的内容"""
+        self._cancelled.set()
+
+    @property
+    def done(self) -> bool:
+        """文件已读完（或读取失败）且队列中的内容已全部取走"""
+        return self._finished.is_set() and self._chunks.empty()
+
+    def _run(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                for chunk in iter(lambda: file.read(self.CHUNK_CHARS), ""):
+                    while not self._cancelled.is_set():
+                        try:
+                            self._chunks.put(chunk, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if self._cancelled.is_set():
+                        return
+        except (OSError, UnicodeDecodeError) as e:
+            self.error = e
+        finally:
+            self._finished.set()
+
+    def take(self, max_chunks: int = 1) -> List[str]:
+        """取出至多 max_chunks 块已读取的文本（不等待）"""
+        chunks = []
+        while len(chunks) < max_chunks:
+            try:
+                chunks.append(self._chunks.get_nowait())
+            except queue.Empty:
+                break
+        return chunks
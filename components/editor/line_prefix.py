@@ -0,0 +1,115 @@
+import re
+from typing import List, Optional, Tuple
+
+from components.outline.outline_index import is_fence_line
+
+# 各类行前缀的识别规则；同一组内的前缀互相替换（如无序列表改为有序列表）
+PREFIX_PATTERNS = {
+    "heading": re.compile(r'#{1,6} '),
+    "quote": re.compile(r'> ?'),
+    "unordered_list": re.compile(r'[-*+] '),
+    "ordered_list": re.compile(r'\d+[.)] '),
+}
+PREFIX_GROUPS = {
+    "heading": ("heading",),
+    "quote": ("quote",),
+    "unordered_list": ("unordered_list", "ordered_list"),
+    "ordered_list": ("unordered_list", "ordered_list"),
+}
+# 列表前缀放在缩进之后，保留嵌套层级；标题与引用始终从行首开始
+INDENTED_KINDS = ("unordered_list", "ordered_list")
+
+ColumnShift = Tuple[int, int]  # (旧前缀结束列, 新前缀结束列)
+
+
+def make_prefix(kind: str, level: int = 1, number: int = 1) -> str:
+    """生成指定类型的前缀文本"""
+    if kind == "heading":
+        return "#" * level + " "
+    if kind == "quote":
+        return "> "
+    if kind == "unordered_list":
+        return "- "
+    if kind == "ordered_list":
+        return f"{number}. "
+    raise ValueError(f"未知的行前缀类型: {kind}")
+
+
+def _split_prefix(line: str, kind: str) -> Tuple[str, Optional[str], Optional[str], str]:
+    """
+    拆分行的前缀
+
+    Returns:
+        (缩进, 已有前缀, 已有前缀类型, 正文)；没有同组前缀时前缀与类型为 None
+    """
+    indent = ""
+    if kind in INDENTED_KINDS:
+        indent = line[:len(line) - len(line.lstrip(" \t"))]
+    rest = line[len(indent):]
+    for group_kind in PREFIX_GROUPS[kind]:
+        match = PREFIX_PATTERNS[group_kind].match(rest)
+        if match:
+            return indent, match.group(), group_kind, rest[match.end():]
+    return indent, None, None, rest
+
+
+def _has_prefix(line: str, kind: str, level: int) -> bool:
+    _, prefix, prefix_kind, _ = _split_prefix(line, kind)
+    if prefix_kind != kind:
+        return False
+    return kind != "heading" or prefix == make_prefix(kind, level)
+
+
+def toggle_prefix(lines: List[str], kind: str, level: int = 1,
+                  skip_blank: bool = True) -> Tuple[List[str], List[ColumnShift]]:
+    """
+    为一组行切换前缀
+
+    所有目标行都已带有该前缀时移除前缀，否则为每一行加上前缀
+    （替换同组的其他前缀，例如把二级标题改为一级标题、把无序列表改为有序列表）。
+
+    Args:
+        lines: 行文本
+        kind: 前缀类型（见 PREFIX_PATTERNS）
+        level: 标题级别
+        skip_blank: 是否跳过空白行
+
+    Returns:
+        (新的行文本, 每行的列偏移 (旧前缀结束列, 新前缀结束列))
+    """
+    targets = [i for i, line in enumerate(lines) if not skip_blank or line.strip()]
+    remove = bool(targets) and all(_has_prefix(lines[i], kind, level) for i in targets)
+
+    new_lines = list(lines)
+    shifts: List[ColumnShift] = [(0, 0)] * len(lines)
+    numbers = {}  # 有序列表按缩进层级分别编号 {缩进: 当前序号}
+    for i in targets:
+        indent, old_prefix, _, body = _split_prefix(lines[i], kind)
+        if remove:
+            new_prefix = ""
+        else:
+            numbers[indent] = numbers.get(indent, 0) + 1
+            new_prefix = make_prefix(kind, level, numbers[indent])
+        new_lines[i] = indent + new_prefix + body
+        shifts[i] = (len(indent) + len(old_prefix or ""), len(indent) + len(new_prefix))
+    return new_lines, shifts
+
+
+def shift_column(column: int, shift: ColumnShift) -> int:
+    """把编辑前的列号映射到前缀变化后的列号"""
+    old_end, new_end = shift
+    if column >= old_end:
+        return column + new_end - old_end
+    return min(column, new_end)
+
+
+def toggle_code_fence(lines: List[str], fence: str = "```") -> Tuple[List[str], int]:
+    """
+    用代码块围栏包裹一组行；首尾两行已是围栏时移除围栏
+
+    Returns:
+        (新的行文本, 原有各行的行号偏移：包裹时为 1，移除时为 -1)
+    """
+    if len(lines) >= 2 and is_fence_line(lines[0]) and is_fence_line(lines[-1]):
+        return lines[1:-1], -1
+    return [fence] + lines + [fence], 1
@@ -1,5 +1,6 @@
 import tkinter as tk
-from typing import Optional
+from typing import List, Optional
+from components.editor.line_prefix import shift_column, toggle_code_fence, toggle_prefix
 from core.component_manager import ComponentManager
 
 class MarkdownFormatter:
@@ -86,28 +87,27 @@ class MarkdownFormatter:
     def _on_heading(self, level: int = 1) -> None:
         """处理多级标题 - # text"""
         if 1 <= level <= 6:
-            prefix = "#" * level + " "
-            self._apply_line_prefix_format(prefix)
+            self._apply_line_prefix_format("heading", level)
         else:
             print(f"无效的标题级别: {level}，支持1-6级")
     
     # ==================== 段落格式方法 ====================
     def _on_quote(self) -> None:
         """处理引用格式 - > text"""
-        self._apply_line_prefix_format("> ")
+        self._apply_line_prefix_format("quote")
     
     def _on_unordered_list(self) -> None:
         """处理无序列表 - - text"""
-        self._apply_line_prefix_format("- ")
+        self._apply_line_prefix_format("unordered_list")
     
     def _on_ordered_list(self) -> None:
         """处理有序列表 - 1. text"""
-        self._apply_line_prefix_format("1. ")
+        self._apply_line_prefix_format("ordered_list")
     
     # ==================== 块格式方法 ====================
     def _on_code_block(self) -> None:
         """处理代码块 - ```language\n代码\n```"""
-        self._apply_block_format("```\n", "\n```")
+        self._apply_code_block_format("```\n", "\n```")
     
     def _on_horizontal_rule(self) -> None:
         """处理水平分割线 - ---"""
@@ -141,8 +141,8 @@ class MarkdownFormatter:
         except Exception as e:
             print(f"应用Markdown格式时出错: {e}")
     
-    def _apply_line_prefix_format(self, prefix: str) -> None:
-        """应用行前缀格式（如标题、引用、列表等）"""
+    def _apply_line_prefix_format(self, kind: str, level: int = 1) -> None:
+        """切换行前缀格式（如标题、引用、列表等），所有行都已带有该前缀时移除"""
         try:
             text_area = self._get_active_text_area()
             if not text_area:
@@ -150,17 +150,17 @@ class MarkdownFormatter:
         
             # 检查是否有选中文本
             if text_area.tag_ranges(tk.SEL):
-                # 有选中文本：为每一行添加前缀
-                self._format_selected_lines(text_area, prefix)
+                # 有选中文本：为每一行切换前缀
+                self._format_selected_lines(text_area, kind, level)
             else:
-                # 没有选中文本：为当前行添加前缀
-                self._format_current_line(text_area, prefix)
+                # 没有选中文本：为当前行切换前缀
+                self._format_current_line(text_area, kind, level)
                 
         except Exception as e:
             print(f"应用行前缀格式时出错: {e}")
     
-    def _apply_block_format(self, prefix: str, suffix: str) -> None:
-        """应用块格式（如代码块等）"""
+    def _apply_code_block_format(self, prefix: str, suffix: str) -> None:
+        """应用代码块格式：选中的行被围栏包裹，已被包裹时移除围栏"""
         try:
             text_area = self._get_active_text_area()
             if not text_area:
@@ -168,8 +168,8 @@ class MarkdownFormatter:
         
             # 检查是否有选中文本
             if text_area.tag_ranges(tk.SEL):
-                # 有选中文本：包装成块
-                self._format_selected_block(text_area, prefix, suffix)
+                # 有选中文本：切换选中行的围栏
+                self._toggle_selected_code_block(text_area, prefix.strip())
             else:
                 # 没有选中文本：插入空的块格式
                 self._insert_empty_block(text_area, prefix, suffix)
@@ -266,92 +266,115 @@ class MarkdownFormatter:
         # 发布光标位置事件
         self._publish_cursor_position(middle_pos)
     
-    def _format_selected_lines(self, text_area: tk.Text, prefix: str) -> None:
-        """为选中的多行文本添加前缀"""
+    def _selected_line_range(self, text_area: tk.Text):
+        """选中文本覆盖的行范围（选区结束于下一行行首时不包含该行）"""
+        start_line, _ = map(int, text_area.index(tk.SEL_FIRST).split('.'))
+        end_line, end_column = map(int, text_area.index(tk.SEL_LAST).split('.'))
+        if end_column == 0 and end_line > start_line:
+            end_line -= 1
+        return start_line, end_line
+
+    def _format_selected_lines(self, text_area: tk.Text, kind: str, level: int) -> None:
+        """为选中的多行文本切换前缀（跳过空行）"""
         try:
-            start_pos = text_area.index(tk.SEL_FIRST)
-            end_pos = text_area.index(tk.SEL_LAST)
-            
-            # 获取选中的起始和结束行号
-            start_line = int(start_pos.split('.')[0])
-            end_line = int(end_pos.split('.')[0])
-            
-            # 从后往前处理，避免行号变化影响
-            for line_num in range(end_line, start_line - 1, -1):
-                line_start = f"{line_num}.0"
-                line_content = text_area.get(line_start, f"{line_num}.end")
-                
-                # 如果行不为空，添加前缀
-                if line_content.strip():
-                    text_area.insert(line_start, prefix)
-            
-            # 更新光标位置到最后
-            final_pos = f"{end_line}.end"
-            text_area.mark_set(tk.INSERT, final_pos)
-            text_area.see(final_pos)
-            text_area.focus_set()
-            
-            # 发布光标位置事件
-            self._publish_cursor_position(final_pos)
-            
+            first, last = self._selected_line_range(text_area)
+            self._toggle_line_prefix(text_area, first, last, kind, level, skip_blank=True)
         except Exception as e:
             print(f"格式化选中行时出错: {e}")
-    
-    def _format_current_line(self, text_area: tk.Text, prefix: str) -> None:
-        """为当前行添加前缀"""
+
+    def _format_current_line(self, text_area: tk.Text, kind: str, level: int) -> None:
+        """为当前行切换前缀（空行同样添加）"""
         try:
-            cursor_pos = text_area.index(tk.INSERT)
-            current_line = cursor_pos.split('.')[0]
-            line_start = f"{current_line}.0"
-            line_content = text_area.get(line_start, f"{current_line}.end")
-            
-            # 如果行不为空，添加前缀
-            if line_content.strip():
-                text_area.insert(line_start, prefix)
-            else:
-                # 如果是空行，直接插入前缀
-                text_area.insert(line_start, prefix)
-            
-            # 将光标移动到前缀之后
-            new_cursor_pos = f"{current_line}.{len(prefix)}"
-            text_area.mark_set(tk.INSERT, new_cursor_pos)
-            text_area.see(new_cursor_pos)
-            text_area.focus_set()
-            
-            # 发布光标位置事件
-            self._publish_cursor_position(new_cursor_pos)
-            
+            line = int(text_area.index(tk.INSERT).split('.')[0])
+            self._toggle_line_prefix(text_area, line, line, kind, level, skip_blank=False)
         except Exception as e:
             print(f"格式化当前行时出错: {e}")
-    
-    def _format_selected_block(self, text_area: tk.Text, prefix: str, suffix: str) -> None:
-        """将选中文本包装成块格式"""
+
+    def _toggle_line_prefix(self, text_area: tk.Text, first: int, last: int,
+                            kind: str, level: int, skip_blank: bool) -> None:
+        """
+        为 [first, last] 行切换前缀
+
+        新文本在 Python 中一次算好，再用一次 replace 写回（一个撤销步骤）；
+        选区与光标按每行前缀长度的变化平移。
+        """
+        old_lines = text_area.get(f"{first}.0", f"{last}.end").split('\n')
+        new_lines, shifts = toggle_prefix(old_lines, kind, level, skip_blank)
+
+        def map_position(index: str) -> str:
+            line, column = map(int, text_area.index(index).split('.'))
+            if first <= line <= last:
+                column = shift_column(column, shifts[line - first])
+            return f"{line}.{column}"
+
+        self._replace_lines(text_area, first, old_lines, new_lines, map_position)
+
+    def _toggle_selected_code_block(self, text_area: tk.Text, fence: str) -> None:
+        """用围栏包裹选中的行；首尾行已是围栏时移除围栏"""
         try:
-            start_pos = text_area.index(tk.SEL_FIRST)
-            end_pos = text_area.index(tk.SEL_LAST)
-            
-            # 获取选中的文本内容
-            selected_text = text_area.get(start_pos, end_pos)
-            
-            # 删除选中的文本
-            text_area.delete(start_pos, end_pos)
-            
-            # 在原位置插入带格式的文本
-            formatted_text = f"{prefix}{selected_text}{suffix}"
-            text_area.insert(start_pos, formatted_text)
-            
-            # 设置新的光标位置（在格式化文本之后）
-            new_cursor_pos = f"{start_pos}+{len(formatted_text)}c"
-            text_area.mark_set(tk.INSERT, new_cursor_pos)
-            text_area.see(new_cursor_pos)
-            text_area.focus_set()
-            
-            # 发布光标位置事件
-            self._publish_cursor_position(new_cursor_pos)
-            
-        except tk.TclError as e:
+            first, last = self._selected_line_range(text_area)
+            old_lines = text_area.get(f"{first}.0", f"{last}.end").split('\n')
+            new_lines, offset = toggle_code_fence(old_lines, fence)
+            new_last = first + len(new_lines) - 1
+
+            def map_position(index: str) -> str:
+                line, column = map(int, text_area.index(index).split('.'))
+                if first <= line <= last:
+                    line = min(max(line + offset, first), max(new_last, first))
+                elif line > last:
+                    line += len(new_lines) - len(old_lines)
+                return f"{line}.{column}"
+
+            self._replace_lines(text_area, first, old_lines, new_lines, map_position)
+        except tk.TclError:
             # 没有选中文本的异常处理
-            self._insert_empty_block(text_area, prefix, suffix)
+            self._insert_empty_block(text_area, f"{fence}\n", f"\n{fence}")
+
+    def _replace_lines(self, text_area: tk.Text, first: int, old_lines: List[str],
+                       new_lines: List[str], map_position) -> None:
+        """
+        将 first 行开始的 old_lines 替换为 new_lines，并恢复选区与光标
+
+        只替换首尾未变化的行之间的部分；替换前后各加一个撤销分隔符，
+        期间关闭自动分隔，使整个替换成为一个撤销步骤。
+        """
+        if old_lines == new_lines:
+            return
+        # 记录编辑前的选区与光标，并换算到编辑后的位置
+        selection = text_area.tag_ranges(tk.SEL)
+        new_selection = [map_position(index) for index in selection]
+        new_insert = map_position(tk.INSERT)
+
+        # 去掉首尾相同的行（两侧至少各保留一行，保证区间非空）
+        shortest = min(len(old_lines), len(new_lines))
+        head = 0
+        while head < shortest - 1 and old_lines[head] == new_lines[head]:
+            head += 1
+        tail = 0
+        while tail < shortest - 1 - head and old_lines[-1 - tail] == new_lines[-1 - tail]:
+            tail += 1
+        start_line = first + head
+        end_line = first + len(old_lines) - 1 - tail
+        replacement = '\n'.join(new_lines[head:len(new_lines) - tail])
+
+        autoseparators = text_area.cget("autoseparators")
+        text_area.config(autoseparators=False)
+        try:
+            text_area.edit_separator()
+            text_area.replace(f"{start_line}.0", f"{end_line}.end", replacement)
+            text_area.edit_separator()
+        finally:
+            text_area.config(autoseparators=autoseparators)
+
+        text_area.tag_remove(tk.SEL, "1.0", tk.END)
+        if new_selection:
+            text_area.tag_add(tk.SEL, *new_selection)
+        text_area.mark_set(tk.INSERT, new_insert)
+        text_area.see(new_insert)
+        text_area.focus_set()
+
+        # 发布光标位置事件
+        self._publish_cursor_position(new_insert)
     
     def _insert_empty_block(self, text_area: tk.Text, prefix: str, suffix: str) -> None:
         """插入空的块格式"""
@@ -1,7 +1,54 @@
+import hashlib
+import json
+import os
+import sys
 import tkinter as tk
 from tkinter import font
 from typing import Dict, List, Optional, Tuple
 from core.component_manager import ComponentManager
+from utils.app_dirs import get_cache_dir
+
+FONT_CACHE_FILE = "fonts.json"
+
+# 命名字体角色：每个角色对应一个 tkinter.font.Font，控件按名称引用，
+# 字体变化时只需 configure 一次，由 Tk 自动传播到所有引用该字体的控件
+FONT_ROLES = [
+    "editor", "editor_bold", "editor_italic", "status", "code",
+    "preview_body", "preview_bold", "preview_italic", "preview_bold_italic",
+    "preview_h1", "preview_h2", "preview_h3", "preview_h4", "preview_h5", "preview_h6",
+]
+STATUS_FONT_SIZE = 12
+CODE_FONT = ("Consolas", 11)
+# 预览区字体：基准字号随编辑器字号等比缩放
+PREVIEW_FONT = "Microsoft YaHei"
+PREVIEW_BASE_SIZE = 12
+PREVIEW_HEADING_SIZES = {1: 18, 2: 16, 3: 14, 4: 13, 5: 12, 6: 11}
+# 编辑区语法高亮使用的编辑器字体变体
+EDITOR_INLINE_STYLES = {
+    "editor_bold": {"weight": "bold"},
+    "editor_italic": {"slant": "italic"},
+}
+PREVIEW_INLINE_STYLES = {
+    "preview_body": {},
+    "preview_bold": {"weight": "bold"},
+    "preview_italic": {"slant": "italic"},
+    "preview_bold_italic": {"weight": "bold", "slant": "italic"},
+}
+
+# 字体目录与 fontconfig 配置/缓存目录：字体安装或 fc-cache 重建后其修改时间会变化
+if sys.platform == "win32":
+    FONT_CONFIG_PATHS = [
+        os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts"),
+        os.path.join(os.environ.get("LOCALAPPDATA", ""), "Microsoft", "Windows", "Fonts"),
+    ]
+elif sys.platform == "darwin":
+    FONT_CONFIG_PATHS = ["/System/Library/Fonts", "/Library/Fonts", "~/Library/Fonts"]
+else:
+    FONT_CONFIG_PATHS = [
+        "/etc/fonts/fonts.conf", "/etc/fonts/conf.d", "~/.config/fontconfig",
+        "/var/cache/fontconfig", "~/.cache/fontconfig",
+        "/usr/share/fonts", "/usr/local/share/fonts", "~/.fonts", "~/.local/share/fonts",
+    ]
 
 class FontManager:
     """字体管理器 - 统一管理应用中的字体设置"""
@@ -12,10 +59,15 @@ class FontManager:
         self._default_font_size = 13          # 默认字体大小
         self._current_font_family = self._default_font_family
         self._current_font_size = self._default_font_size
-        self._available_fonts = self._get_available_fonts()
+        self._available_fonts = None  # 首次需要时才枚举（见 get_available_fonts）
         
         # 字体变化监听器
         self._font_change_listeners = []
+
+        # 命名字体注册表 {角色: Font}，以及带额外属性的变体 {(角色, 属性): Font}
+        self._named_fonts: Dict[str, font.Font] = {}
+        self._variant_fonts: Dict[tuple, font.Font] = {}
+        self._resolved_families: Dict[tuple, str] = {}  # 缺失字体的回退结果缓存
         
         # 初始化字体设置
         self._initialize_font_settings()
@@ -23,11 +75,14 @@ class FontManager:
         self._bind_events()
     
     def _get_available_fonts(self) -> List[str]:
-        """获取系统可用字体列表"""
+        """获取系统可用字体列表（优先读取磁盘缓存，失效时复用主窗口枚举）"""
+        cache_key = self._font_cache_key()
+        cached = self._load_font_cache(cache_key)
+        if cached:
+            return cached
+
         try:
-            root = tk.Tk()
-            available_fonts = list(font.families())
-            root.destroy()
+            available_fonts = list(font.families(root=self.manager.root))
             # 过滤常用字体并排序
             common_fonts = [
                 "微软雅黑", "宋体", "黑体", "楷体", "仿宋",
@@ -43,11 +98,52 @@ class FontManager:
             for font_name in available_fonts:
                 if font_name not in result:
                     result.append(font_name)
-            return result[:50]  # 限制数量避免过多
+            result = result[:50]  # 限制数量避免过多
+            self._save_font_cache(cache_key, result)
+            return result
         except Exception as e:
             print(f"获取字体列表时出错: {e}")
             return ["微软雅黑", "宋体", "黑体", "Arial", "Times New Roman"]
-    
+
+    @staticmethod
+    def _font_cache_key() -> str:
+        """根据平台、Tk 版本以及字体/fontconfig 目录的修改时间生成缓存失效键"""
+        parts = [sys.platform, str(tk.TkVersion)]
+        for path in FONT_CONFIG_PATHS:
+            path = os.path.expanduser(path)
+            try:
+                parts.append(f"{path}:{os.stat(path).st_mtime_ns}")
+                if os.path.isdir(path):
+                    # 字体通常安装在一级子目录中，子目录内增删文件只会改变子目录的修改时间
+                    with os.scandir(path) as entries:
+                        for entry in entries:
+                            if entry.is_dir():
+                                parts.append(f"{entry.path}:{entry.stat().st_mtime_ns}")
+            except OSError:
+                continue
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _load_font_cache(cache_key: str) -> Optional[List[str]]:
+        """读取字体列表缓存，键不匹配时视为失效"""
+        try:
+            with open(os.path.join(get_cache_dir(), FONT_CACHE_FILE), 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            if data.get("key") == cache_key:
+                return data.get("fonts")
+        except (OSError, ValueError):
+            pass
+        return None
+
+    @staticmethod
+    def _save_font_cache(cache_key: str, fonts: List[str]) -> None:
+        """保存字体列表缓存"""
+        try:
+            with open(os.path.join(get_cache_dir(), FONT_CACHE_FILE), 'w', encoding='utf-8') as file:
+                json.dump({"key": cache_key, "fonts": fonts}, file, ensure_ascii=False)
+        except OSError as e:
+            print(f"保存字体缓存时出错: {e}")
+
     def _initialize_font_settings(self) -> None:
         """初始化字体设置"""
         pass
@@ -88,7 +184,7 @@ class FontManager:
         """
         changed = False
         
-        if family and family in self._available_fonts:
+        if family and family in self.get_available_fonts():
             self._current_font_family = family
             changed = True
         
@@ -119,8 +215,96 @@ class FontManager:
         if new_size >= 8:
             self.set_font(size=new_size)
     
+    def _role_font_config(self, role: str) -> Dict:
+        """计算某个字体角色在当前设置下的字体属性"""
+        if role == "editor":
+            return {"family": self._current_font_family, "size": self._current_font_size}
+        if role in EDITOR_INLINE_STYLES:
+            return {"family": self._current_font_family, "size": self._current_font_size, **EDITOR_INLINE_STYLES[role]}
+        if role == "status":
+            return {"family": self._current_font_family, "size": STATUS_FONT_SIZE}
+        if role == "code":
+            return {"family": self._resolve_family(CODE_FONT[0], "TkFixedFont"),
+                    "size": self._scaled_size(CODE_FONT[1])}
+        if role in PREVIEW_INLINE_STYLES:
+            return {"family": self._resolve_family(PREVIEW_FONT, "TkDefaultFont"),
+                    "size": self._scaled_size(PREVIEW_BASE_SIZE), **PREVIEW_INLINE_STYLES[role]}
+        if role.startswith("preview_h"):
+            level = int(role[len("preview_h"):])
+            return {"family": self._resolve_family(PREVIEW_FONT, "TkDefaultFont"),
+                    "size": self._scaled_size(PREVIEW_HEADING_SIZES[level]), "weight": "bold"}
+        raise ValueError(f"未知的字体角色: {role}")
+
+    def _scaled_size(self, base_size: int) -> int:
+        """按当前编辑器字号相对默认字号的比例缩放预览字号"""
+        return max(6, round(base_size * self._current_font_size / self._default_font_size))
+
+    def _resolve_family(self, family: str, fallback: str) -> str:
+        """字体不存在时（如 Linux 上没有微软雅黑）回退到 Tk 的标准字体族"""
+        key = (family, fallback)
+        resolved = self._resolved_families.get(key)
+        if resolved is None:
+            try:
+                actual = font.Font(root=self.manager.root, family=family).actual("family")
+                if actual.lower() == family.lower():
+                    resolved = family
+                else:
+                    resolved = font.nametofont(fallback, root=self.manager.root).actual("family")
+            except Exception as e:
+                print(f"解析字体 {family} 时出错: {e}")
+                resolved = family
+            self._resolved_families[key] = resolved
+        return resolved
+
+    def get_named_font(self, role: str) -> font.Font:
+        """
+        获取指定角色的命名字体（首次使用时创建，全局唯一）
+
+        控件应直接引用返回的 Font（或其名称），不要各自创建 Font 对象。
+        """
+        named_font = self._named_fonts.get(role)
+        if named_font is None:
+            if role not in FONT_ROLES:
+                raise ValueError(f"未知的字体角色: {role}")
+            named_font = font.Font(
+                root=self.manager.root,
+                name=f"berrypad_{role}",
+                **self._role_font_config(role)
+            )
+            self._named_fonts[role] = named_font
+        return named_font
+
+    def _get_variant_font(self, role: str, **overrides) -> font.Font:
+        """获取带额外属性（如 weight、slant）的角色字体变体"""
+        if not overrides:
+            return self.get_named_font(role)
+        key = (role, tuple(sorted(overrides.items())))
+        variant = self._variant_fonts.get(key)
+        if variant is None:
+            config = self._role_font_config(role)
+            config.update(overrides)
+            variant = font.Font(
+                root=self.manager.root,
+                name=f"berrypad_{role}_" + "_".join(f"{k}_{v}" for k, v in key[1]),
+                **config
+            )
+            self._variant_fonts[key] = variant
+        return variant
+
+    def _configure_named_fonts(self) -> None:
+        """按当前设置重新配置所有已创建的命名字体（Tk 自动重绘引用它们的控件）"""
+        for role, named_font in self._named_fonts.items():
+            named_font.configure(**self._role_font_config(role))
+        for (role, overrides), variant in self._variant_fonts.items():
+            config = self._role_font_config(role)
+            config.update(overrides)
+            variant.configure(**config)
+
     def _notify_font_change(self) -> None:
         """通知所有监听器字体已改变"""
+        # 命名字体一次性更新，无需逐个控件设置
+        self._configure_named_fonts()
+
         # 发布全局字体变化事件
         self.manager.publish(
             "font_changed", 
@@ -140,11 +324,13 @@ class FontManager:
         return (self._current_font_family, self._current_font_size)
     
     def get_font_object(self) -> font.Font:
-        """获取当前字体对象"""
-        return font.Font(family=self._current_font_family, size=self._current_font_size)
+        """获取当前编辑器字体对象（共享的命名字体）"""
+        return self.get_named_font("editor")
     
     def get_available_fonts(self) -> List[str]:
-        """获取可用字体列表"""
+        """获取可用字体列表（首次调用时才进行字体发现）"""
+        if self._available_fonts is None:
+            self._available_fonts = self._get_available_fonts()
         return self._available_fonts.copy()
     
     def add_font_change_listener(self, listener: callable) -> None:
@@ -157,35 +343,24 @@ class FontManager:
         if listener in self._font_change_listeners:
             self._font_change_listeners.remove(listener)
     
-    def apply_font_to_widget(self, widget: tk.Widget, **kwargs) -> None:
+    def apply_font_to_widget(self, widget: tk.Widget, role: str = "editor", **kwargs) -> None:
         """
-        应用当前字体到指定控件
-        
+        应用命名字体到指定控件，之后字体变化由 Tk 自动传播
+
         Args:
             widget: tkinter 控件
+            role: 字体角色，默认为编辑器字体
             **kwargs: 额外的字体属性（如 weight, slant 等）
         """
         try:
-            font_config = {
-                'family': self._current_font_family,
-                'size': self._current_font_size
-            }
-            font_config.update(kwargs)
-            
-            widget.config(font=font.Font(**font_config))
+            widget.config(font=self._get_variant_font(role, **kwargs))
         except Exception as e:
             print(f"应用字体到控件时出错: {e}")
-    
+
     def get_font_metrics(self) -> Dict[str, int]:
         """获取当前字体的度量信息"""
         try:
-            current_font = font.Font(family=self._current_font_family, size=self._current_font_size)
-            return {
-                'ascent': current_font.metrics('ascent'),
-                'descent': current_font.metrics('descent'),
-                'linespace': current_font.metrics('linespace'),
-                'fixed': current_font.metrics('fixed')
-            }
+            return self.get_named_font("editor").metrics()
         except Exception as e:
             print(f"获取字体度量信息时出错: {e}")
             return {}
@@ -0,0 +1,174 @@
+import tkinter as tk
+from typing import Dict, List, Optional
+
+from components.highlight.markdown_lexer import HIGHLIGHT_TAGS, LineStates, tokenize
+from core.component_basic import ComponentBasic
+from core.component_manager import ComponentManager
+
+
+class ComponentHighlighter(ComponentBasic):
+    """
+    编辑区 Markdown 语法高亮组件
+
+    只重新分析被编辑的行以及行首状态（是否在代码块内）发生变化的行；
+    可见区域立即着色，其余部分在空闲时间分片完成。
+    """
+
+    SYNC_PROPAGATE_LINES = 2000  # 编辑时同步传播状态的最大行数，超出部分放到空闲时间
+    IDLE_SLICE_LINES = 300  # 每个空闲分片最多着色的行数
+    IDLE_INTERVAL = 10  # 空闲分片之间的间隔（毫秒），给键盘与绘制事件留出时间
+
+    def __init__(self, manager: ComponentManager, font_manager):
+        super().__init__(
+            name="component_highlighter",
+            manager=manager
+        )
+        self.font_manager = font_manager
+        self._documents: Dict[tk.Text, LineStates] = {}  # 每个文本组件的行状态 {text_widget: LineStates}
+        self._idle_id = None  # 空闲着色定时器ID
+
+        self.manager.subscribe("text_edited", self._on_text_edited)
+        self.manager.subscribe("text_scrolled", self._on_text_scrolled)
+        self.manager.subscribe("tab_switched", self._on_tab_switched)
+
+    def _setup_tags(self, text_widget: tk.Text) -> None:
+        """配置高亮标签样式"""
+        text_widget.tag_configure("md_code_block", background="#f6f8fa")
+        text_widget.tag_configure("md_quote", foreground="#6a737d")
+        text_widget.tag_configure("md_heading", foreground="#005cc5", font=self.font_manager.get_named_font("editor_bold"))
+        text_widget.tag_configure("md_bold", font=self.font_manager.get_named_font("editor_bold"))
+        text_widget.tag_configure("md_italic", font=self.font_manager.get_named_font("editor_italic"))
+        text_widget.tag_configure("md_strike", overstrike=True)
+        text_widget.tag_configure("md_code", foreground="#d73a49", background="#f6f8fa")
+        text_widget.tag_configure("md_link", foreground="#0366d6")
+        text_widget.tag_configure("md_url", foreground="#6a737d", underline=True)
+        text_widget.tag_configure("md_list", foreground="#e36209")
+        text_widget.tag_configure("md_hr", foreground="#959da5")
+        text_widget.tag_configure("md_fence", foreground="#6f42c1")
+        text_widget.tag_configure("md_marker", foreground="#959da5")
+        # 选中效果始终显示在高亮之上
+        text_widget.tag_raise("sel")
+
+    def _get_document(self, text_widget: tk.Text) -> LineStates:
+        """获取文本组件的行状态，不存在时从全文构建"""
+        document = self._documents.get(text_widget)
+        if document is None:
+            self._setup_tags(text_widget)
+            document = LineStates()
+            document.reset(text_widget.get("1.0", "end-1c").split('\n'))
+            self._documents[text_widget] = document
+            text_widget.bind("<Destroy>", lambda event, w=text_widget: self._on_text_destroyed(event, w), add="+")
+        return document
+
+    def _on_text_destroyed(self, event, text_widget: tk.Text) -> None:
+        if event.widget is text_widget:
+            self._documents.pop(text_widget, None)
+
+    @staticmethod
+    def _get_lines(text_widget: tk.Text, start: int, end: int) -> List[str]:
+        """读取 [start, end] 行的文本"""
+        return text_widget.get(f"{start}.0", f"{end}.end").split('\n')
+
+    def _on_text_edited(self, text_widget: tk.Text, edit) -> None:
+        """增量更新行状态，并立即为可见区域着色"""
+        document = self._documents.get(text_widget)
+        if document is None:
+            # 首次编辑时全量构建，之后的编辑都走增量路径
+            document = self._get_document(text_widget)
+        else:
+            document.apply_edit(edit.start_line, edit.old_end_line, edit.new_end_line)
+            document.propagate(
+                lambda start, end: self._get_lines(text_widget, start, end),
+                self.SYNC_PROPAGATE_LINES
+            )
+        self._highlight_visible(text_widget)
+        self._schedule_idle()
+
+    def _on_text_scrolled(self, fraction, line=None) -> None:
+        """滚动到尚未着色的区域时立即着色"""
+        text_widget = self._get_active_text()
+        if text_widget is not None and text_widget in self._documents:
+            self._highlight_visible(text_widget)
+
+    def _on_tab_switched(self, new_tab_frame: tk.Frame) -> None:
+        """切换标签页后优先着色新标签页的可见区域"""
+        # 等文本区域组件完成切换后再取当前文本组件
+        self.manager.root.after_idle(self._highlight_active)
+
+    def _highlight_active(self) -> None:
+        text_widget = self._get_active_text()
+        if text_widget is not None and text_widget.winfo_exists():
+            self._get_document(text_widget)
+            self._highlight_visible(text_widget)
+            self._schedule_idle()
+
+    def _get_active_text(self) -> Optional[tk.Text]:
+        text_area_component = self.manager.get_component("text_area")
+        return text_area_component.text_area if text_area_component else None
+
+    @staticmethod
+    def _visible_lines(text_widget: tk.Text):
+        """当前可见的行号范围"""
+        first = int(text_widget.index("@0,0").split('.')[0])
+        last = int(text_widget.index(f"@0,{max(text_widget.winfo_height(), 1)}").split('.')[0])
+        return first, last
+
+    def _highlight_visible(self, text_widget: tk.Text) -> None:
+        document = self._documents[text_widget]
+        first, last = self._visible_lines(text_widget)
+        self._highlight_lines(text_widget, document, first, last)
+
+    def _highlight_lines(self, text_widget: tk.Text, document: LineStates, first: int, last: int) -> int:
+        """
+        为 [first, last] 范围内待着色的行重新着色，返回着色的行数
+
+        每个标签只调用一次 tag_remove 与 tag_add（批量传入所有区间），减少 Tcl 调用次数
+        """
+        last = min(last, len(document))
+        line = document.next_dirty(first, last)
+        if line is None:
+            return 0
+
+        base = line
+        lines = self._get_lines(text_widget, base, last)
+        clear_ranges = []
+        tag_ranges = {tag: [] for tag in HIGHLIGHT_TAGS}
+        count = 0
+        while line is not None:
+            text = lines[line - base]
+            clear_ranges.extend((f"{line}.0", f"{line}.end"))
+            for tag, start, end in tokenize(text, document.state_at(line)):
+                tag_ranges[tag].extend((f"{line}.{start}", f"{line}.{end}"))
+            document.clear_dirty(line)
+            count += 1
+            line = document.next_dirty(line + 1, last)
+
+        for tag in HIGHLIGHT_TAGS:
+            text_widget.tag_remove(tag, *clear_ranges)
+            if tag_ranges[tag]:
+                text_widget.tag_add(tag, *tag_ranges[tag])
+        return count
+
+    def _schedule_idle(self) -> None:
+        if self._idle_id is None:
+            self._idle_id = self.manager.root.after(self.IDLE_INTERVAL, self._idle_step)
+
+    def _idle_step(self) -> None:
+        """空闲分片：先继续传播过期状态，再为下一批待着色的行着色"""
+        self._idle_id = None
+        active = self._get_active_text()
+        # 当前标签页优先，其余标签页随后
+        documents = sorted(self._documents.items(), key=lambda item: item[0] is not active)
+        for text_widget, document in documents:
+            if document.has_stale:
+                document.propagate(
+                    lambda start, end, w=text_widget: self._get_lines(w, start, end),
+                    self.IDLE_SLICE_LINES * 4
+                )
+                self._schedule_idle()
+                return
+            line = document.next_dirty()
+            if line is not None:
+                self._highlight_lines(text_widget, document, line, line + self.IDLE_SLICE_LINES - 1)
+                self._schedule_idle()
+                return
@@ -0,0 +1,209 @@
+import re
+from bisect import bisect_left, insort
+from typing import Callable, List, Optional, Tuple
+
+from components.outline.outline_index import is_fence_line
+
+# 语法高亮标签（按优先级从低到高排列，后配置的标签覆盖先配置的）
+HIGHLIGHT_TAGS = (
+    "md_code_block", "md_quote", "md_heading", "md_bold", "md_italic", "md_strike",
+    "md_code", "md_link", "md_url", "md_list", "md_hr", "md_fence", "md_marker",
+)
+
+HEADER_MARKER_PATTERN = re.compile(r'^(#{1,6})\s+\S')
+HR_PATTERN = re.compile(r'^\s*(-{3,}|\*{3,}|_{3,}|\+{3,})\s*$')
+QUOTE_PATTERN = re.compile(r'^\s*>')
+LIST_MARKER_PATTERN = re.compile(r'^\s*([-*+]|\d+\.)\s+')
+# 使用否定字符类而非惰性匹配，病态的强调标记串也只需线性时间
+INLINE_PATTERN = re.compile(
+    r'(?P<code>`[^`]+`)'
+    r'|(?P<link>\[[^\]]+\])(?P<url>\([^)\s]+\))'
+    r'|(?P<bold>\*\*\*?[^*]+\*\*\*?|__[^_]+__)'
+    r'|(?P<strike>~~[^~]+~~)'
+    r'|(?P<italic>\*[^*\s][^*]*\*|_[^_\s][^_]*_)'
+)
+
+# 行首状态：是否处于代码块内
+LexerState = bool
+
+Token = Tuple[str, int, int]  # (标签, 起始列, 结束列)
+
+
+def next_state(line: str, state: LexerState) -> LexerState:
+    """计算下一行的行首状态"""
+    return not state if is_fence_line(line) else state
+
+
+def _inline_tokens(line: str, offset: int, tokens: List[Token]) -> None:
+    """识别行内强调、代码与链接"""
+    for m in INLINE_PATTERN.finditer(line, offset):
+        kind = m.lastgroup
+        start, end = m.span()
+        if kind == "url":
+            tokens.append(("md_link", *m.span("link")))
+            tokens.append(("md_url", *m.span("url")))
+            continue
+        tokens.append((f"md_{kind}", start, end))
+        if kind in ("bold", "italic", "strike"):
+            # 强调标记本身淡化显示
+            marker = len(m.group()) - len(m.group().lstrip(m.group()[0]))
+            marker = min(marker, 3)
+            tokens.append(("md_marker", start, start + marker))
+            tokens.append(("md_marker", end - marker, end))
+
+
+def tokenize(line: str, state: LexerState) -> List[Token]:
+    """
+    对一行文本做词法分析
+
+    Args:
+        line: 行文本（不含换行符）
+        state: 该行的行首状态
+
+    Returns:
+        [(标签, 起始列, 结束列)]
+    """
+    if not line:
+        return []
+    if is_fence_line(line):
+        return [("md_fence", 0, len(line))]
+    if state:
+        return [("md_code_block", 0, len(line))]
+
+    tokens: List[Token] = []
+    header = HEADER_MARKER_PATTERN.match(line)
+    if header:
+        tokens.append(("md_heading", 0, len(line)))
+        tokens.append(("md_marker", 0, header.end(1)))
+        return tokens
+    if HR_PATTERN.match(line):
+        return [("md_hr", 0, len(line))]
+
+    offset = 0
+    quote = QUOTE_PATTERN.match(line)
+    if quote:
+        tokens.append(("md_quote", 0, len(line)))
+        tokens.append(("md_marker", quote.end() - 1, quote.end()))
+        offset = quote.end()
+    else:
+        list_marker = LIST_MARKER_PATTERN.match(line)
+        if list_marker:
+            tokens.append(("md_list", *list_marker.span(1)))
+            offset = list_marker.end()
+
+    _inline_tokens(line, offset, tokens)
+    return tokens
+
+
+class LineStates:
+    """
+    逐行词法状态快照 - 支持增量更新
+
+    _states[i] 为第 i+1 行的行首状态（最后一项为文末状态），
+    _dirty[i] 标记第 i+1 行是否需要重新着色，
+    _stale 记录行首状态可能过期、需要从该行继续向下传播的行号（有序）。
+    """
+
+    # 占位状态：与任何真实状态都不相等，保证编辑区域一定被重新计算
+    _PENDING = None
+
+    def __init__(self):
+        self._states: List[Optional[LexerState]] = [False, False]
+        self._dirty = bytearray(b"\x01")
+        self._stale: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._dirty)
+
+    def reset(self, lines: List[str]) -> None:
+        """根据全部文本行重新计算状态，所有行标记为待着色"""
+        states = [False]
+        state = False
+        for line in lines:
+            state = next_state(line, state)
+            states.append(state)
+        self._states = states
+        self._dirty = bytearray(b"\x01") * len(lines)
+        self._stale = []
+
+    def state_at(self, line: int) -> LexerState:
+        """第 line 行（从1开始）的行首状态"""
+        return bool(self._states[line - 1])
+
+    def apply_edit(self, start: int, old_end: int, new_end: int) -> None:
+        """
+        应用一次编辑：旧文本的 start~old_end 行被替换为新文本的 start~new_end 行
+
+        只调整快照与标记，实际的状态传播由 propagate 完成
+        """
+        delta = new_end - old_end
+        self._states[start:old_end] = [self._PENDING] * (new_end - start)
+        self._dirty[start - 1:old_end] = b"\x01" * (new_end - start + 1)
+
+        stale = []
+        for line in self._stale:
+            if line > old_end:
+                stale.append(line + delta)
+            elif line < start:
+                stale.append(line)
+        stale.append(start)
+        self._stale = sorted(set(stale))
+
+    @property
+    def has_stale(self) -> bool:
+        return bool(self._stale)
+
+    def propagate(self, get_lines: Callable[[int, int], List[str]], budget: int, chunk: int = 256) -> int:
+        """
+        从最早的过期行开始向下传播行首状态，直到与已有快照一致
+
+        状态发生变化的行会被标记为待着色；超出 budget 行时停下，剩余部分留待下次继续。
+
+        Args:
+            get_lines: 读取 [起始行, 结束行]（含）文本行的回调
+            budget: 本次最多处理的行数
+
+        Returns:
+            实际处理的行数
+        """
+        processed = 0
+        total = len(self._dirty)
+        while self._stale and processed < budget:
+            line = self._stale[0]
+            state = self._states[line - 1]
+            converged = False
+            while line <= total and processed < budget:
+                last = min(total, line + chunk - 1, line + budget - processed - 1)
+                for text in get_lines(line, last):
+                    new_state = next_state(text, state)
+                    processed += 1
+                    if new_state == self._states[line]:
+                        converged = True
+                        break
+                    self._states[line] = new_state
+                    if line < total:
+                        self._dirty[line] = 1  # 下一行的行首状态变化，需要重新着色
+                    state = new_state
+                    line += 1
+                if converged:
+                    break
+            # 传播越过的过期行一并移除
+            passed = bisect_left(self._stale, line + 1)
+            del self._stale[:passed]
+            if not converged and line <= total:
+                insort(self._stale, line)
+        return processed
+
+    def next_dirty(self, start: int = 1, end: Optional[int] = None) -> Optional[int]:
+        """查找 [start, end] 范围内第一个待着色的行号"""
+        end = len(self._dirty) if end is None else min(end, len(self._dirty))
+        if start > end:
+            return None
+        index = self._dirty.find(1, start - 1, end)
+        return None if index < 0 else index + 1
+
+    def is_dirty(self, line: int) -> bool:
+        return bool(self._dirty[line - 1])
+
+    def clear_dirty(self, line: int) -> None:
+        self._dirty[line - 1] = 0
@@ -0,0 +1,164 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+from components.markdown.html_writer import export_files
+from components.markdown.markdown_parser import PARSER_VERSION
+
+MANIFEST_NAME = ".berrypad-manifest.json"
+MARKDOWN_EXTENSIONS = (".md", ".markdown")
+OUTPUT_EXTENSIONS = {"html": ".html", "txt": ".txt"}
+
+
+def hash_file(path: str) -> str:
+    """计算文件内容哈希"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BatchExporter:
+    """目录批量导出器 - 基于清单缓存跳过未变化的文件，其余文件多进程并行渲染"""
+
+    def __init__(self, src_dir: str, out_dir: str, fmt: str = "html", jobs: Optional[int] = None):
+        if fmt not in OUTPUT_EXTENSIONS:
+            raise ValueError(f"不支持的导出格式: {fmt}")
+        self.src_dir = os.path.abspath(src_dir)
+        self.out_dir = os.path.abspath(out_dir)
+        self.fmt = fmt
+        self.jobs = jobs
+        self.manifest_path = os.path.join(self.out_dir, MANIFEST_NAME)
+        self._manifest: Dict[str, dict] = {}
+
+    def run(self, force: bool = False) -> dict:
+        """
+        执行批量导出
+
+        Args:
+            force: 忽略清单缓存，全部重新渲染
+
+        Returns:
+            dict: 统计信息 {"rendered", "skipped", "removed", "failed": [(文件, 错误)]}
+        """
+        # 旧清单即使不再用于跳过（强制重建、格式或解析器版本变化），也要用来清理过期的输出
+        previous_key, previous = self._load_manifest()
+        self._manifest = previous if not force and previous_key == self._manifest_key() else {}
+        sources = self._collect_sources()
+
+        pending = []
+        skipped = 0
+        new_manifest = {}
+        present = set()  # 遍历之后仍然存在的源文件
+        for rel_path in sources:
+            src_path = os.path.join(self.src_dir, rel_path)
+            dst_path = self._output_path(rel_path)
+            entry = self._manifest.get(rel_path)
+            try:
+                stat = os.stat(src_path)
+            except OSError:
+                continue  # 遍历之后被删除或移走
+            present.add(rel_path)
+
+            # 快速路径：大小与修改时间都未变化则无需读取文件
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns \
+                    and os.path.exists(dst_path):
+                new_manifest[rel_path] = entry
+                skipped += 1
+                continue
+
+            try:
+                digest = hash_file(src_path)
+            except OSError:
+                present.discard(rel_path)
+                continue
+            new_entry = {"hash": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            if entry and entry["hash"] == digest and os.path.exists(dst_path):
+                # 仅修改时间变化（如 touch、检出），内容未变
+                new_manifest[rel_path] = new_entry
+                skipped += 1
+                continue
+
+            pending.append((rel_path, src_path, dst_path, new_entry))
+
+        failed = []
+        for (rel_path, _, _, new_entry), (src_path, error) in zip(pending, self._render(pending)):
+            if error:
+                failed.append((src_path, error))
+                logger.error(f"导出失败: {src_path} - {error}")
+            else:
+                new_manifest[rel_path] = new_entry
+
+        removed = self._remove_stale_outputs(present, previous_key, previous)
+        self._manifest = new_manifest
+        self._save_manifest()
+        return {
+            "rendered": len(pending) - len(failed),
+            "skipped": skipped,
+            "removed": removed,
+            "failed": failed,
+        }
+
+    def _render(self, pending: List[tuple]) -> List[Tuple[str, Optional[str]]]:
+        """渲染待处理文件，多个文件时分发到进程池"""
+        return export_files([(item[1], item[2]) for item in pending], jobs=self.jobs, fmt=self.fmt)
+
+    def _collect_sources(self) -> List[str]:
+        """遍历源目录，收集 Markdown 文件的相对路径（跳过输出目录与隐藏目录）"""
+        sources = []
+        for dir_path, dir_names, file_names in os.walk(self.src_dir):
+            dir_names[:] = sorted(
+                d for d in dir_names
+                if not d.startswith('.') and os.path.join(dir_path, d) != self.out_dir
+            )
+            for file_name in sorted(file_names):
+                if file_name.lower().endswith(MARKDOWN_EXTENSIONS):
+                    sources.append(os.path.relpath(os.path.join(dir_path, file_name), self.src_dir))
+        return sources
+
+    def _output_path(self, rel_path: str, fmt: Optional[str] = None) -> str:
+        """源文件相对路径对应的输出路径"""
+        extension = OUTPUT_EXTENSIONS[fmt or self.fmt]
+        return os.path.join(self.out_dir, os.path.splitext(rel_path)[0] + extension)
+
+    def _remove_stale_outputs(self, sources: set, previous_key: Optional[str], previous: Dict[str, dict]) -> int:
+        """删除过期的输出（仅限旧清单中记录过的文件）：源文件已不存在，或导出格式已变化"""
+        previous_fmt = previous_key.split(":")[0] if previous_key else None
+        if previous_fmt not in OUTPUT_EXTENSIONS:
+            return 0
+        format_changed = OUTPUT_EXTENSIONS[previous_fmt] != OUTPUT_EXTENSIONS[self.fmt]
+        removed = 0
+        for rel_path in previous:
+            if format_changed or rel_path not in sources:
+                try:
+                    os.remove(self._output_path(rel_path, previous_fmt))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def _manifest_key(self) -> str:
+        """清单的有效性键：格式或解析器版本变化时全部重建"""
+        return f"{self.fmt}:{PARSER_VERSION}"
+
+    def _load_manifest(self) -> Tuple[Optional[str], Dict[str, dict]]:
+        """读取清单缓存，返回 (有效性键, 文件条目)；不存在或损坏时返回 (None, {})"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            return data.get("key"), data.get("files", {})
+        except (OSError, ValueError, AttributeError):
+            return None, {}
+
+    def _save_manifest(self) -> None:
+        """原子写入清单缓存"""
+        os.makedirs(self.out_dir, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump({"key": self._manifest_key(), "files": self._manifest}, file, separators=(",", ":"))
+        os.replace(tmp_path, self.manifest_path)
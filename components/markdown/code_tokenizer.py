@@ -0,0 +1,141 @@
+import hashlib
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Tuple
+
+# 代码块语言别名 -> 规范语言名
+LANGUAGE_ALIASES = {
+    "python": "python", "py": "python", "python3": "python",
+    "json": "json", "jsonc": "json",
+    "shell": "shell", "sh": "shell", "bash": "shell", "zsh": "shell", "console": "shell",
+    "yaml": "yaml", "yml": "yaml",
+}
+
+# 各语言的词法规则 [(记号类型, 正则)]，按优先级排列；正则内部只能使用非捕获分组
+_PYTHON_KEYWORDS = (
+    "and as assert async await break class continue def del elif else except finally for from "
+    "global if import in is lambda nonlocal not or pass raise return try while with yield match case"
+)
+_PYTHON_BUILTINS = (
+    "print len range enumerate zip map filter open int str float bool list dict set tuple "
+    "isinstance super type min max sum sorted reversed any all abs repr iter next self cls"
+)
+_SHELL_KEYWORDS = "if then else elif fi for while until do done case esac in function return select"
+_SHELL_BUILTINS = (
+    "echo cd ls grep cat set unset export local source exit read printf test pwd mkdir rm cp mv "
+    "sed awk find xargs sudo chmod chown curl git"
+)
+
+
+def _words(words: str) -> str:
+    return r'\b(?:' + "|".join(words.split()) + r')\b'
+
+
+_NUMBER = r'\b(?:0[xX][0-9a-fA-F_]+|0[oObB][0-7_]+|\d[\d_]*(?:\.\d*)?(?:[eE][+-]?\d+)?j?)\b'
+_DQ_STRING = r'"(?:[^"\\\n]|\\.)*"'
+_SQ_STRING = r"'(?:[^'\\\n]|\\.)*'"
+
+LANGUAGE_RULES: Dict[str, List[Tuple[str, str]]] = {
+    "python": [
+        ("string", r'[rRbBuUfF]{0,2}(?:"""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\')'),
+        ("comment", r'#[^\n]*'),
+        ("string", r'[rRbBuUfF]{0,2}(?:' + _DQ_STRING + '|' + _SQ_STRING + ')'),
+        ("function", r'(?<=\bdef )\w+|(?<=\bclass )\w+'),
+        ("builtin", r'@[\w.]+'),
+        ("literal", _words("True False None")),
+        ("keyword", _words(_PYTHON_KEYWORDS)),
+        ("builtin", _words(_PYTHON_BUILTINS)),
+        ("number", _NUMBER),
+    ],
+    "json": [
+        ("key", _DQ_STRING + r'(?=\s*:)'),
+        ("string", _DQ_STRING),
+        ("literal", _words("true false null")),
+        ("number", r'-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b'),
+    ],
+    "shell": [
+        ("comment", r'(?:^|(?<=\s))#[^\n]*'),
+        ("string", _DQ_STRING + '|' + _SQ_STRING),
+        ("variable", r'\$\{[^}\n]*\}|\$\w+|\$[@#?$!*]'),
+        ("keyword", _words(_SHELL_KEYWORDS)),
+        ("builtin", _words(_SHELL_BUILTINS)),
+        ("literal", r'(?<=\s)--?[A-Za-z][\w-]*'),
+        ("number", r'\b\d+\b'),
+    ],
+    "yaml": [
+        ("comment", r'(?:^|(?<=\s))#[^\n]*'),
+        ("keyword", r'^(?:---|\.\.\.)[ \t]*$'),
+        ("key", r'(?<![^\s-])[^\s#:\'"&*-][^#:\n]*?(?=:(?:[ \t]|$))'),
+        ("string", _DQ_STRING + '|' + _SQ_STRING),
+        ("variable", r'[&*][\w-]+'),
+        ("literal", r'(?<![\w-])(?:true|false|null|yes|no|on|off|~)(?![\w-])'),
+        ("number", r'(?<![\w.-])-?\d+(?:\.\d+)?(?![\w.-])'),
+    ],
+}
+
+Token = Tuple[str, int, int]  # (记号类型, 起始偏移, 结束偏移)
+
+_compiled: Dict[str, Tuple[Pattern, Dict[str, str]]] = {}
+
+
+def normalize_language(language: Optional[str]) -> Optional[str]:
+    """将代码块语言标记规范化，不支持的语言返回 None"""
+    if not language:
+        return None
+    return LANGUAGE_ALIASES.get(language.lower())
+
+
+def _get_pattern(language: str) -> Tuple[Pattern, Dict[str, str]]:
+    """将语言规则合并为一个带命名分组的正则（首次使用时编译）"""
+    compiled = _compiled.get(language)
+    if compiled is None:
+        parts, groups = [], {}
+        for i, (token_type, pattern) in enumerate(LANGUAGE_RULES[language]):
+            group = f"g{i}"
+            parts.append(f"(?P<{group}>{pattern})")
+            groups[group] = token_type
+        compiled = (re.compile("|".join(parts), re.MULTILINE), groups)
+        _compiled[language] = compiled
+    return compiled
+
+
+def tokenize_code(language: str, code: str) -> List[Token]:
+    """
+    对整个代码块做词法分析
+
+    Args:
+        language: 规范语言名（见 LANGUAGE_RULES）
+        code: 代码块文本（行之间以换行分隔）
+
+    Returns:
+        按位置排列、互不重叠的记号列表
+    """
+    pattern, groups = _get_pattern(language)
+    return [(groups[m.lastgroup], m.start(), m.end()) for m in pattern.finditer(code) if m.end() > m.start()]
+
+
+class CodeTokenCache:
+    """代码块记号缓存 - 按 (语言, 代码块哈希) 缓存，只有修改过的代码块才重新分析"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, bytes], List[Token]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_tokens(self, language: str, code: str) -> List[Token]:
+        """获取代码块的记号（最近最少使用的条目会被淘汰）"""
+        key = (language, hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest())
+        tokens = self._entries.get(key)
+        if tokens is not None:
+            self._entries.move_to_end(key)
+            return tokens
+        tokens = tokenize_code(language, code)
+        self._entries[key] = tokens
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return tokens
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,129 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+from typing import Iterable, List, Optional, TextIO, Tuple
+
+from components.markdown.markdown_parser import MarkdownBackend, MarkdownParser
+from components.markdown.text_writer import PlainTextWriter
+
+# 行内标签到 HTML 元素的映射
+INLINE_TAGS = {
+    "code": ("<code>", "</code>"),
+    "strikethrough": ("<del>", "</del>"),
+    "bold italic": ("<strong><em>", "</em></strong>"),
+    "bold": ("<strong>", "</strong>"),
+    "italic": ("<em>", "</em>"),
+}
+
+# 与预览区样式保持一致的内联样式表
+DEFAULT_STYLE = """
+body { font-family: "Microsoft YaHei", sans-serif; color: #24292e; max-width: 860px; margin: 25px auto; line-height: 1.6; }
+code, pre { font-family: Consolas, monospace; background: #f6f8fa; }
+pre { padding: 8px 20px; }
+blockquote { background: #f0f0f0; color: #6a737d; margin: 4px 0; padding: 4px 15px; }
+hr { border: 0; height: 2px; background: #e1e4e8; }
+""".strip()
+
+
+class HtmlWriter(MarkdownBackend):
+    """HTML 渲染后端 - 逐块流式写出，不在内存中拼接整篇文档"""
+
+    def __init__(self, out: TextIO, title: str = "", style: str = DEFAULT_STYLE):
+        self.out = out
+        self.title = title
+        self.style = style
+
+    def begin(self) -> None:
+        self.out.write('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n')
+        self.out.write(f"<title>{escape(self.title)}</title>\n")
+        if self.style:
+            self.out.write(f"<style>\n{self.style}\n</style>\n")
+        self.out.write("</head>\n<body>\n")
+
+    def end(self) -> None:
+        self.out.write("</body>\n</html>\n")
+
+    def render_hr(self, block: dict) -> None:
+        self.out.write("<hr>\n")
+
+    def render_header(self, block: dict) -> None:
+        level = block["level"]
+        self.out.write(f"<h{level}>{escape(block['text'])}</h{level}>\n")
+
+    def render_code(self, block: dict) -> None:
+        code = escape("\n".join(block["lines"]))
+        language = block.get("language")
+        class_attr = f' class="language-{escape(language)}"' if language else ""
+        self.out.write(f"<pre><code{class_attr}>{code}</code></pre>\n")
+
+    def render_quote(self, block: dict) -> None:
+        quote = "<br>\n".join(escape(line) for line in block["lines"])
+        self.out.write(f"<blockquote><p>{quote}</p></blockquote>\n")
+
+    def render_list(self, block: dict) -> None:
+        first_marker = block["items"][0][0] if block["items"] else None
+        list_tag = "ol" if first_marker and first_marker[0].isdigit() else "ul"
+        self.out.write(f"<{list_tag}>\n")
+        for marker, text in block["items"]:
+            self.out.write(f"<li>{escape(text)}</li>\n")
+        self.out.write(f"</{list_tag}>\n")
+
+    def render_para(self, block: dict) -> None:
+        self.out.write("<p>")
+        for frag, tags in block["fragments"]:
+            text = escape(frag).replace("\n", "<br>\n")
+            for tag in tags:
+                open_tag, close_tag = INLINE_TAGS.get(tag, ("", ""))
+                text = f"{open_tag}{text}{close_tag}"
+            self.out.write(text)
+        self.out.write("</p>\n")
+
+
+def export_file(src_path: str, dst_path: str, fmt: str = "html") -> Tuple[str, Optional[str]]:
+    """
+    将单个 Markdown 文件导出为 HTML 或纯文本（在工作进程中执行，不创建任何 Tk 对象）
+
+    Args:
+        fmt: "html" 或 "txt"
+
+    Returns:
+        (源文件路径, 错误信息)，成功时错误信息为 None
+    """
+    try:
+        with open(src_path, 'r', encoding='utf-8') as src:
+            lines = src.read().split('\n')
+        os.makedirs(os.path.dirname(os.path.abspath(dst_path)), exist_ok=True)
+        with open(dst_path, 'w', encoding='utf-8') as dst:
+            if fmt == "html":
+                title = os.path.splitext(os.path.basename(src_path))[0]
+                writer = HtmlWriter(dst, title=title)
+            else:
+                writer = PlainTextWriter(dst)
+            writer.render(MarkdownParser().iter_blocks(lines))
+        return src_path, None
+    except Exception as e:
+        return src_path, str(e)
+
+
+def export_files(pairs: Iterable[Tuple[str, str]], jobs: Optional[int] = None,
+                 fmt: str = "html") -> List[Tuple[str, Optional[str]]]:
+    """
+    批量导出，多个文件时使用进程池并行处理
+
+    Args:
+        pairs: (源文件, 目标文件) 列表
+        jobs: 进程数，默认使用全部 CPU 核心
+        fmt: "html" 或 "txt"
+    """
+    pairs = list(pairs)
+    if len(pairs) <= 1 or jobs == 1:
+        return [export_file(src, dst, fmt) for src, dst in pairs]
+
+    jobs = jobs or os.cpu_count() or 1
+    # 大批量时按块分发，减少进程间通信次数
+    chunksize = max(1, len(pairs) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(export_file, *zip(*pairs), [fmt] * len(pairs), chunksize=chunksize))
@@ -0,0 +1,273 @@
+import re
+from typing import Iterator, List
+
+# 块模型版本号：解析规则或块结构变化时递增，使各类缓存失效
+PARSER_VERSION = 2
+
+
+class MarkdownParser:
+    """Markdown解析器 - 纯 Python 块模型，不依赖任何 GUI"""
+
+    @staticmethod
+    def _is_horizontal_rule(line: str) -> bool:
+        """检查是否为分割线"""
+        hr_patterns = [
+            r'^\s*-{3,}\s*$',  # ---
+            r'^\s*\*{3,}\s*$',  # ***
+            r'^\s*_{3,}\s*$',  # ___
+            r'^\s*\+{3,}\s*$',  # +++
+        ]
+        return any(re.match(p, line) for p in hr_patterns)
+
+    @staticmethod
+    def _parse_header(line: str):
+        """解析标题"""
+        match = re.match(r'^(#{1,6})\s+(.+)$', line)
+        if match:
+            return len(match.group(1)), match.group(2)
+        return None
+
+    @staticmethod
+    def _fence_language(line: str) -> str:
+        """提取代码块围栏后的语言标记（```python -> python）"""
+        info = line.strip()[3:].strip()
+        return info.split()[0].lower() if info else ""
+
+    @staticmethod
+    def _is_list_item(line: str) -> bool:
+        """检查是否为列表项"""
+        return bool(re.match(r'^\s*[-*+]\s+', line) or re.match(r'^\s*\d+\.\s+', line))
+
+    @staticmethod
+    def _parse_list_item(line: str):
+        """解析列表项"""
+        match = re.match(r'^\s*([-*+]|\d+\.)\s+(.+)$', line)
+        if match:
+            return match.group(1), match.group(2)
+        return None, line
+
+    @staticmethod
+    def parse_inline(text: str):
+        """格式化行内元素，返回 [(text, [tags])]"""
+        patterns = [
+            (re.compile(r'`(.*?)`'), 'code'),
+            (re.compile(r'~~(.*?)~~'), 'strikethrough'),
+            (re.compile(r'\*\*\*(.*?)\*\*\*|___(.*?)___'), 'bold italic'),
+            (re.compile(r'\*\*(.*?)\*\*|__(.*?)__'), 'bold'),
+            (re.compile(r'\*(.*?)\*|_(.*?)_'), 'italic'),
+        ]
+
+        result = []
+        pos = 0
+
+        while pos < len(text):
+            # 查找最近的特殊字符
+            next_special = len(text)
+            for pattern, tag in patterns:
+                m = pattern.search(text, pos)
+                if m and m.start() < next_special:
+                    next_special = m.start()
+
+            # 添加普通文本
+            if pos < next_special:
+                result.append((text[pos:next_special], []))
+                pos = next_special
+
+            # 处理特殊格式
+            if pos < len(text):
+                found = False
+                for pattern, tag in patterns:
+                    m = pattern.match(text, pos)
+                    if m:
+                        content = next(g for g in m.groups() if g is not None)
+                        result.append((content, [tag]))
+                        pos = m.end()
+                        found = True
+                        break
+                if not found:
+                    result.append((text[pos], []))
+                    pos += 1
+
+        return result
+
+    @staticmethod
+    def _process_hard_line_breaks(text: str) -> str:
+        """处理硬换行（行尾两个空格）"""
+        return re.sub(r'  $', '\n', text)
+
+    def _para_block(self, lines: list) -> dict:
+        """构造段落块，并预先解析行内片段"""
+        para_text = ' '.join(line.rstrip() for line in lines)
+        para_text = self._process_hard_line_breaks(para_text)
+        return {"type": "para", "lines": lines, "fragments": self.parse_inline(para_text)}
+
+    def _classify_block(self, lines: list) -> dict:
+        """将一组行分类为一个块"""
+        if not lines:
+            return {"type": "empty"}
+
+        line = lines[0].strip()
+        if not line:
+            return {"type": "empty"}
+        elif self._is_horizontal_rule(line):
+            return {"type": "hr"}
+        elif self._parse_header(line):
+            level, text = self._parse_header(line)
+            return {"type": "header", "level": level, "text": text}
+        elif line.startswith('```'):
+            code_lines = []
+            for l in lines[1:]:
+                if l.strip().startswith('```'):
+                    break
+                code_lines.append(l)
+            return {"type": "code", "lines": code_lines, "language": self._fence_language(line)}
+        elif line.startswith('>'):
+            quote_lines = [l[1:].lstrip() if l.strip().startswith('>') else l for l in lines]
+            quote_lines = [l[1:].lstrip() if l.strip().startswith('>') else l for l in quote_lines]
+            # 清理引用标记
+            cleaned_lines = []
+            for l in quote_lines:
+                if l.strip().startswith('>'):
+                    cleaned_lines.append(l[1:].lstrip())
+                else:
+                    cleaned_lines.append(l)
+            return {"type": "quote", "lines": cleaned_lines}
+        elif self._is_list_item(line):
+            items = []
+            for l in lines:
+                if self._is_list_item(l):
+                    marker, text = self._parse_list_item(l)
+                    items.append((marker, text))
+            return {"type": "list", "items": items}
+        else:
+            return self._para_block(lines)
+
+    def parse(self, content: str) -> List[dict]:
+        """解析完整文档，返回块列表"""
+        if not content:
+            return []
+        return list(self.iter_blocks(content.split('\n')))
+
+    def iter_blocks(self, lines: List[str]) -> Iterator[dict]:
+        """
+        逐块解析文本行，每个块带有起始源行号 "line"（从1开始）
+
+        以生成器形式产出，便于后端边解析边输出。
+        """
+        i = 0
+        block_start = 0
+
+        def pending(end):
+            """产出 block_start 到 end 之间尚未归类的普通行"""
+            if end > block_start:
+                block = self._classify_block(lines[block_start:end])
+                block["line"] = block_start + 1
+                return block
+            return None
+
+        while i < len(lines):
+            line = lines[i].strip()
+
+            # 空行处理
+            if not line:
+                if block := pending(i):
+                    yield block
+                yield {"type": "empty", "line": i + 1}
+                i += 1
+                block_start = i
+                continue
+
+            # 分割线处理
+            if self._is_horizontal_rule(lines[i]):
+                if block := pending(i):
+                    yield block
+                yield {"type": "hr", "line": i + 1}
+                i += 1
+                block_start = i
+                continue
+
+            # 代码块处理
+            if line.startswith('```'):
+                j = i + 1
+                while j < len(lines) and not lines[j].strip().startswith('```'):
+                    j += 1
+                if j < len(lines):
+                    j += 1
+                if block := pending(i):
+                    yield block
+                yield {"type": "code", "lines": lines[i + 1:j - 1], "language": self._fence_language(line), "line": i + 1}
+                i = j
+                block_start = i
+                continue
+
+            # 引用块处理
+            if line.startswith('>'):
+                j = i
+                while j < len(lines) and lines[j].strip().startswith('>'):
+                    j += 1
+                quote_lines = [l[1:].lstrip() if l.strip().startswith('>') else l for l in lines[i:j]]
+                if block := pending(i):
+                    yield block
+                yield {"type": "quote", "lines": quote_lines, "line": i + 1}
+                i = j
+                block_start = i
+                continue
+
+            # 列表处理
+            if self._is_list_item(lines[i]):
+                j = i
+                while j < len(lines) and self._is_list_item(lines[j]):
+                    j += 1
+                list_items = [self._parse_list_item(lines[k]) for k in range(i, j)]
+                if block := pending(i):
+                    yield block
+                yield {"type": "list", "items": list_items, "line": i + 1}
+                i = j
+                block_start = i
+                continue
+
+            # 标题处理
+            header = self._parse_header(lines[i])
+            if header:
+                if block := pending(i):
+                    yield block
+                yield {"type": "header", "level": header[0], "text": header[1], "line": i + 1}
+                i += 1
+                block_start = i
+                continue
+
+            i += 1
+
+        # 处理最后的块
+        if block_start < len(lines):
+            block_lines = lines[block_start:]
+            if any(line.strip() for line in block_lines):
+                block = self._classify_block(block_lines)
+                block["line"] = block_start + 1
+                yield block
+
+
+class MarkdownBackend:
+    """渲染后端基类 - 将块模型输出到具体目标（Tk 文本标签、HTML 等）"""
+
+    def render(self, blocks) -> None:
+        """依次渲染所有块"""
+        self.begin()
+        for block in blocks:
+            self.render_block(block)
+        self.end()
+
+    def begin(self) -> None:
+        """渲染开始前的准备"""
+        pass
+
+    def end(self) -> None:
+        """渲染结束后的收尾"""
+        pass
+
+    def render_block(self, block: dict):
+        """按块类型分发到 render_<type> 方法，未实现的类型直接忽略"""
+        handler = getattr(self, f"render_{block['type']}", None)
+        if handler:
+            return handler(block)
+        return None
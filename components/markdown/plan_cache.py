@@ -0,0 +1,158 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import hashlib
+import marshal
+import os
+import shutil
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+from components.markdown.markdown_parser import PARSER_VERSION
+from utils.app_dirs import get_cache_dir
+
+# 计划文件格式版本；与 PARSER_VERSION 一起决定缓存目录，任一变化都会使旧缓存失效
+PLAN_FORMAT = 2
+PLAN_DIR = "render_plans"
+
+RenderPlan = Tuple[int, List[dict]]  # (源文本行数, 块列表)
+
+
+def compact_block(block: dict) -> dict:
+    """
+    把块中的列表（行、列表项、行内片段）转换为元组
+
+    只含字符串、数字与这类元组的容器会在年轻代回收时被 GC 取消跟踪；计划缓存与预渲染
+    长期持有大量块，若保持列表，每次完整回收都要全部扫描一遍，造成数百毫秒的停顿。
+    """
+    if "lines" in block:
+        block["lines"] = tuple(block["lines"])
+    if "items" in block:
+        block["items"] = tuple(block["items"])
+    if "fragments" in block:
+        block["fragments"] = tuple((text, tuple(tags)) for text, tags in block["fragments"])
+    return block
+
+
+def build_plan(line_count: int, blocks: Iterable[dict]) -> RenderPlan:
+    """由解析出的块构建渲染计划"""
+    return line_count, [compact_block(block) for block in blocks]
+
+
+class PlanCache:
+    """
+    渲染计划缓存 - 按内容哈希缓存解析好的块（含段落的行内片段）
+
+    内存中保留最近的若干份计划；足够大的文档同时以 marshal 格式写入缓存目录，
+    再次打开未修改的文档时可以完全跳过解析。
+    """
+
+    MIN_PERSIST_CHARS = 32 * 1024  # 小于该长度的文档解析很快，不写磁盘
+    PERSIST_INTERVAL = 2.0  # 两次写盘的最小间隔（秒），连续输入时不会每次渲染都写盘
+    MAX_DISK_BYTES = 256 * 1024 * 1024  # 磁盘缓存上限，超出时删除最久未用的计划
+
+    def __init__(self, cache_dir: Optional[str] = None, memory_entries: int = 8, persist: bool = True):
+        self.cache_dir = cache_dir or os.path.join(get_cache_dir(), PLAN_DIR)
+        self.version_dir = os.path.join(self.cache_dir, f"v{PARSER_VERSION}.{PLAN_FORMAT}")
+        self.memory_entries = memory_entries
+        self.persist = persist
+        self._memory: "OrderedDict[str, RenderPlan]" = OrderedDict()
+        self._last_write = 0.0
+        self._pruned = False  # 本次运行是否已清理过旧版本与超额文件
+
+    @staticmethod
+    def key_hasher():
+        """返回计算内容键的哈希对象（可分段 update 编码后的内容，结果与 content_key 相同）"""
+        return hashlib.blake2b(digest_size=16)
+
+    @classmethod
+    def content_key(cls, content: str) -> str:
+        hasher = cls.key_hasher()
+        hasher.update(content.encode("utf-8"))
+        return hasher.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.version_dir, key[:2], f"{key}.plan")
+
+    def get(self, content: str, key: Optional[str] = None) -> Optional[RenderPlan]:
+        """查找内容对应的渲染计划，未命中时返回 None（已知内容键时可直接传入）"""
+        key = key or self.content_key(content)
+        plan = self._memory.get(key)
+        if plan is not None:
+            self._memory.move_to_end(key)
+            return plan
+        if not self.persist or len(content) < self.MIN_PERSIST_CHARS:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                plan = marshal.load(file)
+            os.utime(path)  # 记录最近使用时间，清理时据此淘汰
+        except (OSError, ValueError, EOFError, TypeError):
+            return None
+        self._remember(key, plan)
+        return plan
+
+    def put(self, content: str, plan: RenderPlan, key: Optional[str] = None) -> None:
+        """记录渲染计划；大文档按写盘间隔持久化"""
+        key = key or self.content_key(content)
+        self._remember(key, plan)
+        if not self.persist or len(content) < self.MIN_PERSIST_CHARS:
+            return
+        now = time.monotonic()
+        if now - self._last_write < self.PERSIST_INTERVAL:
+            return
+        self._last_write = now
+        self._write(key, plan)
+
+    def _remember(self, key: str, plan: RenderPlan) -> None:
+        self._memory[key] = plan
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _write(self, key: str, plan: RenderPlan) -> None:
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                marshal.dump(plan, file)
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"写入渲染计划缓存失败: {e}")
+            return
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+
+    def prune(self) -> None:
+        """删除旧版本的缓存目录，并把磁盘占用降到上限以内（先删最久未用的）"""
+        try:
+            for name in os.listdir(self.cache_dir):
+                path = os.path.join(self.cache_dir, name)
+                if path != self.version_dir and os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
+            files = []
+            for directory, _, names in os.walk(self.version_dir):
+                for name in names:
+                    path = os.path.join(directory, name)
+                    stat = os.stat(path)
+                    files.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.MAX_DISK_BYTES:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear_memory(self) -> None:
+        self._memory.clear()
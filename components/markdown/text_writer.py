@@ -0,0 +1,35 @@
+from typing import TextIO
+
+from components.markdown.markdown_parser import MarkdownBackend
+
+
+class PlainTextWriter(MarkdownBackend):
+    """纯文本渲染后端 - 去除 Markdown 标记，输出与预览区一致的文本"""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+
+    def render_hr(self, block: dict) -> None:
+        self.out.write("-" * 20 + "\n")
+
+    def render_header(self, block: dict) -> None:
+        self.out.write(block["text"] + "\n")
+
+    def render_code(self, block: dict) -> None:
+        for line in block["lines"]:
+            self.out.write(line + "\n")
+
+    def render_quote(self, block: dict) -> None:
+        for line in block["lines"]:
+            self.out.write(f"> {line}\n")
+
+    def render_list(self, block: dict) -> None:
+        for marker, text in block["items"]:
+            bullet = marker if marker and marker[0].isdigit() else "•"
+            self.out.write(f"{bullet} {text}\n")
+
+    def render_para(self, block: dict) -> None:
+        self.out.write("".join(frag for frag, tags in block["fragments"]) + "\n")
+
+    def render_empty(self, block: dict) -> None:
+        self.out.write("\n")
@@ -12,3 +12,31 @@ class PasteAction(MenuActionComponent):
 class CutAction(MenuActionComponent):
     def execute(self):
         self.manager.publish("edit.cut")
+
+class UndoAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("edit.undo")
+
+class RedoAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("edit.redo")
+
+class FindAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("edit.find")
+
+class ReplaceAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("edit.replace")
+
+class FindNextAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("edit.find_next")
+
+class FindPreviousAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("edit.find_previous")
+
+class ProjectSearchAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("project.search")
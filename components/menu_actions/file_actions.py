@@ -10,10 +10,18 @@ class OpenFileAction(MenuActionComponent):
     def execute(self):
         self.manager.publish("file.open")
 
+class QuickOpenAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("file.quick_open")
+
 class SaveFileAction(MenuActionComponent):
     def execute(self):
         self.manager.publish("file.save")
 
 class SaveAsFileAction(MenuActionComponent):
     def execute(self):
-        self.manager.publish("file.save_as")
\ No newline at end of file
+        self.manager.publish("file.save_as")
+
+class CloseTabAction(MenuActionComponent):
+    def execute(self):
+        self.manager.publish("file.close_tab")
\ No newline at end of file
@@ -4,4 +4,29 @@ from core.component_basic import MenuActionComponent
 class ToggleRenderModeAction(MenuActionComponent):
     def execute(self):
         """切换渲染模式"""
-        self.manager.publish("view.toggle_render_mode")
\ No newline at end of file
+        self.manager.publish("view.toggle_render_mode")
+
+class NextSectionAction(MenuActionComponent):
+    def execute(self):
+        """跳转到下一章节"""
+        self.manager.publish("outline.next_section")
+
+class PreviousSectionAction(MenuActionComponent):
+    def execute(self):
+        """跳转到上一章节"""
+        self.manager.publish("outline.previous_section")
+
+class ToggleSidebarAction(MenuActionComponent):
+    def execute(self):
+        """显示/隐藏左侧边栏"""
+        self.manager.layout_manager.toggle_section("sidebar_section")
+
+class ToggleOutlineAction(MenuActionComponent):
+    def execute(self):
+        """显示/隐藏右侧大纲栏"""
+        self.manager.layout_manager.toggle_section("right_sidebar_section")
+
+class CommandPaletteAction(MenuActionComponent):
+    def execute(self):
+        """打开命令面板"""
+        self.manager.publish("view.command_palette")
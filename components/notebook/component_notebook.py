@@ -1,8 +1,12 @@
+import sys
 import tkinter as tk
 from tkinter import ttk
 
 from core.component_basic import ComponentBasic
 
+# 鼠标中键（macOS 的 Tk 中中键为 Button-3，Button-2 是右键）
+MIDDLE_BUTTON = "<Button-3>" if sys.platform == "darwin" else "<Button-2>"
+
 
 class ComponentNotebook(ComponentBasic):
     """主容器-集成Notebook多标签管理"""
@@ -21,19 +25,30 @@ class ComponentNotebook(ComponentBasic):
     def _init_notebook(self):
         self.notebook = ttk.Notebook(self.container)
         self.notebook.pack(fill='both', expand=True)
-        self.notebook.bind(
-            '<<NotebookTabChanged>>',
-            lambda event: self.manager.publish("tab_switched", new_tab_frame=self.notebook.nametowidget(self.notebook.select()))
-        )
+        self.notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        # 中键点击标签关闭该标签页
+        self.notebook.bind(MIDDLE_BUTTON, self._on_middle_click)
+
+    def _on_tab_changed(self, event=None) -> None:
+        current_tab_id = self.notebook.select()
+        if current_tab_id:  # 关闭最后一个标签页时没有选中的标签页
+            self.manager.publish("tab_switched", new_tab_frame=self.notebook.nametowidget(current_tab_id))
+
+    def _on_middle_click(self, event) -> None:
+        index = self.notebook.tk.call(self.notebook._w, "identify", "tab", event.x, event.y)
+        if index != "":
+            tab_id = self.notebook.tabs()[int(index)]
+            self.manager.publish("file.close_tab", tab_name=self.notebook.tab(tab_id, 'text'))
     
-    def add_tab(self, tab_name: str) -> tk.Frame:
-        """添加新标签页"""
+    def add_tab(self, tab_name: str, select: bool = True) -> tk.Frame:
+        """添加新标签页（select 为 False 时留在当前标签页，用于在后台恢复会话）"""
         frame = tk.Frame(self.notebook)
         self.notebook.add(frame, text=tab_name)
         self._tabs[tab_name] = frame
 
-        self.manager.publish("new_tab_generated", tab_name=tab_name)
-        self.switch_tab_by_name(tab_name)  # 切换到新标签页
+        self.manager.publish("new_tab_generated", tab_name=tab_name, select=select)
+        if select:
+            self.switch_tab_by_name(tab_name)  # 切换到新标签页
 
         return frame
 
@@ -48,6 +63,25 @@ class ComponentNotebook(ComponentBasic):
             # 更新缓存中的标签名
             if old_name in self.tab_content_cache.keys():
                 self.tab_content_cache[new_name] = self.tab_content_cache.pop(old_name)
+            # 通知按标签名保存状态的组件（预览池、预渲染等）改用新名称
+            self.manager.publish("tab_renamed", old_name=old_name, new_name=new_name)
+
+    def close_tab(self, tab_name: str) -> bool:
+        """
+        关闭标签页并释放其全部资源
+
+        先发布 tab_closing（各组件据此丢弃按标签名或文本组件保存的状态，此时组件尚未销毁），
+        再移除标签页并销毁其中的文本组件和滚动条。
+        """
+        frame = self._tabs.get(tab_name)
+        if frame is None:
+            return False
+        self.manager.publish("tab_closing", tab_name=tab_name, tab_frame=frame)
+        del self._tabs[tab_name]
+        self.tab_content_cache.pop(tab_name, None)
+        self.notebook.forget(frame)
+        frame.destroy()
+        return True
 
     def get_tab_by_name(self, tab_name: str ) -> tk.Frame:
         """根据标签名获取标签页"""
@@ -73,4 +107,6 @@ class ComponentNotebook(ComponentBasic):
     def get_current_tab_name(self) -> str:
         """获取当前选中标签页的名称"""
         current_tab_id = self.notebook.select()
+        if not current_tab_id:
+            return ""
         return self.notebook.tab(current_tab_id, 'text')
\ No newline at end of file
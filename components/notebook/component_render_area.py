@@ -1,40 +1,67 @@
 import tkinter as tk
-import re
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Optional
+from components.markdown.code_tokenizer import CodeTokenCache, normalize_language
+from components.markdown.markdown_parser import MarkdownBackend, MarkdownParser
+from components.markdown.plan_cache import PlanCache, RenderPlan, build_plan
+from components.notebook.prerenderer import IdlePreRenderer
 from core.component_basic import ComponentBasic
 from core.component_manager import ComponentManager
 
 
-class MarkdownRenderer:
-    """Markdown渲染器 - 高效增量渲染"""
+# 代码块语法高亮配色 {记号类型: 前景色}
+CODE_TOKEN_COLORS = {
+    "keyword": "#d73a49",
+    "builtin": "#6f42c1",
+    "function": "#6f42c1",
+    "string": "#032f62",
+    "comment": "#6a737d",
+    "number": "#005cc5",
+    "literal": "#005cc5",
+    "key": "#22863a",
+    "variable": "#e36209",
+}
 
-    def __init__(self, render_text: tk.Text):
+
+class MarkdownRenderer(MarkdownBackend):
+    """Markdown渲染器 - Tk 文本标签后端"""
+
+    def __init__(self, render_text: tk.Text, font_manager, plan_cache: PlanCache = None,
+                 code_tokens: CodeTokenCache = None):
         self.render_text = render_text
+        self.font_manager = font_manager
+        self.parser = MarkdownParser()
+        self.plan_cache = plan_cache or PlanCache()  # 解析结果缓存，未修改的文档无需重新解析
         self._blocks = []  # 缓存已渲染的块
         self._current_content = ""
+        # 源行号 -> 预览行号映射（按源行号有序，用于滚动同步）
+        self._source_lines = []
+        self._preview_lines = []
+        self._total_source_lines = 0
+        self._code_tokens = code_tokens or CodeTokenCache()  # 代码块记号缓存，未修改的代码块无需重新分析
         self._setup_tags()
 
     def _setup_tags(self):
-        """设置文本样式标签"""
+        """设置文本样式标签（字体均引用 FontManager 的命名字体，缩放时无需重新打标签）"""
+        fonts = self.font_manager.get_named_font
+
         # 标题样式
-        self.render_text.tag_configure("h1", font=("Microsoft YaHei", 18, "bold"),
-                                       spacing1=16, spacing3=8)
-        self.render_text.tag_configure("h2", font=("Microsoft YaHei", 16, "bold"),
-                                       spacing1=14, spacing3=7)
-        self.render_text.tag_configure("h3", font=("Microsoft YaHei", 14, "bold"),
-                                       spacing1=12, spacing3=6)
-        self.render_text.tag_configure("h4", font=("Microsoft YaHei", 13, "bold"),
-                                       spacing1=10, spacing3=5)
-        self.render_text.tag_configure("h5", font=("Microsoft YaHei", 12, "bold"),
-                                       spacing1=8, spacing3=4)
-        self.render_text.tag_configure("h6", font=("Microsoft YaHei", 11, "bold"),
-                                       spacing1=6, spacing3=3)
+        self.render_text.tag_configure("h1", font=fonts("preview_h1"), spacing1=16, spacing3=8)
+        self.render_text.tag_configure("h2", font=fonts("preview_h2"), spacing1=14, spacing3=7)
+        self.render_text.tag_configure("h3", font=fonts("preview_h3"), spacing1=12, spacing3=6)
+        self.render_text.tag_configure("h4", font=fonts("preview_h4"), spacing1=10, spacing3=5)
+        self.render_text.tag_configure("h5", font=fonts("preview_h5"), spacing1=8, spacing3=4)
+        self.render_text.tag_configure("h6", font=fonts("preview_h6"), spacing1=6, spacing3=3)
 
         # 代码样式
-        self.render_text.tag_configure("code", font=("Consolas", 11),
+        self.render_text.tag_configure("code", font=fonts("code"),
                                        background="#f6f8fa", foreground="#24292e")
-        self.render_text.tag_configure("code_block", font=("Consolas", 11),
+        self.render_text.tag_configure("code_block", font=fonts("code"),
                                        background="#f6f8fa", lmargin1=20, lmargin2=20,
                                        spacing1=8, spacing3=8)
+        for token_type, color in CODE_TOKEN_COLORS.items():
+            self.render_text.tag_configure(f"code_{token_type}", foreground=color)
 
         # 引用样式
         self.render_text.tag_configure("quote", background="#f0f0f0",
@@ -50,307 +77,165 @@ class MarkdownRenderer:
                                        spacing1=1, spacing3=1)
 
         # 行内样式
-        self.render_text.tag_configure("bold", font=("Microsoft YaHei", 12, "bold"))
-        self.render_text.tag_configure("italic", font=("Microsoft YaHei", 12, "italic"))
-        self.render_text.tag_configure("bold italic", font=("Microsoft YaHei", 12, "bold italic"))
+        self.render_text.tag_configure("bold", font=fonts("preview_bold"))
+        self.render_text.tag_configure("italic", font=fonts("preview_italic"))
+        self.render_text.tag_configure("bold italic", font=fonts("preview_bold_italic"))
         self.render_text.tag_configure("strikethrough", overstrike=True)
         self.render_text.tag_configure("link", foreground="#0366d6", underline=True)
 
-    @staticmethod
-    def _is_horizontal_rule(line: str) -> bool:
-        """检查是否为分割线"""
-        hr_patterns = [
-            r'^\s*-{3,}\s*$',  # ---
-            r'^\s*\*{3,}\s*$',  # ***
-            r'^\s*_{3,}\s*$',  # ___
-            r'^\s*\+{3,}\s*$',  # +++
-        ]
-        return any(re.match(p, line) for p in hr_patterns)
-
-    @staticmethod
-    def _parse_header(line: str):
-        """解析标题"""
-        match = re.match(r'^(#{1,6})\s+(.+)$', line)
-        if match:
-            return len(match.group(1)), match.group(2)
-        return None
-
-    @staticmethod
-    def _is_list_item(line: str) -> bool:
-        """检查是否为列表项"""
-        return bool(re.match(r'^\s*[-*+]\s+', line) or re.match(r'^\s*\d+\.\s+', line))
-
-    @staticmethod
-    def _parse_list_item(line: str):
-        """解析列表项"""
-        match = re.match(r'^\s*([-*+]|\d+\.)\s+(.+)$', line)
-        if match:
-            return match.group(1), match.group(2)
-        return None, line
-
-    @staticmethod
-    def _format_inline_elements(text: str):
-        """格式化行内元素，返回 [(text, [tags])]"""
-        patterns = [
-            (re.compile(r'`(.*?)`'), 'code'),
-            (re.compile(r'~~(.*?)~~'), 'strikethrough'),
-            (re.compile(r'\*\*\*(.*?)\*\*\*|___(.*?)___'), 'bold italic'),
-            (re.compile(r'\*\*(.*?)\*\*|__(.*?)__'), 'bold'),
-            (re.compile(r'\*(.*?)\*|_(.*?)_'), 'italic'),
-        ]
-
-        result = []
+    def render_block(self, block: dict):
+        """渲染一个块，返回其在预览区的起止索引"""
+        start_index = self.render_text.index("end-1c")
+        super().render_block(block)
+        end_index = self.render_text.index("end-1c")
+        return start_index, end_index
+
+    def render_hr(self, block: dict) -> None:
+        self.render_text.insert("end", " " * 20 + "\n", "hr")
+
+    def render_header(self, block: dict) -> None:
+        self.render_text.insert("end", block["text"] + "\n", f"h{block['level']}")
+
+    def render_code(self, block: dict) -> None:
+        if not block["lines"]:
+            return
+        code = "\n".join(line or "" for line in block["lines"])
+        language = normalize_language(block.get("language"))
+        if not language:
+            self.render_text.insert("end", code + "\n", "code_block")
+            return
+
+        # 普通文本与记号交替组成 (文本, 标签) 序列，整个代码块只调用一次 insert
+        args = []
         pos = 0
+        for token_type, start, end in self._code_tokens.get_tokens(language, code):
+            if start > pos:
+                args.extend((code[pos:start], "code_block"))
+            args.extend((code[start:end], ("code_block", f"code_{token_type}")))
+            pos = end
+        args.extend((code[pos:] + "\n", "code_block"))
+        self.render_text.insert("end", *args)
+
+    def render_quote(self, block: dict) -> None:
+        quote_text = "\n".join(block["lines"])
+        self.render_text.insert("end", quote_text + "\n", "quote")
+
+    def render_list(self, block: dict) -> None:
+        for marker, text in block["items"]:
+            # 统一使用圆点作为列表标记
+            self.render_text.insert("end", f"• {text}\n", "list_item")
+
+    def render_para(self, block: dict) -> None:
+        for frag, tags in block["fragments"]:
+            self.render_text.insert("end", frag, tuple(tags) if tags else None)
+        self.render_text.insert("end", "\n")
+
+    def render_empty(self, block: dict) -> None:
+        self.render_text.insert("end", "\n")
+
+    def preview_line_for(self, source_line: int):
+        """
+        将源文本行号映射到预览区行号（二分查找所在块，并在块内线性插值）
 
-        while pos < len(text):
-            # 查找最近的特殊字符
-            next_special = len(text)
-            for pattern, tag in patterns:
-                m = pattern.search(text, pos)
-                if m and m.start() < next_special:
-                    next_special = m.start()
-
-            # 添加普通文本
-            if pos < next_special:
-                result.append((text[pos:next_special], []))
-                pos = next_special
-
-            # 处理特殊格式
-            if pos < len(text):
-                found = False
-                for pattern, tag in patterns:
-                    m = pattern.match(text, pos)
-                    if m:
-                        content = next(g for g in m.groups() if g is not None)
-                        result.append((content, [tag]))
-                        pos = m.end()
-                        found = True
-                        break
-                if not found:
-                    result.append((text[pos], []))
-                    pos += 1
-
-        return result
-
-    @staticmethod
-    def _process_hard_line_breaks(text: str) -> str:
-        """处理硬换行（行尾两个空格）"""
-        return re.sub(r'  $', '\n', text)
-
-    def _classify_block(self, lines: list) -> dict:
-        """将一组行分类为一个块"""
-        if not lines:
-            return {"type": "empty"}
-
-        line = lines[0].strip()
-        if not line:
-            return {"type": "empty"}
-        elif self._is_horizontal_rule(line):
-            return {"type": "hr"}
-        elif self._parse_header(line):
-            level, text = self._parse_header(line)
-            return {"type": "header", "level": level, "text": text}
-        elif line.startswith('```'):
-            code_lines = []
-            for l in lines[1:]:
-                if l.strip().startswith('```'):
-                    break
-                code_lines.append(l)
-            return {"type": "code", "lines": code_lines}
-        elif line.startswith('>'):
-            quote_lines = [l[1:].lstrip() if l.strip().startswith('>') else l for l in lines]
-            quote_lines = [l[1:].lstrip() if l.strip().startswith('>') else l for l in quote_lines]
-            # 清理引用标记
-            cleaned_lines = []
-            for l in quote_lines:
-                if l.strip().startswith('>'):
-                    cleaned_lines.append(l[1:].lstrip())
-                else:
-                    cleaned_lines.append(l)
-            return {"type": "quote", "lines": cleaned_lines}
-        elif self._is_list_item(line):
-            items = []
-            for l in lines:
-                if self._is_list_item(l):
-                    marker, text = self._parse_list_item(l)
-                    items.append((marker, text))
-            return {"type": "list", "items": items}
+        Returns:
+            float | None: 预览区行号，映射为空时返回 None
+        """
+        if not self._source_lines:
+            return None
+        i = bisect_right(self._source_lines, source_line) - 1
+        if i < 0:
+            return 1.0
+        src_start, preview_start = self._source_lines[i], self._preview_lines[i]
+        if i + 1 < len(self._source_lines):
+            src_end, preview_end = self._source_lines[i + 1], self._preview_lines[i + 1]
         else:
-            return {"type": "para", "lines": lines}
-
-    def _render_block(self, block: dict):
-        """渲染一个块"""
-        t = self.render_text
-        start_index = t.index("end-1c")
-
-        if block["type"] == "hr":
-            t.insert("end", " " * 20 + "\n", "hr")
-        elif block["type"] == "header":
-            t.insert("end", block["text"] + "\n", f"h{block['level']}")
-        elif block["type"] == "code":
-            for line in block["lines"]:
-                t.insert("end", (line or "") + "\n", "code_block")
-        elif block["type"] == "quote":
-            quote_text = "\n".join(block["lines"])
-            t.insert("end", quote_text + "\n", "quote")
-        elif block["type"] == "list":
-            for marker, text in block["items"]:
-                # 统一使用圆点作为列表标记
-                t.insert("end", f"• {text}\n", "list_item")
-        elif block["type"] == "para":
-            para_text = ' '.join(line.rstrip() for line in block["lines"])
-            para_text = self._process_hard_line_breaks(para_text)
-            fragments = self._format_inline_elements(para_text)
-            for frag, tags in fragments:
-                t.insert("end", frag, tuple(tags) if tags else None)
-            t.insert("end", "\n")
-        elif block["type"] == "empty":
-            t.insert("end", "\n")
-
-        end_index = t.index("end-1c")
-        return start_index, end_index
-
-    def update_content(self, new_content: str):
+            src_end = self._total_source_lines + 1
+            preview_end = int(self.render_text.index("end-1c").split('.')[0]) + 1
+        if src_end <= src_start:
+            return float(preview_start)
+        ratio = min(1.0, (source_line - src_start) / (src_end - src_start))
+        return preview_start + ratio * (preview_end - preview_start)
+
+    def update_content(self, new_content: str, plan: RenderPlan = None):
         """
         增量更新内容（用于实时渲染）
+
+        Args:
+            plan: 已构建好的渲染计划（如空闲预渲染的结果），提供时不再查找缓存或解析
         """
         # 为简化实现，此处使用全量重绘
         # 实际项目中可以优化为只更新差异块
         self.render_text.config(state="normal")
         self.render_text.delete("1.0", "end")
+        self._source_lines = []
+        self._preview_lines = []
 
         if not new_content:
+            self._blocks = []
+            self._total_source_lines = 0
             self.render_text.config(state="disabled")
             return
 
-        # 分块处理
-        lines = new_content.split('\n')
-        self._blocks = []
-
-        i = 0
-        block_start = 0
-
-        # 重新分块
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # 空行处理
-            if not line:
-                if i > block_start:
-                    block_lines = lines[block_start:i]
-                    if block_lines:
-                        self._blocks.append(self._classify_block(block_lines))
-                self._blocks.append({"type": "empty"})
-                i += 1
-                block_start = i
-                continue
-
-            # 分割线处理
-            if self._is_horizontal_rule(lines[i]):
-                if i > block_start:
-                    block_lines = lines[block_start:i]
-                    if block_lines:
-                        self._blocks.append(self._classify_block(block_lines))
-                self._blocks.append({"type": "hr"})
-                i += 1
-                block_start = i
-                continue
+        # 分块处理（命中计划缓存时跳过解析）
+        if plan is None:
+            plan = self.plan_cache.get(new_content)
+        if plan is None:
+            lines = new_content.split('\n')
+            plan = build_plan(len(lines), self.parser.iter_blocks(lines))
+            self.plan_cache.put(new_content, plan)
+        self._total_source_lines, self._blocks = plan
 
-            # 代码块处理
-            if lines[i].strip().startswith('```'):
-                j = i + 1
-                while j < len(lines) and not lines[j].strip().startswith('```'):
-                    j += 1
-                if j < len(lines):
-                    j += 1
-                code_block = {"type": "code", "lines": lines[i + 1:j - 1]}
-                if i > block_start:
-                    block_lines = lines[block_start:i]
-                    if block_lines:
-                        self._blocks.append(self._classify_block(block_lines))
-                self._blocks.append(code_block)
-                i = j
-                block_start = i
-                continue
-
-            # 引用块处理
-            if lines[i].strip().startswith('>'):
-                j = i
-                while j < len(lines) and lines[j].strip().startswith('>'):
-                    j += 1
-                quote_lines = [l[1:].lstrip() if l.strip().startswith('>') else l for l in lines[i:j]]
-                quote_block = {"type": "quote", "lines": quote_lines}
-                if i > block_start:
-                    block_lines = lines[block_start:i]
-                    if block_lines:
-                        self._blocks.append(self._classify_block(block_lines))
-                self._blocks.append(quote_block)
-                i = j
-                block_start = i
-                continue
+        # 渲染所有块，同时记录源行号到预览行号的映射
+        for block in self._blocks:
+            if block["type"] != "empty":
+                start_index, _ = self.render_block(block)
+                self._source_lines.append(block["line"])
+                self._preview_lines.append(int(start_index.split('.')[0]))
 
-            # 列表处理
-            if self._is_list_item(lines[i]):
-                j = i
-                while j < len(lines) and self._is_list_item(lines[j]):
-                    j += 1
-                list_items = []
-                for k in range(i, j):
-                    marker, text = self._parse_list_item(lines[k])
-                    list_items.append((marker, text))
-                list_block = {"type": "list", "items": list_items}
-                if i > block_start:
-                    block_lines = lines[block_start:i]
-                    if block_lines:
-                        self._blocks.append(self._classify_block(block_lines))
-                self._blocks.append(list_block)
-                i = j
-                block_start = i
-                continue
+        self.render_text.config(state="disabled")
 
-            # 标题处理
-            header = self._parse_header(lines[i])
-            if header:
-                header_block = {"type": "header", "level": header[0], "text": header[1]}
-                if i > block_start:
-                    block_lines = lines[block_start:i]
-                    if block_lines:
-                        self._blocks.append(self._classify_block(block_lines))
-                self._blocks.append(header_block)
-                i += 1
-                block_start = i
-                continue
 
-            i += 1
+class PreviewSlot:
+    """一个标签页的预览：独立的文本组件与渲染器，切换标签页时内容与滚动位置原样保留"""
 
-        # 处理最后的块
-        if block_start < len(lines):
-            block_lines = lines[block_start:]
-            if any(line.strip() for line in block_lines):
-                self._blocks.append(self._classify_block(block_lines))
+    def __init__(self, render_text: tk.Text, renderer: MarkdownRenderer):
+        self.render_text = render_text
+        self.renderer = renderer
+        self.tab_name: Optional[str] = None
+        self.content: Optional[str] = None  # 已渲染的内容，None 表示尚未渲染
+        self.last_scroll_position = 0.0
 
-        # 渲染所有块
-        for block in self._blocks:
-            if block["type"] != "empty":
-                self._render_block(block)
 
-        self.render_text.config(state="disabled")
+class ComponentRenderArea(ComponentBasic):
+    """
+    Markdown 渲染区域组件 - 高效实时渲染版
 
+    最近使用的几个标签页各有一个预览文本组件（按 LRU 回收），切换标签页时只需
+    pack_forget/pack 交换组件；只有池中没有该标签页时才需要重新渲染。
+    """
 
-class ComponentRenderArea(ComponentBasic):
-    """Markdown 渲染区域组件 - 高效实时渲染版"""
+    PREVIEW_POOL_SIZE = 4  # 默认保留预览组件的标签页数
 
-    def __init__(self, manager: ComponentManager):
+    def __init__(self, manager: ComponentManager, font_manager):
         super().__init__(
             name="render_area",
             manager=manager
         )
-        self.render_text = None
-        self.markdown_renderer = None
+        self.font_manager = font_manager
+        self.render_text = None  # 当前显示的预览文本组件
+        self.markdown_renderer = None  # 当前显示的预览的渲染器
+        self.preview_frame = None
+        self.plan_cache = None  # 所有预览共用的渲染计划缓存
+        self.code_tokens = CodeTokenCache()  # 所有预览共用的代码块记号缓存
+        self.preview_pool_size = self.PREVIEW_POOL_SIZE
+        self._slots: "OrderedDict[Optional[str], PreviewSlot]" = OrderedDict()  # {标签名: 预览}，最近使用的在末尾
+        self.active_slot: Optional[PreviewSlot] = None
+        self.prerenderer = None  # 后台标签页的空闲预渲染
         self.in_sync = False
-        self.last_scroll_position = 0.0
+        self.last_source_line = None  # 编辑区顶部可见的源行号
         self.current_content = ""
         self._render_debounce_id = None  # 防抖定时器ID
+        self._render_debounce_tab = None  # 等待中的防抖渲染所属的标签页
         self._render_debounce_delay = 50  # 防抖延迟（毫秒）
 
         self._init_render_area()
@@ -361,22 +246,42 @@ class ComponentRenderArea(ComponentBasic):
         self.manager.subscribe("text_scrolled", self.on_text_scrolled)
         self.manager.subscribe("text_updated", self._on_text_updated_debounced)
         self.manager.subscribe("tab_switched", self._on_tab_switched_render)
+        self.manager.subscribe("tab_closing", self._on_tab_closing)
+        self.manager.subscribe("tab_renamed", self._on_tab_renamed)
 
     def create_render_area(self):
         """创建美化文本渲染区域"""
         container = self.get_container()
 
-        # 创建主框架
-        main_frame = tk.Frame(container)
-        main_frame.pack(fill=tk.BOTH, expand=True)
+        # 创建主框架，各标签页的预览组件在其中轮流显示
+        self.preview_frame = tk.Frame(container)
+        self.preview_frame.pack(fill=tk.BOTH, expand=True)
+        # 隐藏期间不渲染，重新显示时补上错过的内容
+        container.bind("<Map>", lambda e: self.refresh_current_tab(), add="+")
+
+        self.plan_cache = PlanCache()
+        self.prerenderer = IdlePreRenderer(
+            self.manager.root,
+            self.plan_cache,
+            self._prerender_candidates,
+            is_busy=lambda: self._render_debounce_id is not None
+        )
+
+        # 显示初始内容（尚未关联标签页的预览，首个标签页会直接接管它）
+        slot = self._slot_for(None)
+        self._activate(slot)
+        self._display_welcome_message(slot.render_text)
+
+    # ------------------------------------------------------------ 预览组件池
 
-        # 创建文本区域
-        self.render_text = tk.Text(
-            main_frame,
+    def _create_slot(self) -> PreviewSlot:
+        """创建一个预览文本组件及其渲染器"""
+        render_text = tk.Text(
+            self.preview_frame,
             wrap=tk.WORD,
             background="#ffffff",
             foreground="#24292e",
-            font=("Microsoft YaHei", 12),
+            font=self.font_manager.get_named_font("preview_body"),
             padx=25,
             pady=25,
             spacing1=6,
@@ -385,111 +290,201 @@ class ComponentRenderArea(ComponentBasic):
             relief=tk.FLAT,
             borderwidth=0
         )
+        renderer = MarkdownRenderer(render_text, self.font_manager, self.plan_cache, self.code_tokens)
+        return PreviewSlot(render_text, renderer)
+
+    def _slot_for(self, tab_name: Optional[str]) -> PreviewSlot:
+        """获取标签页的预览；池中没有时接管未关联的预览、回收最久未用的预览或新建"""
+        slot = self._slots.get(tab_name)
+        if slot is not None:
+            self._slots.move_to_end(tab_name)
+            return slot
+        if None in self._slots:
+            slot = self._slots.pop(None)
+        elif len(self._slots) >= self.preview_pool_size:
+            _, slot = self._slots.popitem(last=False)
+            slot.content = None
+            slot.last_scroll_position = 0.0
+        else:
+            slot = self._create_slot()
+        slot.tab_name = tab_name
+        self._slots[tab_name] = slot
+        return slot
+
+    def _activate(self, slot: PreviewSlot) -> None:
+        """显示指定的预览组件"""
+        if slot is self.active_slot:
+            return
+        if self.active_slot is not None:
+            self.active_slot.render_text.pack_forget()
+        slot.render_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.active_slot = slot
+        self.render_text = slot.render_text
+        self.markdown_renderer = slot.renderer
+        self.current_content = slot.content or ""
+
+    def set_preview_pool_size(self, size: int) -> None:
+        """设置保留预览组件的标签页数（至少 1），多出的预览立即销毁"""
+        self.preview_pool_size = max(1, size)
+        for tab_name in list(self._slots):
+            if len(self._slots) <= self.preview_pool_size:
+                break
+            if self._slots[tab_name] is not self.active_slot:
+                self._slots.pop(tab_name).render_text.destroy()
+
+    def release_tab(self, tab_name: str) -> None:
+        """
+        释放标签页的预览与预渲染计划
+
+        当前显示的预览改为未关联的预览（显示欢迎消息，随后切换到的标签页可直接接管），其余的立即销毁。
+        """
+        if self.prerenderer:
+            self.prerenderer.forget(tab_name)
+        slot = self._slots.pop(tab_name, None)
+        if slot is None:
+            return
+        if slot is not self.active_slot:
+            slot.render_text.destroy()
+            return
+        unassigned = self._slots.pop(None, None)
+        if unassigned is not None:
+            unassigned.render_text.destroy()
+        slot.tab_name = None
+        slot.content = None
+        slot.last_scroll_position = 0.0
+        slot.renderer.update_content("")  # 丢弃渲染器持有的块和行号映射
+        self._slots[None] = slot
+        self._slots.move_to_end(None, last=False)
+        self._display_welcome_message(slot.render_text)
+        self.current_content = ""
 
-        self.render_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    def _on_tab_renamed(self, old_name: str, new_name: str) -> None:
+        """标签页改名（如另存为）后按新名称沿用其预览与预渲染计划，预览在池中的位置不变"""
+        if self.prerenderer:
+            self.prerenderer.rename(old_name, new_name)
+        if self._render_debounce_tab == old_name:
+            self._render_debounce_tab = new_name
+        if old_name not in self._slots:
+            return
+        self._slots = OrderedDict(
+            (new_name if name == old_name else name, slot) for name, slot in self._slots.items()
+        )
+        self._slots[new_name].tab_name = new_name
 
-        # 初始化Markdown渲染器
-        self.markdown_renderer = MarkdownRenderer(self.render_text)
+    def _on_tab_closing(self, tab_name: str, tab_frame: tk.Frame) -> None:
+        # 等待中的防抖渲染按标签名查找预览，预览释放后自然跳过
+        self.release_tab(tab_name)
 
-        # 显示初始内容
-        self._display_welcome_message()
+    # ------------------------------------------------------------ 渲染
 
-    def _display_welcome_message(self):
+    def _display_welcome_message(self, render_text: tk.Text):
         """显示欢迎消息"""
-        self.render_text.config(state=tk.NORMAL)
-        self.render_text.delete(1.0, tk.END)
-        self.render_text.insert(tk.END, "Markdown 预览区域\n", "h2")
-        self.render_text.insert(tk.END, "在这里查看您的 Markdown 文档渲染效果\n\n")
-        self.render_text.insert(tk.END, "开始编辑左侧的文档，预览将实时显示在这里。")
-        self.render_text.config(state=tk.DISABLED)
+        render_text.config(state=tk.NORMAL)
+        render_text.delete(1.0, tk.END)
+        render_text.insert(tk.END, "Markdown 预览区域\n", "h2")
+        render_text.insert(tk.END, "在这里查看您的 Markdown 文档渲染效果\n\n")
+        render_text.insert(tk.END, "开始编辑左侧的文档，预览将实时显示在这里。")
+        render_text.config(state=tk.DISABLED)
+
+    def _current_tab_name(self) -> Optional[str]:
+        notebook_component = self.manager.get_component("component_notebook")
+        if not notebook_component or not notebook_component.notebook.tabs():
+            return None
+        return notebook_component.get_current_tab_name()
+
+    def _is_visible(self) -> bool:
+        layout_manager = self.manager.layout_manager
+        return layout_manager is None or layout_manager.is_section_visible(self.get_layout_section())
 
     def _on_text_updated_debounced(self, content: str):
-        """防抖处理文本更新事件"""
+        """防抖处理文本更新事件（预览区域隐藏时跳过）"""
+        if not self._is_visible():
+            return
         # 取消之前的定时器
         if self._render_debounce_id:
             self.manager.root.after_cancel(self._render_debounce_id)
 
-        # 设置新的定时器
+        # 设置新的定时器（渲染到内容所属标签页的预览，即使届时已切换到其他标签页）
+        self._render_debounce_tab = self._current_tab_name()
         self._render_debounce_id = self.manager.root.after(
             self._render_debounce_delay,
-            lambda: self._on_text_updated(content)
+            lambda: self._on_text_updated(content, tab_name=self._render_debounce_tab)
         )
 
-    def _on_text_updated(self, content: str):
-        """处理文本更新事件"""
+    def _on_text_updated(self, content: str, plan: RenderPlan = None, tab_name: Optional[str] = None):
+        """处理文本更新事件（未指定标签页时渲染到当前显示的预览）"""
         # 清除防抖定时器ID
         self._render_debounce_id = None
+        if not self._is_visible():
+            return  # 定时器到期前预览区域已被隐藏
 
-        # 保存滚动位置
-        self._save_scroll_position()
-
-        # 渲染内容
-        self._render_markdown_content(content)
-
-        # 恢复滚动位置
-        self._restore_scroll_position()
+        slot = self._slots.get(tab_name) if tab_name is not None else self.active_slot
+        if slot is not None:
+            self._render_into(slot, content, plan)
+        if self.prerenderer:
+            self.prerenderer.schedule()  # 编辑停止一段时间后再继续预渲染
 
-        # 更新内容记录
-        self.current_content = content
+    def _render_into(self, slot: PreviewSlot, content: str, plan: RenderPlan = None) -> None:
+        """渲染内容到预览，并尽量保持其滚动位置"""
+        rendered_before = bool(slot.content)
+        slot.last_scroll_position = slot.render_text.yview()[0]
 
-    def _save_scroll_position(self):
-        """保存滚动位置"""
-        try:
-            current_view = self.render_text.yview()
-            if current_view and len(current_view) >= 2:
-                self.last_scroll_position = current_view[0]
-        except:
-            self.last_scroll_position = 0.0
-
-    def _restore_scroll_position(self):
-        """恢复滚动位置"""
-        if not self.current_content:  # 首次加载不恢复位置
-            return
-        try:
-            self.render_text.yview_moveto(self.last_scroll_position)
-        except:
-            pass
-
-    def _render_markdown_content(self, content: str):
-        """使用Markdown渲染器渲染内容"""
         if not content:
-            self._display_empty_content()
-            return
-
-        try:
-            # 使用高效的Markdown渲染器
-            self.markdown_renderer.update_content(content)
-        except Exception as e:
-            self._display_error_content(str(e))
-
-    def _display_empty_content(self):
+            self._display_empty_content(slot.render_text)
+        else:
+            try:
+                # 使用高效的Markdown渲染器
+                slot.renderer.update_content(content, plan)
+            except Exception as e:
+                self._display_error_content(slot.render_text, str(e))
+
+        # 恢复滚动位置（首次渲染不恢复）；当前预览优先按源行号重新锚定，避免块高度变化导致两侧错位
+        if rendered_before:
+            if (slot is not self.active_slot or self.last_source_line is None
+                    or not self._scroll_to_source_line(self.last_source_line)):
+                slot.render_text.yview_moveto(slot.last_scroll_position)
+        slot.content = content
+        if slot is self.active_slot:
+            self.current_content = content
+
+    def _scroll_to_source_line(self, source_line: int) -> bool:
+        """将预览区滚动到与源行号对应的块，映射不可用时返回 False"""
+        preview_line = self.markdown_renderer.preview_line_for(source_line)
+        if preview_line is None:
+            return False
+        self.render_text.yview(f"{int(preview_line)}.0")
+        return True
+
+    def _display_empty_content(self, render_text: tk.Text):
         """显示空内容"""
-        self.render_text.config(state=tk.NORMAL)
-        self.render_text.delete(1.0, tk.END)
-        self.render_text.insert(tk.END, "暂无内容\n\n", "h2")
-        self.render_text.insert(tk.END, "开始编辑文档以查看预览效果。")
-        self.render_text.config(state=tk.DISABLED)
+        render_text.config(state=tk.NORMAL)
+        render_text.delete(1.0, tk.END)
+        render_text.insert(tk.END, "暂无内容\n\n", "h2")
+        render_text.insert(tk.END, "开始编辑文档以查看预览效果。")
+        render_text.config(state=tk.DISABLED)
 
-    def _display_error_content(self, error_message: str):
+    def _display_error_content(self, render_text: tk.Text, error_message: str):
         """显示错误内容"""
-        self.render_text.config(state=tk.NORMAL)
-        self.render_text.delete(1.0, tk.END)
-        self.render_text.insert(tk.END, "渲染错误\n", "h2")
-        self.render_text.insert(tk.END, f"错误信息: {error_message}\n\n")
-        self.render_text.insert(tk.END, "请检查您的 Markdown 语法是否正确。")
-        self.render_text.config(state=tk.DISABLED)
-
-    def on_text_scrolled(self, fraction):
-        """处理滚动同步"""
+        render_text.config(state=tk.NORMAL)
+        render_text.delete(1.0, tk.END)
+        render_text.insert(tk.END, "渲染错误\n", "h2")
+        render_text.insert(tk.END, f"错误信息: {error_message}\n\n")
+        render_text.insert(tk.END, "请检查您的 Markdown 语法是否正确。")
+        render_text.config(state=tk.DISABLED)
+
+    def on_text_scrolled(self, fraction, line=None):
+        """处理滚动同步 - 按源行号锚定到对应的预览块，无映射时退化为按比例同步"""
         if self.in_sync or not self.render_text:
             return
 
+        self.last_source_line = line
         if not self.current_content:  # 首次加载不同步
             return
 
         self.in_sync = True
         try:
-            self.render_text.yview_moveto(fraction)
+            if line is None or not self._scroll_to_source_line(line):
+                self.render_text.yview_moveto(fraction)
         except:
             pass
         finally:
@@ -497,27 +492,61 @@ class ComponentRenderArea(ComponentBasic):
 
     def _on_tab_switched_render(self, new_tab_frame: tk.Frame):
         """处理标签页切换"""
+        self.refresh_current_tab()
+
+    def refresh_current_tab(self):
+        """
+        显示当前标签页的预览
+
+        池中已有且内容未变时只交换组件；否则按缓存内容渲染（已预渲染的标签页直接使用现成的计划）。
+        """
         try:
             notebook_component = self.manager.get_component("component_notebook")
-            if not notebook_component:
+            if not notebook_component or not self._is_visible():
                 return
 
-            current_tab_name = notebook_component.get_current_tab_name()
-            if current_tab_name and current_tab_name in notebook_component.tab_content_cache:
-                cached_content = notebook_component.tab_content_cache[current_tab_name]
-                # 立即渲染，不需要防抖
-                self._on_text_updated(cached_content)
-            else:
-                self._display_welcome_message()
-                self.last_scroll_position = 0.0
+            # 新标签页的锚点由其编辑区随后发布的滚动事件决定
+            self.last_source_line = None
+            current_tab_name = self._current_tab_name()
+            if current_tab_name and self.prerenderer:
+                self.prerenderer.touch(current_tab_name)
+            slot = self._slot_for(current_tab_name)
+            self._activate(slot)
+
+            content = notebook_component.tab_content_cache.get(current_tab_name) if current_tab_name else None
+            if content is None:
+                self._display_welcome_message(slot.render_text)
+                slot.content = None
                 self.current_content = ""
+                return
+            if slot.content is content or slot.content == content:
+                return  # 池命中：内容与滚动位置原样保留
+
+            # 立即渲染，不需要防抖
+            ready = self.prerenderer.plan_for(current_tab_name, content) if self.prerenderer else None
+            self._render_into(slot, content, ready[1] if ready else None)
 
         except Exception as e:
             print(f"标签页切换错误: {e}")
 
+    def _prerender_candidates(self, recent_tabs):
+        """可预渲染的后台标签页 (标签名, 内容)，按最近使用顺序；预览组件已是最新的标签页无需预渲染"""
+        notebook_component = self.manager.get_component("component_notebook")
+        if not notebook_component or not notebook_component.notebook.tabs():
+            return
+        current_tab_name = notebook_component.get_current_tab_name()
+        for tab_name in recent_tabs:
+            content = notebook_component.tab_content_cache.get(tab_name)
+            if tab_name == current_tab_name or not content:
+                continue
+            slot = self._slots.get(tab_name)
+            if slot is not None and slot.content is content:
+                continue
+            yield tab_name, content
+
     def get_layout_section(self):
         return "render_section"
 
     def set_render_debounce_delay(self, delay_ms: int):
         """设置渲染防抖延迟（毫秒）"""
-        self._render_debounce_delay = max(10, delay_ms)  # 最小10ms
\ No newline at end of file
+        self._render_debounce_delay = max(10, delay_ms)  # 最小10ms
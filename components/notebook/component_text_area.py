@@ -1,7 +1,23 @@
+from dataclasses import dataclass
 from core.component_basic import ComponentBasic
 from core.component_manager import ComponentManager
 import tkinter as tk
 
+
+@dataclass
+class TextEdit:
+    """一次文本编辑的增量描述（行号从1开始）"""
+    op: str             # 'insert' 或 'delete'
+    index: str          # 编辑起始位置（规范化后的 tk 索引）
+    text: str           # 插入或被删除的文本
+    start_line: int     # 编辑起始行
+    old_end_line: int   # 编辑前受影响的最后一行
+    new_end_line: int   # 编辑后受影响的最后一行
+    compound: bool = False  # 是否与上一次编辑属于同一个操作（replace 的插入部分）
+
+# 由撤销组件接管的 "edit" 子命令（Tk 自带的撤销栈已关闭）
+HISTORY_COMMANDS = ("undo", "redo", "separator", "reset", "canundo", "canredo")
+
 class ComponentTextArea(ComponentBasic):
     """文本区域组件"""
     def __init__(self, manager: ComponentManager, font_manager):
@@ -14,23 +30,23 @@ class ComponentTextArea(ComponentBasic):
         self.current_tab = None  # 当前活动标签页的 frame
 
         self.font_manager = font_manager
+        self._scroll_sync_id = None  # 滚动同步的空闲回调ID
+        self._last_scroll_line = None  # 上次发布的顶部可见行号
+        self.loading_widgets = set()  # 正在分块载入文件的文本组件，载入期间不发布 text_updated
 
         self._init_text_area()
 
     def _init_text_area(self):
         """初始化文本区域组件"""
-        # 增加字体监听
-        self.font_manager.add_font_change_listener(self._on_font_changed)
-
         # 订阅事件
         self.manager.subscribe("new_tab_generated", self.create_text_area)
         self.manager.subscribe("tab_switched", self._on_tab_switched)
+        self.manager.subscribe("tab_closing", self._on_tab_closing)
 
-    def create_text_area(self, tab_name: str):
-        """为标签页创建文本区域"""
+    def create_text_area(self, tab_name: str, select: bool = True):
+        """为标签页创建文本区域（select 为 False 时不改变当前文本组件）"""
         tab_frame = self.manager.get_component("component_notebook").get_tab_by_name(tab_name)
-        family, size = self.font_manager.get_current_font()
-        
+
         scrollbar = tk.Scrollbar(tab_frame)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
@@ -41,11 +57,14 @@ class ComponentTextArea(ComponentBasic):
                 padx=10,
                 pady=10,
                 yscrollcommand=scrollbar.set,
-                undo=True,
-                maxundo=50,
-                font=(family, size)
+                undo=False,  # 撤销/重做由 component_undo 基于增量编辑流实现
+                font=self.font_manager.get_named_font("editor")  # 命名字体，字体变化由 Tk 传播
             )
             text_area.pack(fill=tk.BOTH, expand=True)
+            # 视图任何原因的变化（滚轮、Button-4/5、键盘翻页、拖动滚动条）都会回调 yscrollcommand
+            text_area.config(yscrollcommand=lambda first, last, ta=text_area, sb=scrollbar: self._on_text_yview_changed(ta, sb, first, last))
+            # 拦截底层 insert/delete 命令，发布增量编辑事件
+            self._install_edit_proxy(text_area)
             # 绑定文本修改事件
             text_area.bind('<<Modified>>', self._on_text_modified)
              # 绑定键盘快捷键
@@ -53,40 +72,158 @@ class ComponentTextArea(ComponentBasic):
         else:
             self.text_area.delete("1.0", tk.END)  # 清空旧内容
 
-        self.text_area = self.check_direct_text_child(tab_frame)
-        scrollbar.config(command=self.text_area.yview)
-        # tk绑定事件
-        self.text_area.bind("<MouseWheel>", self._on_text_scroll)
-        
-    def _on_text_scroll(self, event):
+        text_area = self.check_direct_text_child(tab_frame)
+        scrollbar.config(command=text_area.yview)
+        if select:
+            self.text_area = text_area
+
+    def _on_text_yview_changed(self, text_area: tk.Text, scrollbar: tk.Scrollbar, first, last) -> None:
+        """文本视图变化回调：更新滚动条，并在空闲时合并发布滚动事件"""
+        scrollbar.set(first, last)
+        if text_area is self.text_area and not self._scroll_sync_id:
+            self._scroll_sync_id = self.manager.root.after_idle(self._on_text_scroll)
+
+    def _on_text_scroll(self, event=None):
         """处理文本区域滚动事件"""
+        self._scroll_sync_id = None
         if self.text_area:
-            # 获取当前滚动位置
+            # 获取顶部可见行号，内容编辑导致的回调不会改变顶部行，直接忽略
+            line = int(self.text_area.index("@0,0").split('.')[0])
+            if line == self._last_scroll_line:
+                return
+            self._last_scroll_line = line
             fraction = self.text_area.yview()[0]
             # 向外部发布滚动事件
-            self.manager.publish("text_scrolled", fraction=fraction)
+            self.manager.publish("text_scrolled", fraction=fraction, line=line)
+
+    def _install_edit_proxy(self, text_area: tk.Text) -> None:
+        """将文本组件的 Tcl 命令替换为代理，以获得增量编辑流"""
+        widget_cmd = str(text_area)
+        orig_cmd = widget_cmd + "_orig"
+        text_area.tk.call("rename", widget_cmd, orig_cmd)
+        text_area.tk.createcommand(
+            widget_cmd,
+            lambda *args: self._proxy_text_command(text_area, orig_cmd, *args)
+        )
+        # 组件销毁时一并删除代理命令
+        text_area._tclCommands = (text_area._tclCommands or []) + [widget_cmd]
+
+    def _proxy_text_command(self, text_area: tk.Text, orig_cmd: str, *args):
+        """代理文本组件命令，在 insert/delete 前后计算增量并发布；撤销相关命令转交撤销组件"""
+        call = text_area.tk.call
+        compare = lambda a, rel, b: text_area.tk.getboolean(call(orig_cmd, "compare", a, rel, b))
+        if len(args) >= 2 and args[0] == "edit" and args[1] in HISTORY_COMMANDS:
+            undo_component = self.manager.get_component("component_undo")
+            if undo_component:
+                return undo_component.handle_command(text_area, args[1])
+        if not args or args[0] not in ("insert", "delete", "replace"):
+            return call((orig_cmd,) + args)
+
+        op = args[0]
+        if op == "insert" and len(args) >= 3:
+            index = self._normalize_index(text_area, orig_cmd, args[1])
+            text = "".join(args[2::2])
+            result = call((orig_cmd,) + args)
+            self._publish_edit(text_area, "insert", index, text)
+            return result
+
+        if op == "delete" and len(args) >= 2:
+            start = self._normalize_index(text_area, orig_cmd, args[1])
+            end = self._normalize_index(text_area, orig_cmd, args[2]) if len(args) >= 3 else str(call(orig_cmd, "index", f"{start}+1c"))
+            text = call(orig_cmd, "get", start, end) if compare(start, "<", end) else ""
+            result = call((orig_cmd,) + args)
+            self._publish_edit(text_area, "delete", start, text)
+            return result
+
+        if op == "replace" and len(args) >= 4:
+            start = self._normalize_index(text_area, orig_cmd, args[1])
+            end = self._normalize_index(text_area, orig_cmd, args[2])
+            removed = call(orig_cmd, "get", start, end) if compare(start, "<", end) else ""
+            inserted = "".join(args[3::2])
+            result = call((orig_cmd,) + args)
+            self._publish_edit(text_area, "delete", start, removed)
+            self._publish_edit(text_area, "insert", start, inserted, compound=bool(removed))
+            return result
+
+        return call((orig_cmd,) + args)
+
+    @staticmethod
+    def _normalize_index(text_area: tk.Text, orig_cmd: str, index) -> str:
+        """规范化索引；'end' 在 Tk 中实际落在最后一个换行符之前"""
+        call = text_area.tk.call
+        normalized = str(call(orig_cmd, "index", index))
+        if text_area.tk.getboolean(call(orig_cmd, "compare", normalized, "==", "end")):
+            normalized = str(call(orig_cmd, "index", "end-1c"))
+        return normalized
+
+    def _publish_edit(self, text_area: tk.Text, op: str, index: str, text: str, compound: bool = False) -> None:
+        """发布增量编辑事件"""
+        if not text:
+            return
+        start_line = int(index.split('.')[0])
+        line_span = text.count('\n')
+        if op == "insert":
+            edit = TextEdit(op, index, text, start_line, start_line, start_line + line_span, compound)
+        else:
+            edit = TextEdit(op, index, text, start_line, start_line + line_span, start_line, compound)
+        self.manager.publish("text_edited", text_widget=text_area, edit=edit)
+
+    def begin_bulk_load(self, text_area: tk.Text) -> None:
+        """开始分块载入：载入期间的插入只发布增量编辑事件，不逐次触发整篇渲染"""
+        self.loading_widgets.add(text_area)
+
+    def end_bulk_load(self, text_area: tk.Text) -> None:
+        """结束分块载入，按一次普通修改通知渲染区域"""
+        self.loading_widgets.discard(text_area)
+        # 修改标记已置位时 <<Modified>> 尚未处理，否则置位以触发一次
+        if text_area.winfo_exists() and not text_area.edit_modified():
+            text_area.edit_modified(True)
+
+    def is_loading(self, text_area: tk.Text) -> bool:
+        return text_area in self.loading_widgets
 
     def _on_text_modified(self, event=None):
-        """处理文本修改事件（触发渲染更新）"""
+        """处理文本修改事件（更新所属标签页的内容缓存，当前标签页还触发渲染更新）"""
+        widget = event.widget if event is not None else self.text_area
+        if widget is None:
+            return
         # 避免重复触发<<Modified>> 事件会在内容变化后自动标记为已修改
-        self.text_area.edit_modified(False)
-        
-        content = self.text_area.get("1.0", tk.END).strip()
-        # 更新缓存
+        widget.edit_modified(False)
+        if widget in self.loading_widgets:
+            return
+
+        # 仅去除末尾空白，保持源行号与渲染映射对齐
+        content = widget.get("1.0", tk.END).rstrip()
+        # 更新缓存（后台标签页，如切走后才载入完成的文件，同样更新自己的缓存）
         notebook_component = self.manager.get_component("component_notebook")
-        current_tab_name = notebook_component.get_current_tab_name()
-        if current_tab_name:
-            notebook_component.tab_content_cache[current_tab_name] = content
+        tab_name = notebook_component.notebook.tab(widget.master, 'text')
+        if tab_name:
+            notebook_component.tab_content_cache[tab_name] = content
 
-        # 发布事件通知渲染区域更新
-        self.manager.publish("text_updated", content=content)
+        # 只有当前标签页需要立即通知渲染区域，后台标签页切换过去时按缓存渲染
+        if widget is self.text_area:
+            self.manager.publish("text_updated", content=content)
     
     def _on_tab_switched(self, new_tab_frame: tk.Frame):
         """处理标签页切换事件"""
         self.current_tab = new_tab_frame
         if self.check_direct_text_child(new_tab_frame):
             self.text_area = self.check_direct_text_child(new_tab_frame)
+            self._last_scroll_line = None
+            # 切换后同步一次预览位置
+            if not self._scroll_sync_id:
+                self._scroll_sync_id = self.manager.root.after_idle(self._on_text_scroll)
         # logger.info(f"Switched to text_area: {self.text_area}")
+
+    def _on_tab_closing(self, tab_name: str, tab_frame: tk.Frame) -> None:
+        """标签页关闭时释放对其文本组件的引用（随后切换到的标签页会重新设置）"""
+        text_area = self.check_direct_text_child(tab_frame)
+        self.loading_widgets.discard(text_area)
+        if text_area is not None and text_area is self.text_area:
+            self.text_area = None
+            self._last_scroll_line = None
+        if tab_frame is self.current_tab:
+            self.current_tab = None
     
     def _bind_cursor_events(self, text_area):
         """绑定光标移动相关事件"""
@@ -127,14 +264,6 @@ class ComponentTextArea(ComponentBasic):
             except Exception as e:
                 print(f"获取光标位置时出错: {e}")
 
-    def _on_font_changed(self, family: str, size: int):
-        """更新所有标签页的字体"""
-        notebook = self.manager.get_component("component_notebook").notebook
-        for tab_id in notebook.tabs():
-            tab_frame = notebook.nametowidget(tab_id)
-            if self.check_direct_text_child(tab_frame):
-                self.check_direct_text_child(tab_frame).config(font=(family,size))
-
     @staticmethod
     def check_direct_text_child(frame) -> tk.Widget:
         """检查是否有直接的文本子组件"""
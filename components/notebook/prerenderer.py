@@ -0,0 +1,173 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from components.markdown.markdown_parser import MarkdownParser
+from components.markdown.plan_cache import PlanCache, RenderPlan, compact_block
+
+HASH_CHUNK_CHARS = 1 << 20  # 每次计算哈希的字符数
+SPLIT_CHUNK_CHARS = 1 << 20  # 每次分行的字符数
+PARSE_CHECK_BLOCKS = 64  # 解析时每产出这么多块检查一次时间
+
+
+class PlanJob:
+    """
+    可分段执行的渲染计划构建任务
+
+    依次计算内容键、分行、解析，每一步都能在时间片用完时中断并在下次继续。
+    """
+
+    def __init__(self, content: str, parser: MarkdownParser):
+        self.content = content
+        self.parser = parser
+        self.key: Optional[str] = None
+        self.plan: Optional[RenderPlan] = None
+        self._hasher = PlanCache.key_hasher()
+        self._hash_pos = 0
+        self._lines: List[str] = []
+        self._split_pos = 0
+        self._blocks: List[dict] = []
+        self._blocks_iter = None
+
+    def step(self, deadline: float, plan_cache: PlanCache) -> bool:
+        """执行到 deadline（perf_counter 时间）为止，完成时返回 True"""
+        content = self.content
+        while self.key is None:
+            end = self._hash_pos + HASH_CHUNK_CHARS
+            self._hasher.update(content[self._hash_pos:end].encode("utf-8"))
+            self._hash_pos = end
+            if self._hash_pos >= len(content):
+                self.key = self._hasher.hexdigest()
+                self.plan = plan_cache.get(content, self.key)
+                if self.plan is not None:
+                    return True  # 已解析过相同内容
+            if time.perf_counter() >= deadline:
+                return False
+
+        while self._split_pos is not None:
+            # 在换行处切分，与 content.split('\n') 结果相同
+            end = content.find('\n', self._split_pos + SPLIT_CHUNK_CHARS)
+            if end < 0:
+                self._lines.extend(content[self._split_pos:].split('\n'))
+                self._split_pos = None
+                self._blocks_iter = self.parser.iter_blocks(self._lines)
+            else:
+                self._lines.extend(content[self._split_pos:end].split('\n'))
+                self._split_pos = end + 1
+            if time.perf_counter() >= deadline:
+                return False
+
+        for count, block in enumerate(self._blocks_iter, 1):
+            self._blocks.append(compact_block(block))
+            if count % PARSE_CHECK_BLOCKS == 0 and time.perf_counter() >= deadline:
+                return False
+        self.plan = (len(self._lines), self._blocks)
+        plan_cache.put(content, self.plan, self.key)
+        return True
+
+
+class IdlePreRenderer:
+    """
+    后台标签页的空闲预渲染
+
+    记录标签页的最近使用顺序，空闲时按时间片为最近使用的几个后台标签页构建渲染计划；
+    切换到这些标签页时直接使用已有的计划，无需在切换时解析。
+    """
+
+    MAX_TABS = 4  # 预渲染的后台标签页数
+    IDLE_DELAY = 300  # 最后一次活动之后开始预渲染的延迟（毫秒）
+    SLICE_BUDGET = 0.008  # 每个时间片的预算（秒）
+    SLICE_INTERVAL = 15  # 两个时间片之间的间隔（毫秒），期间处理用户输入
+
+    def __init__(self, root, plan_cache: PlanCache,
+                 get_candidates: Callable[[List[str]], Iterable[Tuple[str, str]]],
+                 is_busy: Callable[[], bool] = lambda: False):
+        """
+        Args:
+            get_candidates: 按最近使用顺序给出的标签名列表 -> 可预渲染的 (标签名, 内容)
+            is_busy: 返回 True 时推迟预渲染（如当前标签页的渲染正在等待）
+        """
+        self.root = root
+        self.plan_cache = plan_cache
+        self.parser = MarkdownParser()
+        self.get_candidates = get_candidates
+        self.is_busy = is_busy
+        self._recent: "OrderedDict[str, None]" = OrderedDict()  # 最近使用的标签页，最近的在末尾
+        self._plans: Dict[str, Tuple[str, str, RenderPlan]] = {}  # {标签名: (内容, 内容键, 计划)}
+        self._job: Optional[Tuple[str, PlanJob]] = None
+        self._after_id = None
+
+    def touch(self, tab_name: str) -> None:
+        """记录标签页被使用，并在空闲时重新开始预渲染"""
+        self._recent[tab_name] = None
+        self._recent.move_to_end(tab_name)
+        self.schedule()
+
+    def forget(self, tab_name: str) -> None:
+        """丢弃标签页的全部记录（标签页关闭时调用）"""
+        self._recent.pop(tab_name, None)
+        self._plans.pop(tab_name, None)
+        if self._job is not None and self._job[0] == tab_name:
+            self._job = None
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        """标签页改名后沿用其记录（保持最近使用顺序）"""
+        if old_name in self._recent:
+            self._recent = OrderedDict(
+                (new_name if name == old_name else name, None) for name in self._recent
+            )
+        if old_name in self._plans:
+            self._plans[new_name] = self._plans.pop(old_name)
+        if self._job is not None and self._job[0] == old_name:
+            self._job = (new_name, self._job[1])
+
+    def plan_for(self, tab_name: str, content: str) -> Optional[Tuple[str, RenderPlan]]:
+        """标签页当前内容的已就绪计划 (内容键, 计划)，没有或内容已变化时返回 None"""
+        entry = self._plans.get(tab_name)
+        if entry is None or entry[0] is not content:
+            return None
+        return entry[1], entry[2]
+
+    def schedule(self) -> None:
+        """(重新) 开始空闲计时"""
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(self.IDLE_DELAY, self._run_slice)
+
+    def cancel(self) -> None:
+        if self._after_id:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _next_job(self) -> Optional[Tuple[str, PlanJob]]:
+        """选出最近使用且计划尚未就绪的后台标签页"""
+        recent = list(reversed(self._recent))
+        candidates = list(self.get_candidates(recent))[:self.MAX_TABS]
+        wanted = {tab_name for tab_name, _ in candidates}
+        # 只为最近使用的几个标签页保留计划
+        for tab_name in [name for name in self._plans if name not in wanted]:
+            del self._plans[tab_name]
+        if self._job is not None:
+            tab_name, job = self._job
+            if any(name == tab_name and content is job.content for name, content in candidates):
+                return self._job  # 继续尚未完成的任务
+        for tab_name, content in candidates:
+            entry = self._plans.get(tab_name)
+            if entry is None or entry[0] is not content:
+                return tab_name, PlanJob(content, self.parser)
+        return None
+
+    def _run_slice(self) -> None:
+        self._after_id = None
+        if self.is_busy():
+            self.schedule()
+            return
+        self._job = self._next_job()
+        if self._job is None:
+            return
+        tab_name, job = self._job
+        done = job.step(time.perf_counter() + self.SLICE_BUDGET, self.plan_cache)
+        if done:
+            self._plans[tab_name] = (job.content, job.key, job.plan)
+            self._job = None
+        self._after_id = self.root.after(self.SLICE_INTERVAL, self._run_slice)
@@ -0,0 +1,157 @@
+import tkinter as tk
+from tkinter import ttk
+
+from components.outline.outline_index import OutlineIndex
+from core.component_basic import ComponentBasic
+from core.component_manager import ComponentManager
+
+
+class ComponentOutline(ComponentBasic):
+    """侧边栏大纲导航组件"""
+    def __init__(self, manager: ComponentManager):
+        super().__init__(
+            name="component_outline",
+            manager=manager
+        )
+        self.tree = None
+        self.active_text = None  # 当前显示大纲的文本组件
+        self._indexes = {}  # 每个文本组件的大纲索引 {text_widget: OutlineIndex}
+        self._refresh_id = None  # 防抖定时器ID
+        self._refresh_delay = 150  # 大纲刷新防抖延迟（毫秒）
+
+        self._init_outline()
+
+    def _init_outline(self) -> None:
+        """初始化大纲树"""
+        container = self.get_container()
+        frame = tk.Frame(container)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        tk.Label(frame, text="大纲", anchor=tk.W, padx=5).pack(fill=tk.X)
+
+        scrollbar = tk.Scrollbar(frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(frame, show="tree", selectmode="browse", yscrollcommand=scrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.tree.yview)
+        self.widget = frame
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_item_selected)
+
+        # 订阅事件
+        self.manager.subscribe("text_edited", self._on_text_edited)
+        self.manager.subscribe("tab_switched", self._on_tab_switched)
+        self.manager.subscribe("tab_closing", self._on_tab_closing)
+        self.manager.subscribe("outline.next_section", self.jump_to_next_section)
+        self.manager.subscribe("outline.previous_section", self.jump_to_previous_section)
+
+    def get_layout_section(self) -> str:
+        return "right_sidebar_section"
+
+    def get_index(self, text_widget: tk.Text) -> OutlineIndex:
+        """获取文本组件对应的大纲索引，不存在时从全文构建"""
+        index = self._indexes.get(text_widget)
+        if index is None:
+            index = OutlineIndex()
+            index.rebuild(text_widget.get("1.0", "end-1c").split('\n'))
+            self._indexes[text_widget] = index
+        return index
+
+    def _on_text_edited(self, text_widget: tk.Text, edit) -> None:
+        """根据增量编辑更新对应文本组件的大纲索引"""
+        index = self._indexes.get(text_widget)
+        if index is None:
+            # 首次编辑时全量构建，之后的编辑都走增量路径
+            self.get_index(text_widget)
+            changed = True
+        else:
+            changed = index.apply_edit(
+                edit.start_line, edit.old_end_line, edit.new_end_line,
+                lambda start, end: self._get_lines(text_widget, start, end)
+            )
+        if changed and text_widget is self.active_text:
+            self._schedule_refresh()
+
+    @staticmethod
+    def _get_lines(text_widget: tk.Text, start: int, end) -> list:
+        """读取指定行范围的文本"""
+        end_index = f"{end}.end" if end is not None else "end-1c"
+        return text_widget.get(f"{start}.0", end_index).split('\n')
+
+    def _on_tab_switched(self, new_tab_frame: tk.Frame) -> None:
+        """标签页切换时显示对应文档的大纲"""
+        text_area_component = self.manager.get_component("text_area")
+        self.active_text = text_area_component.check_direct_text_child(new_tab_frame) if text_area_component else None
+        self._refresh_tree()
+
+    def _on_tab_closing(self, tab_name: str, tab_frame: tk.Frame) -> None:
+        """标签页关闭时丢弃其大纲索引"""
+        text_area_component = self.manager.get_component("text_area")
+        text_widget = text_area_component.check_direct_text_child(tab_frame) if text_area_component else None
+        self._indexes.pop(text_widget, None)
+        if text_widget is not None and text_widget is self.active_text:
+            self.active_text = None
+            self._refresh_tree()
+
+    def _schedule_refresh(self) -> None:
+        """防抖刷新大纲树"""
+        if self._refresh_id:
+            self.manager.root.after_cancel(self._refresh_id)
+        self._refresh_id = self.manager.root.after(self._refresh_delay, self._refresh_tree)
+
+    def _refresh_tree(self) -> None:
+        """根据索引重建大纲树"""
+        self._refresh_id = None
+        self.tree.delete(*self.tree.get_children())
+        if not self.active_text:
+            return
+
+        # 以条目序号作为树节点ID，点击时再从索引取行号，行号平移无需刷新树
+        parents = {}
+        for position, entry in enumerate(self.get_index(self.active_text).headings()):
+            parent = ""
+            for level in range(entry.level - 1, 0, -1):
+                if level in parents:
+                    parent = parents[level]
+                    break
+            item = self.tree.insert(parent, tk.END, iid=str(position), text=entry.text, open=True)
+            parents[entry.level] = item
+            # 清除更深层级的父节点，避免后续标题挂到上一章节下
+            for level in list(parents):
+                if level > entry.level:
+                    del parents[level]
+
+    def _on_item_selected(self, event=None) -> None:
+        """跳转到选中的章节"""
+        selection = self.tree.selection()
+        if not selection or not self.active_text:
+            return
+        entry = self.get_index(self.active_text).entry_at(int(selection[0]))
+        if entry:
+            self.jump_to_line(entry.line)
+
+    def jump_to_line(self, line: int) -> None:
+        """将光标移动到指定行并滚动到顶部"""
+        text_widget = self.active_text
+        position = f"{line}.0"
+        text_widget.mark_set(tk.INSERT, position)
+        text_widget.yview(position)
+        text_widget.focus_set()
+        self.manager.publish("text_cursor_moved", line=line, column=1)
+
+    def jump_to_next_section(self) -> None:
+        """跳转到下一个章节"""
+        self._jump_relative(forward=True)
+
+    def jump_to_previous_section(self) -> None:
+        """跳转到上一个章节"""
+        self._jump_relative(forward=False)
+
+    def _jump_relative(self, forward: bool) -> None:
+        if not self.active_text:
+            return
+        line = int(self.active_text.index(tk.INSERT).split('.')[0])
+        index = self.get_index(self.active_text)
+        entry = index.next_heading(line) if forward else index.previous_heading(line)
+        if entry:
+            self.jump_to_line(entry.line)
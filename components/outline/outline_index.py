@@ -0,0 +1,149 @@
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+HEADER_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+
+
+@dataclass
+class OutlineEntry:
+    """大纲条目"""
+    line: int  # 源文本行号（从1开始，与 tk.Text 一致）
+    level: int
+    text: str
+
+
+def is_fence_line(line: str) -> bool:
+    """检查是否为代码块围栏行"""
+    return line.strip().startswith('```')
+
+
+class OutlineIndex:
+    """标题大纲索引 - 按行号有序维护 #~###### 标题，支持增量更新"""
+
+    def __init__(self):
+        self._lines: List[int] = []          # 标题所在行号（有序）
+        self._entries: List[OutlineEntry] = []
+        self._fences: List[int] = []         # 代码块围栏所在行号（有序）
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def rebuild(self, lines: List[str]) -> None:
+        """根据全部文本行重建索引"""
+        self._lines = []
+        self._entries = []
+        self._fences = []
+        in_fence = False
+        for line_no, line in enumerate(lines, start=1):
+            if is_fence_line(line):
+                self._fences.append(line_no)
+                in_fence = not in_fence
+                continue
+            if in_fence:
+                continue
+            entry = self._parse_entry(line_no, line)
+            if entry:
+                self._lines.append(line_no)
+                self._entries.append(entry)
+
+    def apply_edit(self, start_line: int, old_end_line: int, new_end_line: int,
+                   get_lines: Callable[[int, int], List[str]]) -> bool:
+        """
+        根据一次编辑增量更新索引
+
+        Args:
+            start_line: 编辑起始行
+            old_end_line: 编辑前受影响的最后一行
+            new_end_line: 编辑后受影响的最后一行
+            get_lines: 按 (起始行, 结束行) 读取编辑后文本行的回调，结束行为 None 表示直到末尾
+
+        Returns:
+            bool: 标题的层级或文本是否发生变化（仅行号平移不算变化）
+        """
+        delta = new_end_line - old_end_line
+        new_lines = get_lines(start_line, new_end_line)
+
+        # 受影响区域内的围栏数量变化时，后续所有行的代码块状态都可能翻转，直接重建
+        fence_lo = bisect_left(self._fences, start_line)
+        fence_hi = bisect_right(self._fences, old_end_line)
+        new_fences = [start_line + i for i, line in enumerate(new_lines) if is_fence_line(line)]
+        if fence_hi - fence_lo != len(new_fences):
+            old_headings = [(e.level, e.text) for e in self._entries]
+            self.rebuild(get_lines(1, None))
+            return old_headings != [(e.level, e.text) for e in self._entries]
+        self._fences[fence_lo:fence_hi] = new_fences
+        if delta:
+            for i in range(fence_lo + len(new_fences), len(self._fences)):
+                self._fences[i] += delta
+
+        lo = bisect_left(self._lines, start_line)
+        hi = bisect_right(self._lines, old_end_line)
+        old_entries = self._entries[lo:hi]
+
+        added = []
+        for offset, line in enumerate(new_lines):
+            line_no = start_line + offset
+            if is_fence_line(line) or self.in_code_fence(line_no):
+                continue
+            entry = self._parse_entry(line_no, line)
+            if entry:
+                added.append(entry)
+
+        self._entries[lo:hi] = added
+        self._lines[lo:hi] = [entry.line for entry in added]
+        if delta:
+            for i in range(lo + len(added), len(self._lines)):
+                self._lines[i] += delta
+                self._entries[i].line += delta
+
+        return [(e.level, e.text) for e in old_entries] != [(e.level, e.text) for e in added]
+
+    def in_code_fence(self, line_no: int) -> bool:
+        """判断某行是否位于代码块内部 - O(log n)"""
+        return bisect_left(self._fences, line_no) % 2 == 1
+
+    def entry_at(self, position: int) -> Optional[OutlineEntry]:
+        """按序号获取标题条目"""
+        if 0 <= position < len(self._entries):
+            return self._entries[position]
+        return None
+
+    def headings(self) -> List[OutlineEntry]:
+        """获取全部标题条目（按行号排序）"""
+        return list(self._entries)
+
+    def section_at(self, line_no: int) -> Optional[OutlineEntry]:
+        """获取某行所属的章节标题 - O(log n)"""
+        i = bisect_right(self._lines, line_no) - 1
+        return self._entries[i] if i >= 0 else None
+
+    def next_heading(self, line_no: int) -> Optional[OutlineEntry]:
+        """获取某行之后的下一个标题 - O(log n)"""
+        i = bisect_right(self._lines, line_no)
+        return self._entries[i] if i < len(self._entries) else None
+
+    def previous_heading(self, line_no: int) -> Optional[OutlineEntry]:
+        """获取某行之前的上一个标题 - O(log n)"""
+        i = bisect_left(self._lines, line_no) - 1
+        return self._entries[i] if i >= 0 else None
+
+    def section_range(self, line_no: int) -> Optional[tuple[int, Optional[int]]]:
+        """获取某行所属章节的行范围 (起始行, 结束行)，结束行为 None 表示直到文档末尾"""
+        i = bisect_right(self._lines, line_no) - 1
+        if i < 0:
+            return None
+        level = self._entries[i].level
+        for entry in self._entries[i + 1:]:
+            if entry.level <= level:
+                return self._entries[i].line, entry.line - 1
+        return self._entries[i].line, None
+
+    @staticmethod
+    def _parse_entry(line_no: int, line: str) -> Optional[OutlineEntry]:
+        """解析单行标题"""
+        match = HEADER_PATTERN.match(line)
+        if match:
+            return OutlineEntry(line_no, len(match.group(1)), match.group(2).strip())
+        return None
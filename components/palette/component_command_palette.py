@@ -0,0 +1,175 @@
+import tkinter as tk
+from typing import Callable, Iterable, List, NamedTuple, Optional
+
+from components.palette.fuzzy_matcher import FuzzyMatcher
+from components.toolbar.menu_manager import item_action_id
+from core.component_basic import ComponentBasic
+from core.component_manager import ComponentManager
+
+
+class PaletteEntry(NamedTuple):
+    label: str  # 显示并参与匹配的文本，如 "编辑: 查找"
+    detail: str  # 附加说明（快捷键等），只显示不参与匹配
+    callback: Callable
+
+
+PaletteProvider = Callable[[], Iterable[PaletteEntry]]
+
+
+class ComponentCommandPalette(ComponentBasic):
+    """
+    命令面板组件（Ctrl+Shift+P）
+
+    打开时从各提供者收集条目（菜单动作、字体、已打开的标签页，其他组件可追加），
+    输入时由增量模糊匹配器过滤排序，选中后执行。
+    """
+
+    MAX_RESULTS = 50
+    LIST_HEIGHT = 14
+
+    def __init__(self, manager: ComponentManager, menu_manager, font_manager):
+        super().__init__(
+            name="component_command_palette",
+            manager=manager
+        )
+        self.menu_manager = menu_manager
+        self.font_manager = font_manager
+        self.dialog = None
+        self.query_var = None
+        self.entry = None
+        self.result_list = None
+
+        self.entries: List[PaletteEntry] = []
+        self.matcher: Optional[FuzzyMatcher] = None
+        self.results: List[int] = []  # 当前列表中各行对应的条目序号
+        self._providers: List[PaletteProvider] = [
+            self._menu_entries, self._tab_entries, self._font_entries
+        ]
+
+        self.manager.subscribe("view.command_palette", self.show)
+
+    def add_provider(self, provider: PaletteProvider) -> None:
+        """追加条目提供者（每次打开面板时调用）"""
+        self._providers.append(provider)
+
+    # ------------------------------------------------------------ 条目
+
+    def _menu_entries(self) -> Iterable[PaletteEntry]:
+        keymap = self.menu_manager.keymap
+        for menu_name, config in self.menu_manager.menu_registry.items():
+            button_text = config["button"].cget("text")
+            for item in config["items"]:
+                if item["callback"] is None:
+                    continue
+                shortcut = keymap.sequence_for(item_action_id(menu_name, item["name"]))
+                yield PaletteEntry(
+                    f"{button_text}: {item['name']}",
+                    self.menu_manager.format_shortcut(shortcut) if shortcut else "",
+                    item["callback"]
+                )
+
+    def _tab_entries(self) -> Iterable[PaletteEntry]:
+        notebook = self.manager.get_component("component_notebook")
+        text_editor = self.manager.get_component("text_editor")
+        for tab_name in list(notebook._tabs):
+            path = text_editor.get_file_path_for_tab(tab_name) if text_editor else None
+            yield PaletteEntry(
+                f"标签页: {tab_name}",
+                path or "",
+                lambda tab_name=tab_name: notebook.switch_tab_by_name(tab_name)
+            )
+
+    def _font_entries(self) -> Iterable[PaletteEntry]:
+        current_family, _ = self.font_manager.get_current_font()
+        for family in self.font_manager.get_available_fonts():
+            yield PaletteEntry(
+                f"字体: {family}",
+                "当前" if family == current_family else "",
+                lambda family=family: self.font_manager.set_font(family=family)
+            )
+
+    # ------------------------------------------------------------ 面板
+
+    def _create_dialog(self) -> None:
+        """创建命令面板"""
+        root = self.manager.root
+        self.dialog = tk.Toplevel(root)
+        self.dialog.title("命令面板")
+        self.dialog.transient(root)
+        self.dialog.resizable(False, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.hide)
+        self.widget = self.dialog
+
+        self.query_var = tk.StringVar(self.dialog)
+        self.entry = tk.Entry(self.dialog, textvariable=self.query_var, width=60)
+        self.entry.pack(fill=tk.X, padx=5, pady=5)
+        self.result_list = tk.Listbox(self.dialog, height=self.LIST_HEIGHT, activestyle=tk.NONE,
+                                      exportselection=False)
+        self.result_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+
+        self.query_var.trace_add("write", lambda *args: self._update_results())
+        self.entry.bind("<Down>", lambda e: self._move_selection(1))
+        self.entry.bind("<Up>", lambda e: self._move_selection(-1))
+        self.entry.bind("<Return>", lambda e: self.execute_selected())
+        self.result_list.bind("<Double-Button-1>", lambda e: self.execute_selected())
+        self.dialog.bind("<Escape>", lambda e: self.hide())
+
+    def show(self) -> None:
+        """打开命令面板，重新收集条目"""
+        if self.dialog is None:
+            self._create_dialog()
+        self.entries = [entry for provider in self._providers for entry in provider()]
+        self.matcher = FuzzyMatcher([entry.label for entry in self.entries])
+
+        root = self.manager.root
+        x = root.winfo_rootx() + max((root.winfo_width() - 480) // 2, 0)
+        y = root.winfo_rooty() + 40
+        self.dialog.geometry(f"+{x}+{y}")
+        self.dialog.deiconify()
+        self.dialog.lift()
+        self.entry.focus_set()
+        if self.query_var.get():
+            self.query_var.set("")  # 触发 _update_results
+        else:
+            self._update_results()
+
+    def hide(self) -> None:
+        if self.dialog is not None:
+            self.dialog.withdraw()
+        self.entries = []
+        self.matcher = None
+        text_area_component = self.manager.get_component("text_area")
+        if text_area_component and text_area_component.text_area is not None:
+            text_area_component.text_area.focus_set()
+
+    def _update_results(self) -> None:
+        """按当前查询过滤并刷新列表"""
+        if self.matcher is None:
+            return
+        self.results = self.matcher.match(self.query_var.get(), self.MAX_RESULTS)
+        self.result_list.delete(0, tk.END)
+        for i in self.results:
+            entry = self.entries[i]
+            self.result_list.insert(tk.END, f"{entry.label}    {entry.detail}" if entry.detail else entry.label)
+        if self.results:
+            self.result_list.selection_set(0)
+            self.result_list.see(0)
+
+    def _move_selection(self, step: int) -> str:
+        if self.results:
+            selection = self.result_list.curselection()
+            current = selection[0] if selection else 0
+            new = min(max(current + step, 0), len(self.results) - 1)
+            self.result_list.selection_clear(0, tk.END)
+            self.result_list.selection_set(new)
+            self.result_list.see(new)
+        return "break"
+
+    def execute_selected(self) -> None:
+        """关闭面板并执行选中的条目"""
+        selection = self.result_list.curselection()
+        if not selection or selection[0] >= len(self.results):
+            return
+        callback = self.entries[self.results[selection[0]]].callback
+        self.hide()
+        callback()
@@ -0,0 +1,93 @@
+import heapq
+import re
+from typing import List, Optional, Sequence, Tuple
+
+# 这些字符之后的位置视为词首，匹配在词首时加分
+WORD_SEPARATORS = frozenset(" _-:./\\")
+
+
+def compile_query(query: str) -> "re.Pattern":
+    """
+    把查询编译为子序列匹配的正则（如 "abc" -> "[^a]*a[^b]*b[^c]*c"），用 match 从头匹配，过滤在 C 层完成
+
+    每段只匹配到下一个查询字符第一次出现的位置，失败时不会像 "a.*?b.*?c" 那样在各段之间
+    反复回溯（后者在不匹配的长文本上耗时随查询长度呈指数增长）。
+    """
+    return re.compile("".join(f"[^{re.escape(ch)}]*{re.escape(ch)}" for ch in query))
+
+
+def fuzzy_score(query: str, text: str) -> Optional[int]:
+    """
+    计算查询对候选文本的匹配得分（两者均已转为小写）
+
+    查询的字符需按顺序出现在文本中；连续匹配、词首匹配与整段子串匹配加分，
+    跳过的字符扣分。不匹配时返回 None。
+    """
+    substring = text.find(query)
+    if substring >= 0:
+        # 整段出现：越靠前、越在词首得分越高
+        at_word_start = substring == 0 or text[substring - 1] in WORD_SEPARATORS
+        return 1000 + 10 * len(query) + (50 if at_word_start else 0) - substring - len(text) // 8
+
+    score = 0
+    position = -1
+    for ch in query:
+        found = text.find(ch, position + 1)
+        if found < 0:
+            return None
+        if found == position + 1:
+            score += 15  # 与上一个字符连续
+        else:
+            score -= min(found - position - 1, 10)  # 跳过的字符
+        if found == 0 or text[found - 1] in WORD_SEPARATORS:
+            score += 20
+        position = found
+    return score - len(text) // 8
+
+
+class FuzzyMatcher:
+    """
+    增量模糊匹配器
+
+    查询变长时只在上一个查询的匹配结果中继续过滤（子序列匹配的结果随查询变长单调缩小）；
+    删除字符时回退到仍是当前查询前缀的历史结果，因此连续输入时每次只需检查少量候选。
+    """
+
+    def __init__(self, candidates: Sequence[str]):
+        self._keys = [candidate.lower() for candidate in candidates]
+        self._history: List[Tuple[str, List[int]]] = []  # 查询前缀链 [(查询, 匹配的候选序号)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def match(self, query: str, limit: int = 50) -> List[int]:
+        """
+        返回得分最高的候选序号（按得分从高到低，同分时按候选顺序）
+
+        查询中的空白被忽略；查询为空时按原顺序返回前 limit 个候选。
+        """
+        query = "".join(query.split()).lower()
+        if not query:
+            self._history.clear()
+            return list(range(min(limit, len(self._keys))))
+
+        while self._history and not query.startswith(self._history[-1][0]):
+            self._history.pop()
+        if self._history and self._history[-1][0] == query:
+            matched = self._history[-1][1]
+        else:
+            pool = self._history[-1][1] if self._history else range(len(self._keys))
+            pattern = compile_query(query)
+            keys = self._keys
+            matched = [i for i in pool if pattern.match(keys[i])]
+            self._history.append((query, matched))
+
+        # 整段包含查询的候选得分总是更高；它们已足够填满结果时，其余候选无需逐字符评分
+        keys = self._keys
+        contiguous = [i for i in matched if query in keys[i]]
+        candidates = contiguous if len(contiguous) >= limit else matched
+        ranked = heapq.nlargest(
+            limit,
+            ((fuzzy_score(query, keys[i]), -i) for i in candidates)
+        )
+        return [-negative_index for _, negative_index in ranked]
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+import tkinter as tk
+from tkinter import filedialog
+from typing import List, Optional
+
+from components.project_search.project_index import ProjectIndex, SearchHit
+from core.component_basic import ComponentBasic
+from core.component_manager import ComponentManager
+
+
+class ComponentProjectSearch(ComponentBasic):
+    """
+    侧边栏项目搜索组件
+
+    对所选目录维护磁盘上的倒排索引；索引在后台线程中按文件 mtime 增量更新，
+    查询只读内存中的倒排表，结果双击后在标签页中打开并跳转到对应行。
+    """
+
+    POLL_INTERVAL = 50  # 轮询后台索引线程的间隔（毫秒）
+    QUERY_DELAY = 120  # 输入查询后的防抖延迟（毫秒）
+    REFRESH_INTERVAL = 2.0  # 两次查询之间超过该秒数时重新检查文件变化
+    MAX_RESULTS = 200
+
+    def __init__(self, manager: ComponentManager):
+        super().__init__(
+            name="component_project_search",
+            manager=manager
+        )
+        self.index: Optional[ProjectIndex] = None
+        self.hits: List[SearchHit] = []
+        self._worker: Optional[threading.Thread] = None
+        self._worker_result: Optional[list] = None  # 当前线程的结果槽：[(重新索引数, 移除数) 或异常]
+        self._last_update = 0.0
+        self._poll_id = None
+        self._query_id = None
+        self._query_pending = False  # 索引更新期间推迟的查询
+
+        self._init_panel()
+        self.manager.subscribe("project.search", self.focus_search)
+
+    def get_layout_section(self) -> str:
+        return "sidebar_section"
+
+    def _init_panel(self) -> None:
+        """初始化搜索面板"""
+        container = self.get_container()
+        frame = tk.Frame(container)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        header = tk.Frame(frame)
+        header.pack(fill=tk.X)
+        tk.Label(header, text="项目搜索", anchor=tk.W, padx=5).pack(side=tk.LEFT)
+        tk.Button(header, text="选择目录", command=self.choose_directory).pack(side=tk.RIGHT)
+
+        self.query_var = tk.StringVar(frame)
+        self.entry = tk.Entry(frame, textvariable=self.query_var)
+        self.entry.pack(fill=tk.X, padx=2, pady=2)
+        self.status_label = tk.Label(frame, text="未选择目录", anchor=tk.W, fg="#6a737d", padx=5)
+        self.status_label.pack(fill=tk.X)
+
+        scrollbar = tk.Scrollbar(frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.result_list = tk.Listbox(frame, activestyle="none", yscrollcommand=scrollbar.set)
+        self.result_list.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.result_list.yview)
+        self.widget = frame
+
+        self.query_var.trace_add("write", lambda *args: self._schedule_query())
+        self.entry.bind("<Return>", lambda e: self.open_result(0))
+        self.entry.bind("<Down>", lambda e: self._focus_results())
+        self.result_list.bind("<Double-Button-1>", lambda e: self._open_selected())
+        self.result_list.bind("<Return>", lambda e: self._open_selected())
+
+    def _set_status(self, text: str) -> None:
+        self.status_label.config(text=text)
+
+    # ------------------------------------------------------------ 索引
+
+    def focus_search(self) -> None:
+        """聚焦查询输入框（尚未选择目录时先选择目录）"""
+        if self.index is None and not self.choose_directory():
+            return
+        self.entry.focus_set()
+        self.entry.select_range(0, tk.END)
+
+    def choose_directory(self) -> bool:
+        """选择项目目录，返回是否已选择"""
+        initial = None
+        text_editor = self.manager.get_component("text_editor")
+        current_file = text_editor.get_current_tab_file_path() if text_editor else None
+        if current_file:
+            initial = os.path.dirname(current_file)
+        directory = filedialog.askdirectory(title="选择项目目录", initialdir=initial)
+        if not directory:
+            return False
+        self.set_directory(directory)
+        return True
+
+    def set_directory(self, directory: str) -> None:
+        """切换项目目录：先读取磁盘上的索引供立即查询，再在后台同步文件变化"""
+        # 旧目录的更新只写入旧索引，直接放弃即可，不在主线程上等待它结束
+        if self._poll_id:
+            self.manager.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._worker = None
+        self.index = ProjectIndex(directory)
+        self.index.load()
+        self._set_status(f"{self.index.root_dir}（{len(self.index.files)} 个文件）")
+        self._start_update()
+        self._run_query()
+
+    def _start_update(self) -> None:
+        """在后台线程中按 mtime 增量更新索引"""
+        if self.index is None or self._worker is not None:
+            return
+        index = self.index
+        outcome = [None]  # 每个线程各自的结果槽，被放弃的旧线程不会覆盖新线程的结果
+
+        def update():
+            try:
+                outcome[0] = index.update()
+                if any(outcome[0]):
+                    index.save()
+            except Exception as e:  # 线程内的异常交给主线程报告
+                outcome[0] = e
+
+        self._worker_result = outcome
+        self._worker = threading.Thread(target=update, daemon=True)
+        self._worker.start()
+        self._poll_id = self.manager.root.after(self.POLL_INTERVAL, self._poll_update)
+
+    def _poll_update(self) -> None:
+        self._poll_id = None
+        if self._worker is None:
+            return
+        if self._worker.is_alive():
+            self._poll_id = self.manager.root.after(self.POLL_INTERVAL, self._poll_update)
+            return
+        self._worker = None
+        self._last_update = time.monotonic()
+        result = self._worker_result[0]
+        if isinstance(result, Exception):
+            self._set_status(f"索引失败: {result}")
+            return
+        self._set_status(f"{self.index.root_dir}（{len(self.index.files)} 个文件）")
+        if self._query_pending or (result and any(result)):
+            # 补上更新期间推迟的查询，或文件有变化时用新索引重新查询
+            self._run_query()
+
+    # ------------------------------------------------------------ 查询
+
+    def _schedule_query(self) -> None:
+        if self._query_id:
+            self.manager.root.after_cancel(self._query_id)
+        self._query_id = self.manager.root.after(self.QUERY_DELAY, self._run_query)
+
+    def _run_query(self) -> None:
+        """查询倒排索引并刷新结果列表（索引更新期间等待其完成后再查询）"""
+        self._query_id = None
+        if self.index is None:
+            return
+        if self._worker is not None:
+            self._query_pending = True  # 后台更新完成后再查询
+            return
+        self._query_pending = False
+        query = self.query_var.get()
+        self.hits = self.index.search(query, self.MAX_RESULTS) if query.strip() else []
+
+        self.result_list.delete(0, tk.END)
+        if self.hits:
+            root_dir = self.index.root_dir
+            self.result_list.insert(tk.END, *(
+                f"{os.path.relpath(path, root_dir)}:{line}  {text.strip()}"
+                for path, line, text in self.hits
+            ))
+        if query.strip():
+            more = "+" if len(self.hits) >= self.MAX_RESULTS else ""
+            self._set_status(f"{len(self.hits)}{more} 处结果")
+
+        # 距上次检查文件变化已有一段时间，顺便在后台同步一次
+        if time.monotonic() - self._last_update > self.REFRESH_INTERVAL:
+            self._start_update()
+
+    def _focus_results(self) -> None:
+        if self.hits:
+            self.result_list.focus_set()
+            self.result_list.selection_clear(0, tk.END)
+            self.result_list.selection_set(0)
+            self.result_list.activate(0)
+
+    def _open_selected(self) -> None:
+        selection = self.result_list.curselection()
+        if selection:
+            self.open_result(selection[0])
+
+    def open_result(self, position: int) -> None:
+        """在标签页中打开结果并跳转到匹配行"""
+        if not 0 <= position < len(self.hits):
+            return
+        path, line, _ = self.hits[position]
+        text_editor = self.manager.get_component("text_editor")
+        notebook = self.manager.get_component("component_notebook")
+        if not text_editor or not notebook:
+            return
+        # 文件已在某个标签页中打开时直接切换，避免覆盖未保存的修改
+        for tab_name, tab_path in text_editor.tab_file_paths.items():
+            if tab_path and os.path.abspath(tab_path) == path:
+                notebook.switch_tab_by_name(tab_name)
+                self.manager.root.after_idle(lambda: text_editor.goto_line(line))
+                return
+        text_editor.open_file(path, line=line)
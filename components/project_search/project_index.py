@@ -0,0 +1,242 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils.app_dirs import get_cache_dir
+
+# 索引结构变化时递增，使磁盘上的旧索引失效
+INDEX_VERSION = 1
+
+INDEXED_EXTENSIONS = (".md", ".markdown", ".txt")
+SKIPPED_DIRS = {".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv"}
+
+# 词元：连续的字母数字下划线，或单个中日韩字符
+TOKEN_PATTERN = re.compile(r"[0-9a-z_]+|[぀-ヿ㐀-鿿豈-﫿]")
+CJK_PATTERN = re.compile(r"[぀-ヿ㐀-鿿豈-﫿]")
+
+SearchHit = Tuple[str, int, str]  # (文件路径, 行号, 行文本)
+
+
+def tokenize(text: str) -> List[str]:
+    """将文本切分为小写词元"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class ProjectIndex:
+    """
+    项目目录的倒排索引 - 词元 -> {文件ID: [行号]}
+
+    按文件 mtime/大小增量更新，只重新索引变化的文件；索引保存在缓存目录中。
+    """
+
+    def __init__(self, root_dir: str, index_path: Optional[str] = None):
+        self.root_dir = os.path.abspath(root_dir)
+        self.index_path = index_path or self.default_index_path(self.root_dir)
+        self.postings: Dict[str, Dict[int, List[int]]] = {}
+        self.files: Dict[int, Tuple[str, int, int]] = {}  # {文件ID: (相对路径, mtime_ns, 大小)}
+        self.file_tokens: Dict[int, List[str]] = {}  # {文件ID: 该文件出现过的词元}，删除文件时使用
+        self._path_ids: Dict[str, int] = {}
+        self._next_id = 0
+        self._sorted_tokens: Optional[List[str]] = None  # 前缀查询用的有序词元表（按需重建）
+
+    @staticmethod
+    def default_index_path(root_dir: str) -> str:
+        digest = hashlib.blake2b(root_dir.encode("utf-8"), digest_size=8).hexdigest()
+        return os.path.join(get_cache_dir(), "project_index", f"{digest}.pickle")
+
+    # ------------------------------------------------------------ 持久化
+
+    def load(self) -> bool:
+        """读取磁盘上的索引，不存在或版本不符时返回 False"""
+        try:
+            with open(self.index_path, "rb") as file:
+                data = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION or data.get("root") != self.root_dir:
+            return False
+        self.postings = data["postings"]
+        self.files = data["files"]
+        self.file_tokens = data["file_tokens"]
+        self._path_ids = {path: file_id for file_id, (path, _, _) in self.files.items()}
+        self._next_id = max(self.files, default=-1) + 1
+        self._sorted_tokens = None
+        return True
+
+    def save(self) -> None:
+        """原子地写入索引"""
+        data = {
+            "version": INDEX_VERSION,
+            "root": self.root_dir,
+            "postings": self.postings,
+            "files": self.files,
+            "file_tokens": self.file_tokens,
+        }
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"  # 放弃的旧线程可能仍在写同一索引
+        try:
+            with open(tmp_path, "wb") as file:
+                pickle.dump(data, file, protocol=5)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.error(f"保存项目索引失败: {e}")
+
+    # ------------------------------------------------------------ 增量更新
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """遍历目录，返回 {相对路径: (mtime_ns, 大小)}"""
+        found = {}
+        stack = [self.root_dir]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIPPED_DIRS and not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.name.lower().endswith(INDEXED_EXTENSIONS):
+                        stat = entry.stat()
+                        rel_path = os.path.relpath(entry.path, self.root_dir)
+                        found[rel_path] = (stat.st_mtime_ns, stat.st_size)
+                except OSError:
+                    continue
+        return found
+
+    def update(self) -> Tuple[int, int]:
+        """
+        按 mtime/大小同步索引
+
+        Returns:
+            (重新索引的文件数, 移除的文件数)
+        """
+        found = self._scan()
+        removed = 0
+        for rel_path in [path for path in self._path_ids if path not in found]:
+            self._remove_file(self._path_ids.pop(rel_path))
+            removed += 1
+
+        indexed = 0
+        for rel_path, (mtime_ns, size) in found.items():
+            file_id = self._path_ids.get(rel_path)
+            if file_id is not None:
+                _, old_mtime, old_size = self.files[file_id]
+                if (old_mtime, old_size) == (mtime_ns, size):
+                    continue
+                self._remove_file(file_id)
+            else:
+                file_id = self._next_id
+                self._next_id += 1
+                self._path_ids[rel_path] = file_id
+            self._index_file(file_id, rel_path, mtime_ns, size)
+            indexed += 1
+
+        if indexed or removed:
+            self._sorted_tokens = None
+        return indexed, removed
+
+    def _index_file(self, file_id: int, rel_path: str, mtime_ns: int, size: int) -> None:
+        self.files[file_id] = (rel_path, mtime_ns, size)
+        file_postings: Dict[str, List[int]] = {}
+        try:
+            with open(os.path.join(self.root_dir, rel_path), "r", encoding="utf-8", errors="replace") as file:
+                for line_no, line in enumerate(file, start=1):
+                    for token in set(tokenize(line)):
+                        file_postings.setdefault(token, []).append(line_no)
+        except OSError as e:
+            logger.warning(f"索引文件失败: {rel_path} - {e}")
+        for token, lines in file_postings.items():
+            self.postings.setdefault(token, {})[file_id] = lines
+        self.file_tokens[file_id] = list(file_postings)
+
+    def _remove_file(self, file_id: int) -> None:
+        for token in self.file_tokens.pop(file_id, []):
+            token_postings = self.postings.get(token)
+            if token_postings is not None:
+                token_postings.pop(file_id, None)
+                if not token_postings:
+                    del self.postings[token]
+        self.files.pop(file_id, None)
+
+    # ------------------------------------------------------------ 查询
+
+    def _prefix_postings(self, prefix: str) -> Dict[int, Set[int]]:
+        """合并所有以 prefix 开头的词元的倒排表"""
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self.postings)
+        merged: Dict[int, Set[int]] = {}
+        position = bisect_left(self._sorted_tokens, prefix)
+        while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(prefix):
+            for file_id, lines in self.postings[self._sorted_tokens[position]].items():
+                merged.setdefault(file_id, set()).update(lines)
+            position += 1
+        return merged
+
+    def search(self, query: str, limit: int = 200) -> List[SearchHit]:
+        """
+        查找同一行内包含全部查询词元的位置（最后一个词元按前缀匹配，便于边输入边查询）
+
+        含中日韩字符的查询会回读候选行，确认整个查询串确实连续出现。
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        candidates: Optional[Dict[int, Set[int]]] = None
+        for position, token in enumerate(tokens):
+            if position == len(tokens) - 1 and not CJK_PATTERN.fullmatch(token):
+                token_postings = self._prefix_postings(token)
+            else:
+                token_postings = {file_id: set(lines) for file_id, lines in self.postings.get(token, {}).items()}
+            if candidates is None:
+                candidates = token_postings
+            else:
+                candidates = {
+                    file_id: lines & token_postings[file_id]
+                    for file_id, lines in candidates.items() if file_id in token_postings
+                }
+                candidates = {file_id: lines for file_id, lines in candidates.items() if lines}
+            if not candidates:
+                return []
+
+        verify = query.strip().lower() if CJK_PATTERN.search(query) else None
+        hits: List[SearchHit] = []
+        for file_id in sorted(candidates, key=lambda fid: self.files[fid][0]):
+            path = os.path.join(self.root_dir, self.files[file_id][0])
+            texts = read_lines(path, candidates[file_id])
+            for line in sorted(candidates[file_id]):
+                text = texts.get(line, "")
+                if verify is not None and verify not in text.lower():
+                    continue
+                hits.append((path, line, text))
+                if len(hits) >= limit:
+                    return hits
+        return hits
+
+
+def read_lines(path: str, lines: Set[int]) -> Dict[int, str]:
+    """一次读取文件中的多行（用于结果预览与校验）"""
+    texts = {}
+    if not lines:
+        return texts
+    last = max(lines)
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            for number, text in enumerate(file, start=1):
+                if number in lines:
+                    texts[number] = text.rstrip("\n")
+                if number >= last:
+                    break
+    except OSError:
+        pass
+    return texts
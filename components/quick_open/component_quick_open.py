@@ -0,0 +1,200 @@
+import os
+import threading
+import tkinter as tk
+from typing import Iterable, List, Optional
+
+from components.palette.component_command_palette import PaletteEntry
+from components.palette.fuzzy_matcher import FuzzyMatcher
+from components.quick_open.path_index import PathIndex
+from core.component_basic import ComponentBasic
+from core.component_manager import ComponentManager
+
+
+class ComponentQuickOpen(ComponentBasic):
+    """
+    快速打开组件（Ctrl+P）
+
+    在后台线程中扫描工作区并维护内存中的路径索引（按目录 mtime 轮询更新），
+    输入时模糊匹配相对路径，选中的文件直接交给编辑器的分块载入流程。
+    工作区为项目搜索所选的目录，未选择时为当前文件所在目录。
+    """
+
+    POLL_INTERVAL = 50  # 轮询后台扫描线程的间隔（毫秒）
+    REFRESH_INTERVAL = 2000  # 面板打开期间重新检查目录变化的间隔（毫秒）
+    MAX_RESULTS = 50
+    LIST_HEIGHT = 14
+
+    def __init__(self, manager: ComponentManager):
+        super().__init__(
+            name="component_quick_open",
+            manager=manager
+        )
+        self.dialog = None
+        self.query_var = None
+        self.entry = None
+        self.result_list = None
+        self.status_label = None
+
+        self.index: Optional[PathIndex] = None
+        self.matcher: Optional[FuzzyMatcher] = None
+        self._matcher_version = -1  # 匹配器对应的索引版本
+        self._paths: List[str] = []  # 匹配器中的路径（与 matcher 的候选序号对应）
+        self.results: List[int] = []
+        self._worker: Optional[threading.Thread] = None
+        self._poll_id = None
+        self._refresh_id = None
+
+        self.manager.subscribe("file.quick_open", self.show)
+        palette = self.manager.get_component("component_command_palette")
+        if palette:
+            palette.add_provider(self._palette_entries)
+
+    # ------------------------------------------------------------ 路径索引
+
+    def _workspace_dir(self) -> str:
+        project_search = self.manager.get_component("component_project_search")
+        if project_search and project_search.index is not None:
+            return project_search.index.root_dir
+        text_editor = self.manager.get_component("text_editor")
+        current_file = text_editor.get_current_tab_file_path() if text_editor else None
+        if current_file:
+            return os.path.dirname(os.path.abspath(current_file))
+        return os.getcwd()
+
+    def _start_refresh(self) -> None:
+        """在后台线程中刷新路径索引"""
+        self._refresh_id = None
+        if self.index is None:
+            return
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self.index.refresh, daemon=True)
+            self._worker.start()
+        if self._poll_id is None:
+            self._poll_id = self.manager.root.after(self.POLL_INTERVAL, self._poll_refresh)
+
+    def _poll_refresh(self) -> None:
+        self._poll_id = None
+        if self._worker is None:
+            return
+        if self._worker.is_alive():
+            self._poll_id = self.manager.root.after(self.POLL_INTERVAL, self._poll_refresh)
+            return
+        self._worker = None
+        if self.dialog is not None and self.dialog.winfo_viewable():
+            self._update_results()
+            self._refresh_id = self.manager.root.after(self.REFRESH_INTERVAL, self._start_refresh)
+
+    def _palette_entries(self) -> Iterable[PaletteEntry]:
+        """向命令面板提供已索引的文件"""
+        if self.index is None:
+            return
+        index = self.index
+        text_editor = self.manager.get_component("text_editor")
+        for rel_path in index.paths:
+            yield PaletteEntry(
+                f"文件: {rel_path}", "",
+                lambda path=index.absolute_path(rel_path): text_editor.open_file(path)
+            )
+
+    # ------------------------------------------------------------ 面板
+
+    def _create_dialog(self) -> None:
+        """创建快速打开面板"""
+        root = self.manager.root
+        self.dialog = tk.Toplevel(root)
+        self.dialog.title("快速打开")
+        self.dialog.transient(root)
+        self.dialog.resizable(False, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.hide)
+        self.widget = self.dialog
+
+        self.query_var = tk.StringVar(self.dialog)
+        self.entry = tk.Entry(self.dialog, textvariable=self.query_var, width=60)
+        self.entry.pack(fill=tk.X, padx=5, pady=5)
+        self.result_list = tk.Listbox(self.dialog, height=self.LIST_HEIGHT, activestyle=tk.NONE,
+                                      exportselection=False)
+        self.result_list.pack(fill=tk.BOTH, expand=True, padx=5)
+        self.status_label = tk.Label(self.dialog, text="", anchor=tk.W, fg="#6a737d")
+        self.status_label.pack(fill=tk.X, padx=5, pady=(0, 3))
+
+        self.query_var.trace_add("write", lambda *args: self._update_results())
+        self.entry.bind("<Down>", lambda e: self._move_selection(1))
+        self.entry.bind("<Up>", lambda e: self._move_selection(-1))
+        self.entry.bind("<Return>", lambda e: self.open_selected())
+        self.result_list.bind("<Double-Button-1>", lambda e: self.open_selected())
+        self.dialog.bind("<Escape>", lambda e: self.hide())
+
+    def show(self) -> None:
+        """打开快速打开面板；工作区变化时重建索引"""
+        if self.dialog is None:
+            self._create_dialog()
+        workspace = os.path.abspath(self._workspace_dir())
+        if self.index is None or self.index.root_dir != workspace:
+            # 旧工作区的扫描只写入旧索引，直接放弃即可，不在主线程上等待它结束
+            self._worker = None
+            self.index = PathIndex(workspace)
+            self.matcher = None
+            self._matcher_version = -1
+
+        root = self.manager.root
+        x = root.winfo_rootx() + max((root.winfo_width() - 480) // 2, 0)
+        y = root.winfo_rooty() + 40
+        self.dialog.geometry(f"+{x}+{y}")
+        self.dialog.deiconify()
+        self.dialog.lift()
+        self.entry.focus_set()
+        self.entry.select_range(0, tk.END)
+        self._update_results()
+        self._start_refresh()
+
+    def hide(self) -> None:
+        for after_id in (self._poll_id, self._refresh_id):
+            if after_id:
+                self.manager.root.after_cancel(after_id)
+        # 正在进行的扫描继续在后台完成，结果留待下次打开时使用
+        self._poll_id = self._refresh_id = None
+        if self.dialog is not None:
+            self.dialog.withdraw()
+        text_area_component = self.manager.get_component("text_area")
+        if text_area_component and text_area_component.text_area is not None:
+            text_area_component.text_area.focus_set()
+
+    def _update_results(self) -> None:
+        """按当前查询过滤路径；索引变化后重建匹配器"""
+        if self.index is None or self.result_list is None:
+            return
+        if self.matcher is None or self._matcher_version != self.index.version:
+            # 先读版本再读路径：扫描线程先替换路径后递增版本，读到的版本不会比路径新
+            self._matcher_version = self.index.version
+            self._paths = self.index.paths
+            self.matcher = FuzzyMatcher(self._paths)
+        self.results = self.matcher.match(self.query_var.get(), self.MAX_RESULTS)
+        self.result_list.delete(0, tk.END)
+        for i in self.results:
+            self.result_list.insert(tk.END, self._paths[i])
+        if self.results:
+            self.result_list.selection_set(0)
+            self.result_list.see(0)
+        scanning = "（正在扫描）" if self._worker is not None else ""
+        self.status_label.config(text=f"{self.index.root_dir}：{len(self._paths)} 个文件{scanning}")
+
+    def _move_selection(self, step: int) -> str:
+        if self.results:
+            selection = self.result_list.curselection()
+            current = selection[0] if selection else 0
+            new = min(max(current + step, 0), len(self.results) - 1)
+            self.result_list.selection_clear(0, tk.END)
+            self.result_list.selection_set(new)
+            self.result_list.see(new)
+        return "break"
+
+    def open_selected(self) -> None:
+        """关闭面板并打开选中的文件"""
+        selection = self.result_list.curselection()
+        if not selection or selection[0] >= len(self.results):
+            return
+        path = self.index.absolute_path(self._paths[self.results[selection[0]]])
+        self.hide()
+        text_editor = self.manager.get_component("text_editor")
+        if text_editor:
+            text_editor.open_file(path)
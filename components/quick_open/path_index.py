@@ -0,0 +1,70 @@
+import os
+from typing import Dict, List, Tuple
+
+from components.project_search.project_index import INDEXED_EXTENSIONS, SKIPPED_DIRS
+
+DirEntry = Tuple[int, List[str], List[str]]  # (目录 mtime_ns, 文件相对路径, 子目录绝对路径)
+
+
+class PathIndex:
+    """
+    工作区文件路径索引（内存中）
+
+    记录每个目录的 mtime：目录中增删或重命名条目时其 mtime 才会变化，
+    因此刷新时只需对每个目录做一次 stat，只有 mtime 变化的目录才重新列出。
+    刷新在后台线程中构建新表后整体替换，主线程读取的 paths 列表不会被原地修改。
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = os.path.abspath(root_dir)
+        self.paths: List[str] = []  # 相对路径，按字母顺序排列
+        self.version = 0  # 路径集合每变化一次加一
+        self._dirs: Dict[str, DirEntry] = {}  # {目录绝对路径: 目录条目}
+
+    def refresh(self) -> bool:
+        """按目录 mtime 同步路径表，返回路径集合是否变化"""
+        old_dirs = self._dirs
+        new_dirs: Dict[str, DirEntry] = {}
+        changed = False
+        stack = [self.root_dir]
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            entry = old_dirs.get(directory)
+            if entry is None or entry[0] != mtime_ns:
+                entry = self._list_directory(directory, mtime_ns)
+                changed = True
+            new_dirs[directory] = entry
+            stack.extend(entry[2])
+        if len(new_dirs) != len(old_dirs):
+            changed = True  # 有目录被删除
+
+        self._dirs = new_dirs
+        if changed:
+            self.paths = sorted(path for _, files, _ in new_dirs.values() for path in files)
+            self.version += 1
+        return changed
+
+    def _list_directory(self, directory: str, mtime_ns: int) -> DirEntry:
+        files = []
+        subdirs = []
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return mtime_ns, files, subdirs
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRS and not entry.name.startswith("."):
+                        subdirs.append(entry.path)
+                elif entry.name.lower().endswith(INDEXED_EXTENSIONS):
+                    files.append(os.path.relpath(entry.path, self.root_dir))
+            except OSError:
+                continue
+        return mtime_ns, files, subdirs
+
+    def absolute_path(self, rel_path: str) -> str:
+        return os.path.join(self.root_dir, rel_path)
@@ -0,0 +1,434 @@
+import queue
+import re
+import time
+import tkinter as tk
+from typing import List, Optional, Tuple
+
+from components.search.search_engine import (
+    Match, MatchIndex, SearchQuery, SearchWorker, replace_lines, search_line
+)
+from core.component_basic import ComponentBasic
+from core.component_manager import ComponentManager
+
+
+class ComponentSearch(ComponentBasic):
+    """
+    查找/替换组件
+
+    在后台线程中查找文本快照，匹配结果分批送回并写入按行组织的索引；
+    编辑时只重新查找受影响的行，高亮只作用于可见区域。匹配不跨行。
+    """
+
+    POLL_INTERVAL = 15  # 轮询后台结果的间隔（毫秒）
+    POLL_BUDGET = 0.010  # 每次轮询最多占用主线程的时间（秒）
+    QUERY_DELAY = 150  # 输入查找内容后的防抖延迟（毫秒）
+
+    def __init__(self, manager: ComponentManager):
+        super().__init__(
+            name="component_search",
+            manager=manager
+        )
+        self.dialog = None
+        self.find_var = None
+        self.replace_var = None
+        self.case_var = None
+        self.regex_var = None
+        self.status_label = None
+
+        self.text_widget: Optional[tk.Text] = None  # 正在查找的文本组件
+        self.query: Optional[SearchQuery] = None
+        self.pattern = None
+        self.index: Optional[MatchIndex] = None
+        self.current: Optional[Match] = None  # 当前选中的匹配
+        self._worker: Optional[SearchWorker] = None
+        self._results: Optional[queue.Queue] = None
+        self._snapshot_edits: List[Tuple[int, int, int]] = []  # 快照之后发生的编辑 [(start, old_end, new_end)]
+        self._poll_id = None
+        self._query_id = None
+        self._highlight_id = None
+
+        self.manager.subscribe("edit.find", self.show)
+        self.manager.subscribe("edit.replace", self.show_replace)
+        self.manager.subscribe("edit.find_next", self.find_next)
+        self.manager.subscribe("edit.find_previous", self.find_previous)
+        self.manager.subscribe("text_edited", self._on_text_edited)
+        self.manager.subscribe("text_scrolled", self._on_text_scrolled)
+        self.manager.subscribe("tab_switched", self._on_tab_switched)
+        self.manager.subscribe("tab_closing", self._on_tab_closing)
+
+    # ------------------------------------------------------------ 对话框
+
+    def _create_dialog(self) -> None:
+        """创建查找/替换对话框"""
+        root = self.manager.root
+        self.dialog = tk.Toplevel(root)
+        self.dialog.title("查找和替换")
+        self.dialog.transient(root)
+        self.dialog.resizable(False, False)
+        self.dialog.protocol("WM_DELETE_WINDOW", self.hide)
+        self.widget = self.dialog
+
+        self.find_var = tk.StringVar(self.dialog)
+        self.replace_var = tk.StringVar(self.dialog)
+        self.case_var = tk.BooleanVar(self.dialog, value=False)
+        self.regex_var = tk.BooleanVar(self.dialog, value=False)
+
+        tk.Label(self.dialog, text="查找:").grid(row=0, column=0, sticky=tk.W, padx=5, pady=3)
+        self.find_entry = tk.Entry(self.dialog, textvariable=self.find_var, width=36)
+        self.find_entry.grid(row=0, column=1, columnspan=2, sticky=tk.EW, padx=5, pady=3)
+        tk.Button(self.dialog, text="下一个", width=8, command=self.find_next).grid(row=0, column=3, padx=5, pady=3)
+
+        tk.Label(self.dialog, text="替换:").grid(row=1, column=0, sticky=tk.W, padx=5, pady=3)
+        self.replace_entry = tk.Entry(self.dialog, textvariable=self.replace_var, width=36)
+        self.replace_entry.grid(row=1, column=1, columnspan=2, sticky=tk.EW, padx=5, pady=3)
+        tk.Button(self.dialog, text="上一个", width=8, command=self.find_previous).grid(row=1, column=3, padx=5, pady=3)
+
+        tk.Checkbutton(self.dialog, text="区分大小写", variable=self.case_var,
+                       command=self._schedule_search).grid(row=2, column=1, sticky=tk.W, padx=5)
+        tk.Checkbutton(self.dialog, text="正则表达式", variable=self.regex_var,
+                       command=self._schedule_search).grid(row=2, column=2, sticky=tk.W, padx=5)
+        tk.Button(self.dialog, text="替换", width=8, command=self.replace_current).grid(row=2, column=3, padx=5, pady=3)
+
+        self.status_label = tk.Label(self.dialog, text="", anchor=tk.W, fg="#6a737d")
+        self.status_label.grid(row=3, column=0, columnspan=3, sticky=tk.EW, padx=5, pady=3)
+        tk.Button(self.dialog, text="全部替换", width=8, command=self.replace_all).grid(row=3, column=3, padx=5, pady=3)
+
+        self.find_var.trace_add("write", lambda *args: self._schedule_search())
+        for entry in (self.find_entry, self.replace_entry):
+            entry.bind("<Return>", lambda e: self.find_next())
+            entry.bind("<Shift-Return>", lambda e: self.find_previous())
+        self.dialog.bind("<Escape>", lambda e: self.hide())
+
+    def show(self) -> None:
+        """显示对话框（选中的单行文本作为查找内容）"""
+        if self.dialog is None:
+            self._create_dialog()
+        text_widget = self._get_active_text()
+        if text_widget is not None:
+            try:
+                selected = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
+                if selected and '\n' not in selected:
+                    self.find_var.set(selected)
+            except tk.TclError:
+                pass  # 没有选中文本
+        self.dialog.deiconify()
+        self.dialog.lift()
+        self.find_entry.focus_set()
+        self.find_entry.select_range(0, tk.END)
+        self._start_search()
+
+    def show_replace(self) -> None:
+        self.show()
+        self.replace_entry.focus_set()
+
+    def hide(self) -> None:
+        """关闭对话框并清除高亮"""
+        self._cancel_search()
+        self._clear_highlights()
+        self.index = None
+        self.current = None
+        if self.dialog is not None:
+            self.dialog.withdraw()
+        if self.text_widget is not None and self.text_widget.winfo_exists():
+            self.text_widget.focus_set()
+
+    def _set_status(self, text: str) -> None:
+        if self.status_label is not None:
+            self.status_label.config(text=text)
+
+    def _update_status(self) -> None:
+        if self.index is None:
+            return
+        searching = "（搜索中…）" if self._worker is not None else ""
+        self._set_status(f"共 {self.index.count} 处匹配{searching}")
+
+    # ------------------------------------------------------------ 查找
+
+    def _get_active_text(self) -> Optional[tk.Text]:
+        text_area_component = self.manager.get_component("text_area")
+        return text_area_component.text_area if text_area_component else None
+
+    def _schedule_search(self) -> None:
+        if self._query_id:
+            self.manager.root.after_cancel(self._query_id)
+        self._query_id = self.manager.root.after(self.QUERY_DELAY, self._start_search)
+
+    def _start_search(self) -> None:
+        """对当前文本组件的快照启动后台查找"""
+        self._query_id = None
+        self._cancel_search()
+        self._clear_highlights()
+        self.index = None
+        self.current = None
+
+        self.text_widget = self._get_active_text()
+        if self.text_widget is None or self.find_var is None or not self.find_var.get():
+            self._set_status("")
+            return
+
+        self.query = SearchQuery(self.find_var.get(), self.regex_var.get(), self.case_var.get())
+        try:
+            self.pattern = self.query.compile()
+        except re.error as e:
+            self.pattern = None
+            self._set_status(f"正则表达式错误: {e}")
+            return
+
+        snapshot = self.text_widget.get("1.0", "end-1c")
+        self.index = MatchIndex(snapshot.count('\n') + 1)
+        self._snapshot_edits = []
+        self._results = queue.Queue()
+        self._worker = SearchWorker(self.pattern, snapshot, self._results)
+        self._worker.start()
+        self._update_status()
+        self._poll_id = self.manager.root.after(self.POLL_INTERVAL, self._poll_results)
+
+    def _cancel_search(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._poll_id:
+            self.manager.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._results = None
+
+    def _poll_results(self) -> None:
+        """在主线程中取回后台查找结果，写入索引"""
+        self._poll_id = None
+        if self._results is None or self.index is None:
+            return
+
+        deadline = time.perf_counter() + self.POLL_BUDGET
+        received = False
+        while time.perf_counter() < deadline:
+            try:
+                item = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # 查找完成
+                self._worker = None
+                self._results = None
+                self._snapshot_edits = []
+                break
+            self._store_chunk(*item)
+            received = True
+
+        if received or self._worker is None:
+            self._update_status()
+            self._schedule_highlight()
+            if self.current is None:
+                self._select_first_after_cursor()
+        if self._results is not None:
+            self._poll_id = self.manager.root.after(self.POLL_INTERVAL, self._poll_results)
+
+    def _store_chunk(self, first: int, results) -> None:
+        """写入一块快照查找结果；快照之后被编辑过的行已在编辑时重新查找，予以跳过"""
+        if not self._snapshot_edits:
+            self.index.set_lines(first, results)
+            return
+        for offset, spans in enumerate(results):
+            line = self._map_snapshot_line(first + offset)
+            if line is not None:
+                self.index.set_line(line, spans)
+
+    def _map_snapshot_line(self, line: int) -> Optional[int]:
+        """将快照中的行号映射为当前行号，行已被编辑时返回 None"""
+        for start, old_end, new_end in self._snapshot_edits:
+            if line > old_end:
+                line += new_end - old_end
+            elif line >= start:
+                return None
+        return line
+
+    def _select_first_after_cursor(self) -> None:
+        """首次得到结果时选中光标之后的第一个匹配"""
+        if self.text_widget is None or not self.text_widget.winfo_exists():
+            return
+        line, column = map(int, self.text_widget.index(tk.INSERT).split('.'))
+        match = self.index.next_match(line, column, wrap=self._worker is None)
+        if match:
+            self._select_match(match)
+
+    def find_next(self) -> None:
+        """跳转到下一个匹配"""
+        if self.index is None:
+            self.show()
+            return
+        line, column = map(int, self.text_widget.index(tk.INSERT).split('.'))
+        if self.current and (line, column) == (self.current[0], self.current[1]):
+            column += 1  # 光标在当前匹配起点时跳到下一个
+        match = self.index.next_match(line, column)
+        self._on_navigate(match)
+
+    def find_previous(self) -> None:
+        """跳转到上一个匹配"""
+        if self.index is None:
+            self.show()
+            return
+        if self.current:
+            line, column = self.current[0], self.current[1]
+        else:
+            line, column = map(int, self.text_widget.index(tk.INSERT).split('.'))
+        match = self.index.previous_match(line, column)
+        self._on_navigate(match)
+
+    def _on_navigate(self, match: Optional[Match]) -> None:
+        if match:
+            self._select_match(match)
+        elif self._worker is not None:
+            self._set_status("搜索中…")
+        else:
+            self._set_status("未找到匹配")
+
+    def _select_match(self, match: Match) -> None:
+        """选中匹配并滚动到可见位置"""
+        self.current = match
+        line, start, end = match
+        start_index, end_index = f"{line}.{start}", f"{line}.{end}"
+        self.text_widget.tag_remove(tk.SEL, "1.0", tk.END)
+        self.text_widget.tag_add(tk.SEL, start_index, end_index)
+        self.text_widget.mark_set(tk.INSERT, end_index)
+        self.text_widget.see(start_index)
+        self._schedule_highlight()
+
+    # ------------------------------------------------------------ 增量维护
+
+    def _on_text_edited(self, text_widget: tk.Text, edit) -> None:
+        """只重新查找被编辑的行，其余行的匹配保持有效"""
+        if text_widget is not self.text_widget or self.index is None or self.pattern is None:
+            return
+        start, old_end, new_end = edit.start_line, edit.old_end_line, edit.new_end_line
+        lines = text_widget.get(f"{start}.0", f"{new_end}.end").split('\n')
+        self.index.apply_edit(start, old_end, new_end, [search_line(self.pattern, line) for line in lines])
+        if self._worker is not None:
+            self._snapshot_edits.append((start, old_end, new_end))
+        if self.current and not self.index.contains(self.current):
+            self.current = None
+        self._update_status()
+        self._schedule_highlight()
+
+    def _on_text_scrolled(self, fraction, line=None) -> None:
+        if self.index is not None:
+            self._schedule_highlight()
+
+    def _on_tab_switched(self, new_tab_frame: tk.Frame) -> None:
+        """对话框打开时在新标签页中重新查找"""
+        if self.dialog is not None and self.dialog.winfo_viewable():
+            self.manager.root.after_idle(self._start_search)
+
+    def _on_tab_closing(self, tab_name: str, tab_frame: tk.Frame) -> None:
+        """正在查找的标签页关闭时停止查找并丢弃匹配索引"""
+        if self.text_widget is None or self.text_widget.master is not tab_frame:
+            return
+        self._cancel_search()
+        self._clear_highlights()
+        self.text_widget = None
+        self.index = None
+        self.current = None
+        self._snapshot_edits = []
+
+    # ------------------------------------------------------------ 高亮
+
+    def _schedule_highlight(self) -> None:
+        if self._highlight_id is None:
+            self._highlight_id = self.manager.root.after_idle(self._highlight_visible)
+
+    def _highlight_visible(self) -> None:
+        """只为可见区域内的匹配打标签"""
+        self._highlight_id = None
+        text_widget = self.text_widget
+        if self.index is None or text_widget is None or not text_widget.winfo_exists():
+            return
+        self._configure_tags(text_widget)
+        text_widget.tag_remove("search_match", "1.0", tk.END)
+        text_widget.tag_remove("search_current", "1.0", tk.END)
+
+        first = int(text_widget.index("@0,0").split('.')[0])
+        last = int(text_widget.index(f"@0,{max(text_widget.winfo_height(), 1)}").split('.')[0])
+        ranges = []
+        for line, start, end in self.index.iter_range(first, last):
+            ranges.extend((f"{line}.{start}", f"{line}.{end}"))
+        if ranges:
+            text_widget.tag_add("search_match", *ranges)
+        if self.current and first <= self.current[0] <= last:
+            line, start, end = self.current
+            text_widget.tag_add("search_current", f"{line}.{start}", f"{line}.{end}")
+
+    @staticmethod
+    def _configure_tags(text_widget: tk.Text) -> None:
+        text_widget.tag_configure("search_match", background="#fff5b1")
+        text_widget.tag_configure("search_current", background="#ffab70")
+        # 显示在语法高亮之上、选中效果之下
+        text_widget.tag_raise("search_match")
+        text_widget.tag_raise("search_current")
+        text_widget.tag_raise(tk.SEL)
+
+    def _clear_highlights(self) -> None:
+        if self._highlight_id:
+            self.manager.root.after_cancel(self._highlight_id)
+            self._highlight_id = None
+        if self.text_widget is not None and self.text_widget.winfo_exists():
+            self.text_widget.tag_remove("search_match", "1.0", tk.END)
+            self.text_widget.tag_remove("search_current", "1.0", tk.END)
+
+    # ------------------------------------------------------------ 替换
+
+    def _replacement_for(self, line_text: str, start: int) -> Optional[str]:
+        """计算当前匹配的替换文本（正则模式支持分组引用）"""
+        m = self.pattern.match(line_text, start)
+        if not m:
+            return None
+        replacement = self.replace_var.get()
+        return m.expand(replacement) if self.query.regex else replacement
+
+    def replace_current(self) -> None:
+        """替换当前匹配并跳到下一个"""
+        if self.index is None or self.current is None or not self.index.contains(self.current):
+            self.find_next()
+            return
+        line, start, end = self.current
+        try:
+            new_text = self._replacement_for(self.text_widget.get(f"{line}.0", f"{line}.end"), start)
+        except re.error as e:
+            self._set_status(f"替换文本错误: {e}")
+            return
+        if new_text is None:
+            return
+        self.text_widget.edit_separator()
+        self.text_widget.replace(f"{line}.{start}", f"{line}.{end}", new_text)
+        self.text_widget.edit_separator()
+        self.text_widget.mark_set(tk.INSERT, f"{line}.{start + len(new_text)}")
+        self.current = None
+        self.find_next()
+
+    def replace_all(self) -> None:
+        """全部替换：在 Python 中计算结果，一次 Text 修改、一个撤销步骤"""
+        if self.find_var is None or not self.find_var.get():
+            return
+        text_widget = self._get_active_text()
+        if text_widget is None:
+            return
+        query = SearchQuery(self.find_var.get(), self.regex_var.get(), self.case_var.get())
+        try:
+            pattern = query.compile()
+            lines = text_widget.get("1.0", "end-1c").split('\n')
+            first, last, new_lines, count = replace_lines(query, pattern, lines, self.replace_var.get())
+        except re.error as e:
+            self._set_status(f"正则表达式错误: {e}")
+            return
+        if not count:
+            self._set_status("未找到匹配")
+            return
+
+        # 只替换首末变化行之间的区间，作为一个撤销步骤
+        autoseparators = text_widget.cget("autoseparators")
+        text_widget.config(autoseparators=False)
+        try:
+            text_widget.edit_separator()
+            text_widget.replace(f"{first}.0", f"{last}.end", "\n".join(new_lines))
+            text_widget.edit_separator()
+        finally:
+            text_widget.config(autoseparators=autoseparators)
+        self.current = None
+        self._set_status(f"已替换 {count} 处")
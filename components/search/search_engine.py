@@ -0,0 +1,159 @@
+import queue
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+
+Span = Tuple[int, int]  # (起始列, 结束列)
+Match = Tuple[int, int, int]  # (行号, 起始列, 结束列)，行号从1开始
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """查找条件"""
+    text: str
+    regex: bool = False
+    case_sensitive: bool = False
+
+    def compile(self) -> Pattern:
+        """编译为正则；正则语法错误时抛出 re.error"""
+        pattern = self.text if self.regex else re.escape(self.text)
+        return re.compile(pattern, 0 if self.case_sensitive else re.IGNORECASE)
+
+
+def search_line(pattern: Pattern, line: str) -> Tuple[Span, ...]:
+    """在单行内查找所有匹配（跳过空匹配）"""
+    return tuple(m.span() for m in pattern.finditer(line) if m.end() > m.start())
+
+
+def replace_lines(query: SearchQuery, pattern: Pattern, lines: List[str], replacement: str) -> Tuple[int, int, List[str], int]:
+    """
+    在文本行中执行全部替换
+
+    Returns:
+        (首个变化行号, 末个变化行号, 替换后的变化区间文本行, 替换次数)；无匹配时行号为 0
+    """
+    # 普通模式下替换文本按字面处理，正则模式支持 \\1 等分组引用
+    repl = replacement if query.regex else (lambda m: replacement)
+    first = last = 0
+    replaced: Dict[int, str] = {}
+    total = 0
+    for number, line in enumerate(lines, start=1):
+        if not pattern.search(line):
+            continue
+        new_line, count = pattern.subn(repl, line)
+        if count and new_line != line:
+            replaced[number] = new_line
+            total += count
+            first = first or number
+            last = number
+    if not first:
+        return 0, 0, [], 0
+    return first, last, [replaced.get(n, lines[n - 1]) for n in range(first, last + 1)], total
+
+
+class SearchWorker(threading.Thread):
+    """
+    后台查找线程 - 在文本快照上逐块查找，结果通过队列分批送回主线程
+
+    线程内不访问任何 Tk 对象；每块结果为 (起始行, 各行匹配列表)，结束时送回 None。
+    """
+
+    CHUNK_LINES = 2000
+
+    def __init__(self, pattern: Pattern, text: str, results: "queue.Queue"):
+        super().__init__(daemon=True)
+        self.pattern = pattern
+        self.text = text
+        self.results = results
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def run(self) -> None:
+        lines = self.text.split('\n')
+        self.text = None  # 释放快照
+        try:
+            for first in range(0, len(lines), self.CHUNK_LINES):
+                if self._cancelled.is_set():
+                    return
+                chunk = [search_line(self.pattern, line) for line in lines[first:first + self.CHUNK_LINES]]
+                self.results.put((first + 1, chunk))
+        finally:
+            self.results.put(None)
+
+
+class MatchIndex:
+    """
+    按行组织的匹配索引
+
+    _lines[i] 为第 i+1 行的匹配列表：None 表示尚未查找，空元组表示无匹配。
+    编辑时只需拼接受影响的行并重新查找这些行，其余行的匹配保持有效。
+    """
+
+    def __init__(self, line_count: int):
+        self._lines: List[Optional[Tuple[Span, ...]]] = [None] * line_count
+        self.count = 0  # 已知匹配总数
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def set_lines(self, first: int, results: List[Tuple[Span, ...]]) -> None:
+        """写入从 first 行开始的一段查找结果"""
+        old = self._lines[first - 1:first - 1 + len(results)]
+        self.count -= sum(len(spans) for spans in old if spans)
+        self._lines[first - 1:first - 1 + len(results)] = results
+        self.count += sum(len(spans) for spans in results)
+
+    def set_line(self, line: int, spans: Tuple[Span, ...]) -> None:
+        old = self._lines[line - 1]
+        self.count += len(spans) - (len(old) if old else 0)
+        self._lines[line - 1] = spans
+
+    def apply_edit(self, start: int, old_end: int, new_end: int, new_results: List[Tuple[Span, ...]]) -> None:
+        """旧文本的 start~old_end 行被替换为新文本的 start~new_end 行（已重新查找）"""
+        old = self._lines[start - 1:old_end]
+        self.count -= sum(len(spans) for spans in old if spans)
+        self._lines[start - 1:old_end] = new_results
+        self.count += sum(len(spans) for spans in new_results)
+
+    def spans_at(self, line: int) -> Tuple[Span, ...]:
+        if 1 <= line <= len(self._lines):
+            return self._lines[line - 1] or ()
+        return ()
+
+    def iter_range(self, first: int, last: int) -> Iterator[Match]:
+        """按顺序遍历 [first, last] 行内的匹配"""
+        first = max(first, 1)
+        last = min(last, len(self._lines))
+        for line in range(first, last + 1):
+            for start, end in self._lines[line - 1] or ():
+                yield line, start, end
+
+    def next_match(self, line: int, column: int, wrap: bool = True) -> Optional[Match]:
+        """查找位于 (line, column) 之后（含）的第一个匹配"""
+        for match in self.iter_range(line, len(self._lines)):
+            if match[0] > line or match[1] >= column:
+                return match
+        if wrap:
+            for match in self.iter_range(1, line):
+                return match
+        return None
+
+    def previous_match(self, line: int, column: int, wrap: bool = True) -> Optional[Match]:
+        """查找位于 (line, column) 之前的最后一个匹配"""
+        for number in range(min(line, len(self._lines)), 0, -1):
+            for start, end in reversed(self._lines[number - 1] or ()):
+                if number < line or start < column:
+                    return number, start, end
+        if wrap:
+            for number in range(len(self._lines), line - 1, -1):
+                spans = self._lines[number - 1]
+                if spans:
+                    return (number,) + spans[-1]
+        return None
+
+    def contains(self, match: Match) -> bool:
+        line, start, end = match
+        return (start, end) in self.spans_at(line)
@@ -0,0 +1,188 @@
+import os
+import tkinter as tk
+from typing import Dict, Optional
+
+from components.session.session_store import load_session, save_session
+from core.component_basic import ComponentBasic
+from core.component_manager import ComponentManager
+
+
+class ComponentSession(ComponentBasic):
+    """
+    会话保存与恢复组件
+
+    退出时记录打开的文件、各标签页的光标与滚动位置、窗口与窗格大小、侧边栏与字体设置；
+    启动时只立即读取当前标签页的文件，其余标签页在首次切换到时才读取。
+    """
+
+    def __init__(self, manager: ComponentManager, font_manager):
+        super().__init__(
+            name="component_session",
+            manager=manager
+        )
+        self.font_manager = font_manager
+        self._pending_tabs: Dict[str, dict] = {}  # 尚未读取内容的标签页 {标签名: 会话条目}
+        self._sash_x: Optional[int] = None  # 窗口映射后再恢复的窗格分隔位置
+
+        self.manager.subscribe("tab_switched", self._on_tab_switched)
+        self.manager.subscribe("tab_closing", self._on_tab_closing)
+        self.manager.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    # ------------------------------------------------------------ 恢复
+
+    def restore(self) -> bool:
+        """恢复上次的会话，没有可恢复的标签页时返回 False"""
+        session = load_session()
+        if not session:
+            return False
+        self._restore_window(session.get("window", {}))
+        self._restore_font(session.get("font", {}))
+
+        notebook = self.manager.get_component("component_notebook")
+        text_editor = self.manager.get_component("text_editor")
+        entries = []
+        for entry in session.get("tabs", []):
+            path = entry.get("path")
+            # 同名文件共用一个标签名（与 open_file 一致），只恢复第一个
+            if path and os.path.isfile(path) and notebook.get_tab_by_name(os.path.basename(path)) is None:
+                tab_name = os.path.basename(path)
+                entries.append((tab_name, entry))
+                notebook.add_tab(tab_name, select=False)
+                text_editor.set_file_path_for_tab(tab_name, path)
+                self._pending_tabs[tab_name] = entry
+        if not entries:
+            return False
+
+        # 当前标签页立即载入，其余标签页等切换时再载入
+        active = min(max(session.get("active", 0), 0), len(entries) - 1)
+        active_name = entries[active][0]
+        notebook.switch_tab_by_name(active_name)
+        self._load_tab(active_name, self._get_text_widget(active_name))
+        return True
+
+    def _restore_window(self, window: dict) -> None:
+        root = self.manager.root
+        if window.get("geometry"):
+            root.geometry(window["geometry"])
+        layout_manager = self.manager.layout_manager
+        with layout_manager.batch():
+            for section in ("sidebar_section", "right_sidebar_section"):
+                if window.get(section) is False:
+                    layout_manager.hide_section(section)
+        if window.get("render") is False:
+            status_component = self.manager.get_component("component_status")
+            if status_component and status_component.render_visible:
+                self.manager.publish("view.toggle_render_mode")
+        if window.get("sash") is not None:
+            # 窗格分隔位置需要在窗口完成布局之后才能设置
+            self._sash_x = window["sash"]
+            root.bind("<Map>", self._on_root_mapped, add="+")
+
+    def _on_root_mapped(self, event) -> None:
+        if event.widget is self.manager.root and self._sash_x is not None:
+            sash_x, self._sash_x = self._sash_x, None
+            paned_window = self.manager.layout_manager.paned_window
+            self.manager.root.after_idle(lambda: self._place_sash(paned_window, sash_x))
+
+    @staticmethod
+    def _place_sash(paned_window: tk.PanedWindow, sash_x: int) -> None:
+        if len(paned_window.panes()) > 1:
+            paned_window.sash_place(0, sash_x, 0)
+
+    def _restore_font(self, font_settings: dict) -> None:
+        family, size = self.font_manager.get_current_font()
+        new_family = font_settings.get("family")
+        new_size = font_settings.get("size")
+        if (new_family, new_size) != (family, size):
+            self.font_manager.set_font(
+                family=new_family if new_family != family else None,
+                size=new_size if new_size != size else None
+            )
+
+    def _on_tab_switched(self, new_tab_frame: tk.Frame) -> None:
+        """首次切换到尚未载入的标签页时读取文件"""
+        if not self._pending_tabs:
+            return
+        notebook = self.manager.get_component("component_notebook")
+        tab_name = notebook.get_current_tab_name()
+        if tab_name in self._pending_tabs:
+            self._load_tab(tab_name, self._get_text_widget(tab_name))
+
+    def _on_tab_closing(self, tab_name: str, tab_frame: tk.Frame) -> None:
+        self._pending_tabs.pop(tab_name, None)  # 从未切换过去的标签页不再需要读取
+
+    def _load_tab(self, tab_name: str, text_widget: Optional[tk.Text]) -> None:
+        """读取标签页的文件，并恢复光标与滚动位置"""
+        entry = self._pending_tabs.pop(tab_name, None)
+        if entry is None or text_widget is None:
+            return
+        try:
+            with open(entry["path"], "r", encoding="utf-8") as file:
+                content = file.read()
+        except (OSError, UnicodeDecodeError) as e:
+            status_component = self.manager.get_component("component_status")
+            if status_component:
+                status_component.set_status(f"无法恢复文件: {entry['path']} - {e}")
+            return
+        text_widget.delete("1.0", tk.END)
+        text_widget.insert("1.0", content)
+        text_widget.edit_reset()  # 载入文件不作为可撤销的编辑
+        text_widget.mark_set(tk.INSERT, entry.get("cursor", "1.0"))
+        text_widget.yview(f"{entry.get('top', 1)}.0")
+
+    def _get_text_widget(self, tab_name: str) -> Optional[tk.Text]:
+        notebook = self.manager.get_component("component_notebook")
+        text_area_component = self.manager.get_component("text_area")
+        frame = notebook.get_tab_by_name(tab_name)
+        return text_area_component.check_direct_text_child(frame) if frame else None
+
+    # ------------------------------------------------------------ 保存
+
+    def save(self) -> None:
+        """记录当前会话"""
+        notebook = self.manager.get_component("component_notebook")
+        text_editor = self.manager.get_component("text_editor")
+        current = notebook.get_current_tab_name() if notebook.notebook.tabs() else None
+        frame_names = {str(frame): name for name, frame in notebook._tabs.items()}
+
+        tabs = []
+        active = 0
+        for tab_id in notebook.notebook.tabs():
+            tab_name = frame_names.get(str(tab_id))
+            path = text_editor.get_file_path_for_tab(tab_name) if tab_name else None
+            if not path:
+                continue  # 未保存的文档不进入会话
+            if tab_name == current:
+                active = len(tabs)
+            entry = self._pending_tabs.get(tab_name)
+            if entry is None:
+                text_widget = self._get_text_widget(tab_name)
+                entry = {"path": os.path.abspath(path)}
+                if text_widget is not None:
+                    entry["cursor"] = text_widget.index(tk.INSERT)
+                    entry["top"] = int(text_widget.index("@0,0").split('.')[0])
+            tabs.append(entry)
+
+        layout_manager = self.manager.layout_manager
+        paned_window = layout_manager.paned_window
+        window = {
+            "geometry": self.manager.root.geometry(),
+            "sidebar_section": layout_manager.is_section_visible("sidebar_section"),
+            "right_sidebar_section": layout_manager.is_section_visible("right_sidebar_section"),
+            "render": layout_manager.is_section_visible("render_section"),
+            "sash": paned_window.sash_coord(0)[0] if len(paned_window.panes()) > 1 else None,
+        }
+        family, size = self.font_manager.get_current_font()
+        save_session({
+            "tabs": tabs,
+            "active": active,
+            "window": window,
+            "font": {"family": family, "size": size},
+        })
+
+    def _on_close(self) -> None:
+        """关闭窗口前保存会话"""
+        try:
+            self.save()
+        finally:
+            self.manager.root.destroy()
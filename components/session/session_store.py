@@ -0,0 +1,48 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import json
+import os
+from typing import Optional
+
+from utils.app_dirs import get_config_dir
+
+SESSION_FILE = "session.json"
+# 会话格式变化时递增，旧格式的会话文件直接忽略
+SESSION_VERSION = 1
+
+
+def session_path() -> str:
+    return os.path.join(get_config_dir(), SESSION_FILE)
+
+
+def load_session(path: Optional[str] = None) -> Optional[dict]:
+    """
+    读取会话文件
+
+    Returns:
+        会话字典：{"tabs": [{"path", "cursor", "top"}], "active": 序号, "window": {...}, "font": {...}}；
+        文件不存在、损坏或版本不符时返回 None
+    """
+    path = path or session_path()
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SESSION_VERSION:
+        return None
+    return data
+
+
+def save_session(data: dict, path: Optional[str] = None) -> None:
+    """以紧凑格式原子地写入会话文件"""
+    path = path or session_path()
+    data = dict(data, version=SESSION_VERSION)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"保存会话失败: {e}")
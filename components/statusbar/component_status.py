@@ -11,7 +11,6 @@ class ComponentStatus(ComponentBasic):
         self.toggle_button = None
         self.render_visible = True  # 跟踪渲染区域是否可见
         self.font_manager = font_manager
-        self._size = 12
         
         self._init_statusbar()
         self._bind_events()
@@ -92,6 +91,7 @@ class ComponentStatus(ComponentBasic):
     def _create_status_labels(self) -> None:
         """创建状态标签"""
         family, size = self.font_manager.get_current_font()
+        status_font = self.font_manager.get_named_font("status")
 
         # 左侧状态信息（在按钮右侧）
         self.status_labels['main'] = tk.Label(
@@ -99,7 +99,7 @@ class ComponentStatus(ComponentBasic):
             text="就绪", 
             anchor=tk.W,
             padx=5,
-            font=(family, self._size)
+            font=status_font
         )
         self.status_labels['main'].pack(side=tk.LEFT, fill=tk.X, expand=True)
         
@@ -109,7 +109,7 @@ class ComponentStatus(ComponentBasic):
             text="行 1, 列 1", 
             anchor=tk.E,
             padx=5,
-            font=(family, self._size)
+            font=status_font
         )
         self.status_labels['position'].pack(side=tk.RIGHT)
         
@@ -118,7 +118,7 @@ class ComponentStatus(ComponentBasic):
             text="UTF-8",
             anchor=tk.E,
             padx=5,
-            font=(family, self._size)
+            font=status_font
         )
         self.status_labels['encoding'].pack(side=tk.RIGHT)
 
@@ -127,7 +127,7 @@ class ComponentStatus(ComponentBasic):
             text=family,
             anchor=tk.E,
             padx=5,
-            font=(family, self._size)
+            font=status_font
         )
         self.status_labels['font'].pack(side=tk.RIGHT)
 
@@ -146,11 +146,7 @@ class ComponentStatus(ComponentBasic):
             self.status_labels['encoding'].config(text=encoding)
     
     def _on_font_changed(self, family: str, size: int):
-        for label in self.status_labels.values():
-            try:
-                label.config(font=(family, self._size))
-            except Exception as e:
-                print(f"应用字体到状态标签时出错: {e}")
+        # 标签引用命名字体，字体本身由 FontManager 统一更新，这里只需刷新显示的字体名
         self.status_labels["font"].config(text=family)
 
     def set_status(self, message: str) -> None:
@@ -0,0 +1,208 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import json
+import os
+import sys
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from utils.app_dirs import get_config_dir
+
+KEYMAP_FILE = "keymap.json"
+
+# 修饰键的别名与规范顺序
+MODIFIER_ALIASES = {
+    "Control": "Control", "Ctrl": "Control",
+    "Alt": "Alt", "Option": "Alt",
+    "Meta": "Meta", "Command": "Meta", "Cmd": "Meta",
+    "Shift": "Shift",
+}
+MODIFIER_ORDER = ("Control", "Alt", "Meta", "Shift")
+# 单个符号字符对应的 keysym 名称（Tk 允许在绑定中直接写字符，事件中则是名称）
+CHAR_KEYSYMS = {
+    "/": "slash", "\\": "backslash", "+": "plus", "-": "minus", "=": "equal",
+    "[": "bracketleft", "]": "bracketright", ",": "comma", ".": "period",
+    ";": "semicolon", "'": "apostrophe", "`": "grave",
+}
+
+# 事件 state 中各修饰键的位
+SHIFT_MASK = 0x1
+CONTROL_MASK = 0x4
+if sys.platform == "darwin":
+    ALT_MASK, META_MASK = 0x10, 0x8  # Option / Command
+elif sys.platform == "win32":
+    ALT_MASK, META_MASK = 0x20000, 0
+else:
+    ALT_MASK, META_MASK = 0x8, 0x40  # Mod1 / Mod4
+
+
+def normalize_sequence(sequence: str) -> Optional[str]:
+    """
+    把 Tk 按键序列规范化为键位表的键，如 "<Control-F>" 与 "<Control-Shift-f>" 均为 "Control-Shift-F"
+
+    Returns:
+        规范化后的键；无法识别时返回 None
+    """
+    sequence = sequence.strip()
+    if sequence.startswith('<') and sequence.endswith('>'):
+        sequence = sequence[1:-1]
+    if not sequence:
+        return None
+    # 主键本身可能是 "-"（如 "Control--"）
+    if sequence.endswith("--"):
+        fields, key = sequence[:-2].split('-'), "-"
+    else:
+        *fields, key = sequence.split('-')
+    modifiers = set()
+    for field in fields:
+        if field in ("Key", "KeyPress"):
+            continue
+        if field not in MODIFIER_ALIASES:
+            return None
+        modifiers.add(MODIFIER_ALIASES[field])
+    if not key:
+        return None
+    key = CHAR_KEYSYMS.get(key, key)
+    # 字母键的大小写与 Shift 等价
+    if len(key) == 1 and key.isalpha():
+        if key.isupper() or "Shift" in modifiers:
+            modifiers.add("Shift")
+            key = key.upper()
+        else:
+            key = key.lower()
+    return "-".join([m for m in MODIFIER_ORDER if m in modifiers] + [key])
+
+
+def event_sequence(event) -> str:
+    """把按键事件规范化为键位表的键（与 normalize_sequence 的结果格式一致）"""
+    modifiers = []
+    if event.state & CONTROL_MASK:
+        modifiers.append("Control")
+    if event.state & ALT_MASK:
+        modifiers.append("Alt")
+    if META_MASK and event.state & META_MASK:
+        modifiers.append("Meta")
+    key = event.keysym
+    shift = bool(event.state & SHIFT_MASK)
+    if len(key) == 1 and key.isalpha():
+        # 大小写只由 Shift 决定（忽略大写锁定）
+        key = key.upper() if shift else key.lower()
+    if shift:
+        modifiers.append("Shift")
+    return "-".join(modifiers + [key])
+
+
+def keymap_path() -> str:
+    return os.path.join(get_config_dir(), KEYMAP_FILE)
+
+
+def load_user_keymap(path: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    读取用户键位表
+
+    文件为 JSON 对象 {动作标识: 快捷键}，如 {"edit_menu:查找": "<Control-Shift-F>"}；
+    快捷键为 null 或空字符串表示取消该动作的快捷键。文件不存在或损坏时返回空表。
+    """
+    path = path or keymap_path()
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"读取键位表失败: {path} - {e}")
+        return {}
+    if not isinstance(data, dict):
+        logger.warning(f"键位表格式错误，应为 JSON 对象: {path}")
+        return {}
+    return {action_id: sequence for action_id, sequence in data.items()
+            if sequence is None or isinstance(sequence, str)}
+
+
+class KeyBinding(NamedTuple):
+    action_id: str
+    sequence: str  # 原始的 Tk 按键序列（用于显示）
+    callback: Callable
+    source: str  # "default" 或 "user"
+
+
+class Keymap:
+    """
+    快捷键表 - 规范化按键序列到动作的映射
+
+    冲突检测为一次字典查找；冲突时用户键位表中的设置优先，其余情况先注册者优先，
+    被忽略的一方记录在 conflicts 中并通过 on_conflict 回调报告。
+    """
+
+    def __init__(self, overrides: Optional[Dict[str, Optional[str]]] = None,
+                 on_conflict: Optional[Callable[[str, KeyBinding, KeyBinding], None]] = None):
+        self.overrides = overrides or {}
+        self.on_conflict = on_conflict
+        self._by_key: Dict[str, KeyBinding] = {}  # {规范化按键: 绑定}
+        self._by_action: Dict[str, str] = {}  # {动作标识: 规范化按键}
+        self.conflicts: List[tuple] = []  # [(规范化按键, 生效的动作标识, 被忽略的动作标识)]
+
+    def bind(self, action_id: str, sequence: Optional[str], callback: Callable) -> Optional[str]:
+        """
+        为动作绑定快捷键（用户键位表中有该动作时以用户设置为准）
+
+        Returns:
+            实际生效的按键序列；没有快捷键或在冲突中被忽略时返回 None
+        """
+        source = "default"
+        if action_id in self.overrides:
+            sequence, source = self.overrides[action_id], "user"
+        self.unbind(action_id)
+        if not sequence:
+            return None
+        key = normalize_sequence(sequence)
+        if key is None:
+            logger.warning(f"无法识别的快捷键 {sequence!r}（{action_id}）")
+            return None
+
+        binding = KeyBinding(action_id, sequence, callback, source)
+        existing = self._by_key.get(key)
+        if existing is not None:
+            if source == "user" and existing.source != "user":
+                del self._by_action[existing.action_id]
+                self._report(key, binding, existing)
+            else:
+                self._report(key, existing, binding)
+                return None
+        self._by_key[key] = binding
+        self._by_action[action_id] = key
+        return sequence
+
+    def unbind(self, action_id: str) -> None:
+        key = self._by_action.pop(action_id, None)
+        if key is not None:
+            del self._by_key[key]
+
+    def _report(self, key: str, winner: KeyBinding, loser: KeyBinding) -> None:
+        self.conflicts.append((key, winner.action_id, loser.action_id))
+        logger.warning(f"快捷键 {key} 冲突：{winner.action_id} 生效，忽略 {loser.action_id}")
+        if self.on_conflict:
+            self.on_conflict(key, winner, loser)
+
+    def is_available(self, sequence: str) -> bool:
+        """快捷键是否尚未被占用"""
+        key = normalize_sequence(sequence)
+        return key is not None and key not in self._by_key
+
+    def sequence_for(self, action_id: str) -> Optional[str]:
+        """动作当前生效的按键序列"""
+        key = self._by_action.get(action_id)
+        return self._by_key[key].sequence if key is not None else None
+
+    def lookup(self, key: str) -> Optional[KeyBinding]:
+        """
+        查找按键对应的绑定
+
+        非字母键的 Shift 往往只是输入该符号所需（如 Ctrl++），精确匹配失败时再忽略 Shift 查找一次。
+        """
+        binding = self._by_key.get(key)
+        if binding is None and "Shift-" in key:
+            main_key = key.rsplit('-', 1)[-1]
+            if not (len(main_key) == 1 and main_key.isalpha()):
+                binding = self._by_key.get(key.replace("Shift-", ""))
+        return binding
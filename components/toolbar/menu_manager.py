@@ -6,6 +6,24 @@ from tkinter import Menu
 import re
 from typing import Dict, List, Tuple, Callable, Optional
 
+from components.toolbar.keymap import Keymap, KeyBinding, event_sequence, load_user_keymap, normalize_sequence
+
+# 复制/粘贴/剪切与撤销/重做由文本组件的默认绑定处理，分发器不再重复触发
+NATIVE_SHORTCUTS = frozenset(
+    normalize_sequence(s) for s in ("<Control-c>", "<Control-v>", "<Control-x>", "<Control-z>", "<Control-y>")
+)
+
+
+def menu_action_id(menu_name: str) -> str:
+    """菜单按钮在键位表中的动作标识"""
+    return f"menu:{menu_name}"
+
+
+def item_action_id(menu_name: str, item_name: str) -> str:
+    """菜单项在键位表中的动作标识"""
+    return f"{menu_name}:{item_name}"
+
+
 class MenuManager:
     """菜单管理类"""
     def __init__(self, component_manager):
@@ -14,6 +32,28 @@ class MenuManager:
         self.menu_registry: Dict[str, Dict] = {}
         self.button_map: Dict[str, tk.Button] = {}
         self.active_button: Optional[tk.Button] = None
+        # 所有快捷键集中在键位表中，由根窗口上唯一的按键分发器触发
+        self.keymap = Keymap(load_user_keymap(), on_conflict=self._on_shortcut_conflict)
+        self.root.bind("<KeyPress>", self._dispatch_key, add="+")
+
+    def _dispatch_key(self, event) -> Optional[str]:
+        """按键分发：查找键位表并执行对应的动作"""
+        key = event_sequence(event)
+        binding = self.keymap.lookup(key)
+        if binding is None:
+            return None
+        if binding.source == "default" and normalize_sequence(binding.sequence) in NATIVE_SHORTCUTS:
+            return None
+        binding.callback()
+        return "break"
+
+    def _on_shortcut_conflict(self, key: str, winner: KeyBinding, loser: KeyBinding) -> None:
+        """在状态栏报告快捷键冲突"""
+        status_component = self.manager.get_component("component_status")
+        if status_component:
+            status_component.set_status(
+                f"快捷键 {self.format_shortcut(winner.sequence)} 冲突：{winner.action_id} 生效，已忽略 {loser.action_id}"
+            )
 
     def register_menu(self,
                      menu_name: str,
@@ -36,20 +76,12 @@ class MenuManager:
         btn.bind("<Enter>", lambda e: self.on_button_enter(btn))
         btn.bind("<Leave>", lambda e: self.on_button_leave(btn))
         
-        # 创建菜单对象
-        menu = Menu(toolbar_frame, tearoff=0)
-        menu_shortcut = "" if not self.is_shortcut_available(menu_shortcut, is_menu_shortcut=True) else menu_shortcut
+        # 创建菜单对象（菜单项在首次弹出时才创建）
+        menu = Menu(toolbar_frame, tearoff=0, postcommand=lambda: self._populate_menu(menu_name))
         item_configs = []
 
-        # 添加菜单项
+        # 记录菜单项
         for item_name, callback, item_shortcut in menu_items:
-            formatted_shortcut = self.format_shortcut(item_shortcut) if item_shortcut else ""
-            menu.add_command(
-                label=item_name,
-                accelerator=formatted_shortcut,
-                command=lambda cb=callback: self.on_menu_click(cb)
-            )
-            
             item_configs.append({
                 "name": item_name,
                 "callback": callback,
@@ -57,23 +89,46 @@ class MenuManager:
             })
 
         # 注册到菜单表
-        self.menu_registry[menu_name] = {
+        config = self.menu_registry[menu_name] = {
             "button": btn,
             "menu": menu,
             "items": item_configs,
-            "menu_shortcut": menu_shortcut
+            "menu_shortcut": menu_shortcut,
+            "populated": False
         }
         self.button_map[button_text] = btn
 
-        # 绑定菜单按钮的全局快捷键
-        if menu_shortcut:
-            self.root.bind(menu_shortcut, lambda e: self.show_menu(menu_name))
-
-        # 绑定所有菜单项的快捷键
+        # 登记菜单按钮与所有菜单项的快捷键（快捷键需立即可用，不依赖菜单项是否已创建）
+        config["menu_shortcut"] = self.keymap.bind(
+            menu_action_id(menu_name), menu_shortcut, lambda: self.show_menu(menu_name)
+        ) or ""
         for item in item_configs:
-            item_shortcut = item["shortcut"]
-            if item_shortcut and item_shortcut not in ["<Control-c>", "<Control-v>", "<Control-x>"]:
-                self.root.bind(item_shortcut, lambda e, cb=item["callback"]: cb())
+            self._bind_item(menu_name, item)
+
+    def _bind_item(self, menu_name: str, item: Dict) -> None:
+        """登记菜单项的快捷键（分隔线除外）"""
+        if item["callback"] is None:
+            return
+        self.keymap.bind(item_action_id(menu_name, item["name"]), item["shortcut"], item["callback"])
+
+    def _populate_menu(self, menu_name: str) -> None:
+        """首次弹出菜单时创建菜单项"""
+        config = self.menu_registry.get(menu_name)
+        if not config or config["populated"]:
+            return
+        config["populated"] = True
+        for item in config["items"]:
+            self._add_menu_entry(menu_name, config["menu"], item)
+
+    def _add_menu_entry(self, menu_name: str, menu: Menu, item: Dict) -> None:
+        """向菜单中添加一个菜单项（显示键位表中实际生效的快捷键）"""
+        shortcut = self.keymap.sequence_for(item_action_id(menu_name, item["name"]))
+        formatted_shortcut = self.format_shortcut(shortcut) if shortcut else ""
+        menu.add_command(
+            label=item["name"],
+            accelerator=formatted_shortcut,
+            command=lambda cb=item["callback"]: self.on_menu_click(cb)
+        )
 
     def show_menu(self, menu_name: str) -> None:
         """显示指定菜单"""
@@ -155,15 +210,9 @@ class MenuManager:
             return '+'.join(formatted_modifiers) + '+' + main_key.upper()
         return '+'.join(formatted_modifiers)
     
-    def is_shortcut_available(self, shortcut: str, is_menu_shortcut: bool) -> bool:
+    def is_shortcut_available(self, shortcut: str) -> bool:
         """检查快捷键是否可用"""
-        for config in self.menu_registry.values():
-            if is_menu_shortcut and config["menu_shortcut"] == shortcut:
-                return False
-            for item in config["items"]:
-                if not is_menu_shortcut and item["shortcut"] == shortcut:
-                    return False
-        return True
+        return self.keymap.is_available(shortcut)
 
     def extend_menu(self, menu_name: str, item_name: str, callback: Callable, shortcut: str = "") -> None:
         """动态扩展菜单项"""
@@ -171,20 +220,13 @@ class MenuManager:
             raise ValueError(f"菜单 {menu_name} 不存在")
         
         config = self.menu_registry[menu_name]
-        menu = config["menu"]
-        formatted_shortcut = self.format_shortcut(shortcut) if shortcut else ""
-        
-        menu.add_command(
-            label=item_name,
-            accelerator=formatted_shortcut,
-            command=lambda: self.on_menu_click(callback)
-        )
-        
-        config["items"].append({
+        item = {
             "name": item_name,
             "callback": callback,
             "shortcut": shortcut
-        })
-
-        if shortcut:
-            self.root.bind(shortcut, lambda e: callback())
\ No newline at end of file
+        }
+        config["items"].append(item)
+        self._bind_item(menu_name, item)
+        # 菜单已弹出过则立即追加，否则等首次弹出时统一创建
+        if config["populated"]:
+            self._add_menu_entry(menu_name, config["menu"], item)
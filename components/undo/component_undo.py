@@ -0,0 +1,162 @@
+import atexit
+import os
+import shutil
+import tempfile
+import tkinter as tk
+from typing import Dict, Optional, Set
+
+from components.undo.undo_history import UndoHistory
+from core.component_basic import ComponentBasic
+from core.component_manager import ComponentManager
+
+
+class ComponentUndo(ComponentBasic):
+    """
+    撤销/重做组件
+
+    替代 Tk 自带的撤销栈：订阅增量编辑流为每个文本组件记录历史，
+    文本组件的 edit undo/redo/separator/reset 命令由文本区域代理转交到这里，
+    因此 Ctrl+Z 等默认绑定以及 edit_separator() 的调用方无需改动。
+    """
+
+    MAX_MEMORY_BYTES = 4 * 1024 * 1024  # 每个文本组件在内存中保留的历史上限
+    MAX_SPILL_BYTES = 64 * 1024 * 1024  # 每个文本组件转存到磁盘的历史上限（压缩后）
+
+    def __init__(self, manager: ComponentManager):
+        super().__init__(
+            name="component_undo",
+            manager=manager
+        )
+        self._histories: Dict[tk.Text, UndoHistory] = {}  # 每个文本组件的历史 {text_widget: UndoHistory}
+        self._applying = False  # 正在执行撤销/重做，期间产生的编辑不记录
+        self._spill_root: Optional[str] = None  # 本次运行的转存目录（首次需要时创建）
+        self._modified: Set[tk.Text] = set()  # 载入或保存之后有过编辑的文本组件
+
+        # X11 默认只有 Ctrl+Shift+Z 触发重做，补上 Ctrl+Y
+        self.manager.root.event_add("<<Redo>>", "<Control-y>")
+
+        self.manager.subscribe("text_edited", self._on_text_edited)
+        self.manager.subscribe("edit.undo", lambda: self._on_menu_command("undo"))
+        self.manager.subscribe("edit.redo", lambda: self._on_menu_command("redo"))
+
+    def get_history(self, text_widget: tk.Text) -> UndoHistory:
+        """获取文本组件的历史，不存在时创建"""
+        history = self._histories.get(text_widget)
+        if history is None:
+            if self._spill_root is None:
+                self._spill_root = tempfile.mkdtemp(prefix="berrypad-undo-")
+                # 退出时删除转存目录
+                atexit.register(shutil.rmtree, self._spill_root, True)
+            history = UndoHistory(
+                max_bytes=self.MAX_MEMORY_BYTES,
+                spill_dir=os.path.join(self._spill_root, str(id(text_widget))),
+                max_spill_bytes=self.MAX_SPILL_BYTES
+            )
+            self._histories[text_widget] = history
+            text_widget.bind("<Destroy>", lambda event, w=text_widget: self._on_text_destroyed(event, w), add="+")
+        return history
+
+    def _on_text_destroyed(self, event, text_widget: tk.Text) -> None:
+        if event.widget is text_widget:
+            self._modified.discard(text_widget)
+            history = self._histories.pop(text_widget, None)
+            if history is not None:
+                history.close()
+
+    def _on_text_edited(self, text_widget: tk.Text, edit) -> None:
+        text_area_component = self.manager.get_component("text_area")
+        if text_area_component and text_area_component.is_loading(text_widget):
+            return  # 分块载入文件的插入不进入历史，载入结束后会清空历史
+        self._modified.add(text_widget)
+        if self._applying:
+            return
+        autoseparators = text_widget.tk.getboolean(text_widget.cget("autoseparators"))
+        self.get_history(text_widget).record(
+            edit.op, edit.index, edit.text,
+            autoseparators=autoseparators,
+            compound=edit.compound
+        )
+
+    def is_modified(self, text_widget: tk.Text) -> bool:
+        """文本组件在载入或上次保存之后是否有过编辑（撤销回原样仍视为已修改）"""
+        return text_widget in self._modified
+
+    def mark_saved(self, text_widget: tk.Text) -> None:
+        self._modified.discard(text_widget)
+
+    def _on_menu_command(self, command: str) -> None:
+        text_area_component = self.manager.get_component("text_area")
+        text_widget = text_area_component.text_area if text_area_component else None
+        if text_widget is not None:
+            self.handle_command(text_widget, command)
+
+    # ------------------------------------------------------------ edit 子命令
+
+    def handle_command(self, text_widget: tk.Text, command: str):
+        """
+        执行文本组件的 edit 子命令
+
+        Args:
+            command: undo / redo / separator / reset / canundo / canredo
+        """
+        history = self.get_history(text_widget)
+        if command == "separator":
+            history.separator()
+        elif command == "reset":
+            history.reset()
+            self._modified.discard(text_widget)  # 载入文件后都会清空历史
+        elif command == "canundo":
+            return history.can_undo()
+        elif command == "canredo":
+            return history.can_redo()
+        elif command == "undo":
+            self.undo(text_widget)
+        elif command == "redo":
+            self.redo(text_widget)
+        return ""
+
+    def undo(self, text_widget: tk.Text) -> bool:
+        """撤销一步，没有可撤销的内容时返回 False"""
+        group = self.get_history(text_widget).pop_undo()
+        if group is None:
+            return False
+        cursor = None
+        self._applying = True
+        try:
+            for op, index, text in reversed(group):
+                if op == "insert":
+                    text_widget.delete(index, f"{index}+{len(text)}c")
+                else:
+                    text_widget.insert(index, text)
+                cursor = index
+        finally:
+            self._applying = False
+        self._move_cursor(text_widget, cursor)
+        return True
+
+    def redo(self, text_widget: tk.Text) -> bool:
+        """重做一步，没有可重做的内容时返回 False"""
+        group = self.get_history(text_widget).pop_redo()
+        if group is None:
+            return False
+        cursor = None
+        self._applying = True
+        try:
+            for op, index, text in group:
+                if op == "insert":
+                    text_widget.insert(index, text)
+                    cursor = f"{index}+{len(text)}c"
+                else:
+                    text_widget.delete(index, f"{index}+{len(text)}c")
+                    cursor = index
+        finally:
+            self._applying = False
+        self._move_cursor(text_widget, cursor)
+        return True
+
+    def _move_cursor(self, text_widget: tk.Text, index: str) -> None:
+        text_widget.tag_remove(tk.SEL, "1.0", tk.END)
+        text_widget.mark_set(tk.INSERT, index)
+        text_widget.see(tk.INSERT)
+        line, column = text_widget.index(tk.INSERT).split('.')
+        self.manager.publish("text_cursor_moved", line=int(line), column=int(column) + 1)
@@ -0,0 +1,248 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import marshal
+import os
+import sys
+import tempfile
+import time
+import zlib
+from typing import List, Optional, Tuple
+
+UndoEdit = List[str]  # [操作, 起始索引, 文本]，操作为 'insert' 或 'delete'
+UndoGroup = List[UndoEdit]  # 一个撤销步骤内的编辑，按发生顺序排列
+
+EDIT_OVERHEAD = 120  # 每条编辑记录除文本外的大致内存开销（列表与索引字符串，字节）
+
+
+def parse_index(index: str) -> Tuple[int, int]:
+    line, column = index.split('.')
+    return int(line), int(column)
+
+
+def _group_size(group: UndoGroup) -> int:
+    """估算撤销步骤占用的内存（字节）"""
+    return sum(sys.getsizeof(text) + EDIT_OVERHEAD for _, _, text in group)
+
+
+def _is_word_boundary(before: str, after: str) -> bool:
+    """两个相邻字符之间是否为词边界（由非空白进入空白）"""
+    return after.isspace() and not before.isspace()
+
+
+class UndoHistory:
+    """
+    基于增量编辑流的撤销/重做历史
+
+    - 连续的单字符输入/删除按词合并为一个撤销步骤（空白、换行、停顿、光标跳转处断开）；
+    - autoseparators 关闭时，两次 separator() 之间的全部编辑合并为一个步骤；
+    - 内存按字节而不是步数限制，超出时最旧的步骤压缩后转存到磁盘（未指定目录时直接丢弃），
+      撤销到底时再按需读回。
+    """
+
+    COALESCE_TIMEOUT = 1.5  # 两次按键间隔超过该秒数时开始新的撤销步骤
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024, spill_dir: Optional[str] = None,
+                 max_spill_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self._undo: List[UndoGroup] = []
+        self._redo: List[UndoGroup] = []
+        self._bytes = 0  # 内存中撤销与重做步骤的总大小
+        self._open = False  # 栈顶步骤是否还能合并后续编辑
+        self._last_time = 0.0
+        self._segments: List[Tuple[str, int]] = []  # 已转存到磁盘的旧步骤 [(文件路径, 压缩后大小)]，从旧到新
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def spilled_bytes(self) -> int:
+        return sum(size for _, size in self._segments)
+
+    def can_undo(self) -> bool:
+        return bool(self._undo or self._segments)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    # ------------------------------------------------------------ 记录
+
+    def separator(self) -> None:
+        """结束当前撤销步骤"""
+        self._open = False
+
+    def record(self, op: str, index: str, text: str, autoseparators: bool = True,
+               compound: bool = False, now: Optional[float] = None) -> None:
+        """
+        记录一次编辑
+
+        Args:
+            op: 'insert' 或 'delete'
+            index: 编辑起始位置（规范化的 "行.列" 索引）
+            text: 插入或被删除的文本
+            autoseparators: 是否按词自动划分撤销步骤；关闭时只在 separator() 处划分
+            compound: 是否与上一次编辑属于同一个操作（如 replace 的插入部分）
+        """
+        if not text:
+            return
+        now = time.monotonic() if now is None else now
+        if self._redo:
+            self._bytes -= sum(_group_size(group) for group in self._redo)
+            self._redo.clear()
+
+        top = self._undo[-1] if self._undo else None
+        if top is not None and (compound or (self._open and not autoseparators)):
+            self._append(top, [op, index, text])
+        elif (top is not None and autoseparators and self._open
+              and now - self._last_time < self.COALESCE_TIMEOUT
+              and self._coalesce(top, op, index, text)):
+            pass
+        else:
+            group = [[op, index, text]]
+            self._undo.append(group)
+            self._bytes += _group_size(group)
+
+        # 多字符编辑（粘贴、替换）自成一步；关闭自动分隔时保持打开直到 separator()
+        self._open = not autoseparators or (len(text) == 1 and text != '\n')
+        self._last_time = now
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def _append(self, group: UndoGroup, edit: UndoEdit) -> None:
+        group.append(edit)
+        self._bytes += _group_size([edit])
+
+    def _coalesce(self, group: UndoGroup, op: str, index: str, text: str) -> bool:
+        """尝试把单字符编辑合并到步骤的最后一条编辑中"""
+        if len(text) != 1 or text == '\n':
+            return False
+        last = group[-1]
+        last_op, last_index, last_text = last
+        if op != last_op or '\n' in last_text:
+            return False
+        line, column = parse_index(index)
+        last_line, last_column = parse_index(last_index)
+        if line != last_line:
+            return False
+
+        if op == "insert":
+            # 紧接在上次插入之后输入
+            if column != last_column + len(last_text) or _is_word_boundary(last_text[-1], text):
+                return False
+            merged = [op, last_index, last_text + text]
+        elif column == last_column - 1:
+            # 退格：删除位置逐步前移
+            if _is_word_boundary(text, last_text[0]):
+                return False
+            merged = [op, index, text + last_text]
+        elif column == last_column:
+            # 向后删除：删除位置不变
+            if _is_word_boundary(last_text[-1], text):
+                return False
+            merged = [op, last_index, last_text + text]
+        else:
+            return False
+
+        self._bytes += _group_size([merged]) - _group_size([last])
+        group[-1] = merged
+        return True
+
+    # ------------------------------------------------------------ 撤销/重做
+
+    def pop_undo(self) -> Optional[UndoGroup]:
+        """取出最近的撤销步骤（移入重做栈），没有时返回 None"""
+        self._open = False
+        if not self._undo and self._segments:
+            self._load_segment()
+        if not self._undo:
+            return None
+        group = self._undo.pop()
+        self._redo.append(group)
+        return group
+
+    def pop_redo(self) -> Optional[UndoGroup]:
+        """取出最近的重做步骤（移回撤销栈），没有时返回 None"""
+        self._open = False
+        if not self._redo:
+            return None
+        group = self._redo.pop()
+        self._undo.append(group)
+        return group
+
+    def reset(self) -> None:
+        """清空全部历史（包括磁盘上的转存）"""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+        self._open = False
+        for path, _ in self._segments:
+            self._remove_file(path)
+        self._segments.clear()
+
+    close = reset
+
+    # ------------------------------------------------------------ 内存上限与转存
+
+    def _evict(self) -> None:
+        """将最旧的撤销步骤移出内存，直到占用降到上限的四分之三（栈顶步骤始终保留）"""
+        target = self.max_bytes * 3 // 4
+        count = 0
+        freed = 0
+        while count < len(self._undo) - 1 and self._bytes - freed > target:
+            freed += _group_size(self._undo[count])
+            count += 1
+        if not count:
+            return
+        evicted = self._undo[:count]
+        del self._undo[:count]
+        self._bytes -= freed
+        if self.spill_dir is not None:
+            self._spill(evicted)
+
+    def _spill(self, groups: List[UndoGroup]) -> None:
+        """压缩写入磁盘；总大小超出限制时丢弃最旧的转存"""
+        data = zlib.compress(marshal.dumps(groups), 1)
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix="undo-", suffix=".bin", dir=self.spill_dir)
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+        except OSError as e:
+            logger.warning(f"撤销历史转存失败，丢弃最旧的 {len(groups)} 步: {e}")
+            # 更早的转存已无法与剩余步骤衔接，一并丢弃
+            for old_path, _ in self._segments:
+                self._remove_file(old_path)
+            self._segments.clear()
+            return
+        self._segments.append((path, len(data)))
+        while len(self._segments) > 1 and self.spilled_bytes > self.max_spill_bytes:
+            old_path, _ = self._segments.pop(0)
+            self._remove_file(old_path)
+
+    def _load_segment(self) -> None:
+        """读回最近一次转存的步骤"""
+        path, _ = self._segments.pop()
+        try:
+            with open(path, "rb") as file:
+                groups = marshal.loads(zlib.decompress(file.read()))
+        except (OSError, ValueError, EOFError, zlib.error) as e:
+            logger.warning(f"读取撤销历史转存失败: {e}")
+            # 更早的转存无法与当前文本衔接，一并丢弃
+            for old_path, _ in self._segments:
+                self._remove_file(old_path)
+            self._segments.clear()
+            return
+        finally:
+            self._remove_file(path)
+        self._undo[:0] = groups
+        self._bytes += sum(_group_size(group) for group in groups)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
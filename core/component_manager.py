@@ -1,7 +1,7 @@
 import logging
 logger = logging.getLogger(__name__)
 
-from typing import Dict
+from typing import Callable, Dict
 import tkinter as tk
 from core.event_bus import EventBus
 
@@ -12,6 +12,7 @@ class ComponentManager(EventBus):
         self.root = root
         self.layout_manager = layout_manager
         self._components: Dict = {}
+        self._factories: Dict[str, Callable] = {}  # 延迟创建的组件 {组件名: 工厂函数}
         
     def register_component(self, component) -> bool:
         """注册组件"""
@@ -27,14 +28,33 @@ class ComponentManager(EventBus):
             component.init_hook()
         return True
     
+    def register_lazy(self, name: str, factory: Callable) -> None:
+        """注册延迟创建的组件，首次 get_component 时才调用工厂函数"""
+        if name not in self._components:
+            self._factories[name] = factory
+
+    def is_registered(self, name: str) -> bool:
+        """组件是否已注册（包括尚未创建的延迟组件）"""
+        return name in self._components or name in self._factories
+
     def get_component(self, name: str) -> tk.Widget:
-        """获取组件类"""
-        return self._components.get(name, None)
+        """获取组件类（延迟组件在此时创建）"""
+        component = self._components.get(name, None)
+        if component is None and name in self._factories:
+            factory = self._factories.pop(name)
+            component = factory()
+            # 工厂创建的组件通常会在构造时自动注册，这里兜底
+            if name not in self._components:
+                self._components[name] = component
+        return component
     
     def remove_component(self, name: str) -> bool:
         """移除组件"""
         if name in self._components:
             del self._components[name]
             return True
+        if name in self._factories:
+            del self._factories[name]
+            return True
         return False
 
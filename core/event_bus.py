@@ -19,8 +19,9 @@ class EventBus:
     
     def unsubscribe(self, event_type: str, callback: Callable) -> None:
         """取消订阅事件"""
-        if event_type in self._subscribers:
-            self._subscribers[event_type].remove(callback)
+        callbacks = self.subscribers.get(event_type)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
 
     def publish(self, event_name: str, **payload) -> None:
         logger.info(f"发布事件: {event_name}")
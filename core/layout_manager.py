@@ -2,6 +2,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 import tkinter as tk
+from contextlib import contextmanager
 from dataclasses import dataclass
 from typing import Dict
 
@@ -13,6 +14,17 @@ class LayoutSection:
     anchor: str  # 位置标记：'top'、'left'、'right'、'bottom'、'main'
     visible: bool = True
 
+# 各停靠位置在根窗口网格中的位置
+ANCHOR_GRID = {
+    "top": {"row": 0, "column": 0, "columnspan": 4},
+    "bottom": {"row": 2, "column": 0, "columnspan": 4},
+    "left": {"row": 1, "column": 0},
+    "right": {"row": 1, "column": 3},
+}
+# 位于主区域可调整窗格中的停靠位置
+PANED_ANCHORS = ("main_left", "main_right")
+SIDEBAR_MINSIZE = 50  # 侧边栏列显示时的最小宽度
+
 class LayoutManager:
     def __init__(self, root: tk.Tk):
         self.root = root
@@ -20,7 +32,11 @@ class LayoutManager:
         self.layout_engine = "grid"  # 支持 grid 或 pack
         self._container_cache = {}
         self.paned_window = None  # 用于主区域的可调整大小窗格
-        self._setup_main_sections()
+        self._batch_depth = 0  # 嵌套的批量修改层数
+        self._pending: Dict[str, bool] = {}  # 批量修改期间待应用的显示状态 {区域名: 是否显示}
+        self._configure_grid()
+        with self.batch():
+            self._setup_main_sections()
         
     def _setup_main_sections(self):
         """创建基础布局区域"""
@@ -34,7 +50,7 @@ class LayoutManager:
         self.add_section("sidebar_section", tk.Frame(self.root), "left")
         
         # 右侧侧边栏区域
-        self.add_section("sidebar_section", tk.Frame(self.root), "right")
+        self.add_section("right_sidebar_section", tk.Frame(self.root), "right")
         
         # 创建主内容区域的可调整窗格
         self._create_main_paned_window()
@@ -52,80 +68,106 @@ class LayoutManager:
         # 将窗格放在主区域位置
         self.paned_window.grid(row=1, column=1, columnspan=2, sticky="nsew")
 
-        # 创建左右侧渲染区域
-        main_left_frame = tk.Frame(self.paned_window)
-        main_right_frame = tk.Frame(self.paned_window)
-        
-        # 添加到窗格中
-        self.paned_window.add(main_left_frame, stretch="always", minsize=200)
-        self.paned_window.add(main_right_frame, stretch="always", minsize=200)
-        
-        # 添加到sections中
-        self.add_section("main_section", main_left_frame, "main_left")
-        self.add_section("render_section", main_right_frame, "main_right")
-    
-    def add_section(self, name: str, container: tk.Widget, anchor: str):
-        """添加新的布局区域"""
-        section = LayoutSection(name, container, anchor)
-        self.sections[name] = section
-        self._arrange_all_sections()
-        return section
+        # 添加左右侧区域（由 add_section 放入窗格）
+        self.add_section("main_section", tk.Frame(self.paned_window), "main_left")
+        self.add_section("render_section", tk.Frame(self.paned_window), "main_right")
     
-    def _arrange_all_sections(self):
-        """重新排列所有布局区域"""
-        # 清除当前布局（除了paned_window）
-        for child in self.root.winfo_children():
-            if child != self.paned_window:
-                child.grid_forget()
-                child.pack_forget()
-        
-        # 网格布局引擎
-        self._arrange_with_grid()
-    
-    def _arrange_with_grid(self):
-        """使用网格布局引擎排列各区域"""
-        # 配置网格权重
+    def _configure_grid(self):
+        """配置根窗口网格的行列权重（只需一次）"""
         self.root.grid_rowconfigure(0, weight=0, minsize=30)   # 顶部区域行 - 固定大小
         self.root.grid_rowconfigure(1, weight=1)  # 主区域行 - 弹性
         self.root.grid_rowconfigure(2, weight=0, minsize=25)    # 底部区域行 - 固定大小
-        self.root.grid_columnconfigure(0, weight=0, minsize=50)  # 左侧边栏列 - 固定最小大小
+        self.root.grid_columnconfigure(0, weight=0, minsize=SIDEBAR_MINSIZE)  # 左侧边栏列 - 固定最小大小
         self.root.grid_columnconfigure(1, weight=1)  # 主区域左列 - 弹性
         self.root.grid_columnconfigure(2, weight=1)  # 主区域右列 - 弹性
-        self.root.grid_columnconfigure(3, weight=0, minsize=50)  # 右侧边栏列 - 固定最小大小
-        
-        # 排列各个区域
-        for section in self.sections.values():
-            if not section.visible: 
-                continue
-            
-            if section.anchor == "top":
-                section.container.grid(row=0, column=0, columnspan=4, sticky="nsew")
-            elif section.anchor == "bottom":
-                section.container.grid(row=2, column=0, columnspan=4, sticky="nsew")
-            elif section.anchor == "left":
-                section.container.grid(row=1, column=0, sticky="nsew")
-            elif section.anchor == "right":
-                section.container.grid(row=1, column=3, sticky="nsew")
-    
-    def toggle_render_area(self, visible: bool): # TODO: 是否要合并进hide_section() 
+        self.root.grid_columnconfigure(3, weight=0, minsize=SIDEBAR_MINSIZE)  # 右侧边栏列 - 固定最小大小
+
+    def add_section(self, name: str, container: tk.Widget, anchor: str, visible: bool = True):
+        """添加新的布局区域（只放置该区域本身）"""
+        if name in self.sections:
+            raise ValueError(f"布局区域已存在: {name}")
+        section = LayoutSection(name, container, anchor, visible=False)
+        self.sections[name] = section
+        self._set_visible(name, visible)
+        return section
+
+    @contextmanager
+    def batch(self):
+        """批量修改布局：期间的显示/隐藏只做记录，结束时一次性应用，并统一计算一次几何"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._flush()
+
+    def _set_visible(self, name: str, visible: bool) -> None:
+        if self._batch_depth:
+            self._pending[name] = visible
+        else:
+            self._apply(self.sections[name], visible)
+
+    def _flush(self) -> None:
+        """应用批量修改期间记录的显示状态"""
+        pending, self._pending = self._pending, {}
+        changed = False
+        for name, visible in pending.items():
+            changed = self._apply(self.sections[name], visible) or changed
+        # 窗口尚未显示时，首次映射本身就会计算几何
+        if changed and self.root.winfo_ismapped():
+            self.root.update_idletasks()
+
+    def _apply(self, section: LayoutSection, visible: bool) -> bool:
+        """放置或移除单个区域，状态未变化时不做任何事；返回是否有变化"""
+        if section.visible == visible:
+            return False
+        section.visible = visible
+        container = section.container
+        if section.anchor in ANCHOR_GRID:
+            if visible:
+                container.grid(sticky="nsew", **ANCHOR_GRID[section.anchor])
+            else:
+                container.grid_remove()
+            if section.anchor in ("left", "right"):
+                # 隐藏侧边栏时让出该列的最小宽度
+                column = ANCHOR_GRID[section.anchor]["column"]
+                self.root.grid_columnconfigure(column, minsize=SIDEBAR_MINSIZE if visible else 0)
+        elif section.anchor in PANED_ANCHORS:
+            if visible:
+                self.paned_window.add(container, stretch="always", minsize=200)
+            else:
+                self.paned_window.forget(container)
+        return True
+
+    def toggle_render_area(self, visible: bool):
+        """显示或隐藏渲染区域"""
         if visible:
-            self.sections["render_section"].visible = True
-            self.paned_window.add(self.sections["render_section"].container, stretch="always", minsize=200)
+            self.show_section("render_section")
         else:
-            self.sections["render_section"].visible = False
-            self.paned_window.forget(self.sections["render_section"].container)
+            self.hide_section("render_section")
 
     def show_section(self, name: str):
         """显示指定区域"""
         if name in self.sections:
-            self.sections[name].visible = True
-            self._arrange_all_sections()
+            self._set_visible(name, True)
     
     def hide_section(self, name: str):
         """隐藏指定区域"""
         if name in self.sections:
-            self.sections[name].visible = False
-            self._arrange_all_sections()
+            self._set_visible(name, False)
+
+    def toggle_section(self, name: str) -> bool:
+        """切换指定区域的显示状态，返回切换后是否显示"""
+        if name not in self.sections:
+            return False
+        visible = not self._pending.get(name, self.sections[name].visible)
+        self._set_visible(name, visible)
+        return visible
+
+    def is_section_visible(self, name: str) -> bool:
+        section = self.sections.get(name)
+        return bool(section and self._pending.get(name, section.visible))
     
     def get_container(self, section_name: str) -> tk.Widget:
         """获取指定布局区域的容器"""
@@ -0,0 +1,80 @@
+import logging
+logger = logging.getLogger(__name__)
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# 设置该环境变量后，首次按键时将启动时间线写入对应的 JSON 文件
+PROFILE_ENV = "BERRYPAD_STARTUP_PROFILE"
+
+
+class StartupProfiler:
+    """启动时间线记录器 - 记录各组件构造耗时、首次绘制与首次按键时间"""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        self.records: List[Dict] = []  # [{"name", "start", "duration"}]，时间单位为毫秒
+        self._milestones: Dict[str, float] = {}
+
+    def elapsed(self) -> float:
+        """距离启动的毫秒数"""
+        return (time.perf_counter() - self._origin) * 1000
+
+    @contextmanager
+    def measure(self, name: str):
+        """记录代码块的耗时"""
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            self.records.append({"name": name, "start": start, "duration": self.elapsed() - start})
+
+    def mark(self, name: str) -> None:
+        """记录一个里程碑（只记录第一次）"""
+        if name not in self._milestones:
+            self._milestones[name] = self.elapsed()
+            logger.info(f"启动里程碑: {name} @ {self._milestones[name]:.1f} ms")
+
+    def get_milestone(self, name: str) -> Optional[float]:
+        """获取里程碑时间（毫秒），未到达时返回 None"""
+        return self._milestones.get(name)
+
+    def watch(self, root) -> None:
+        """监听首次绘制与首次按键"""
+        def on_map(event):
+            if event.widget is root:
+                # 映射后的第一个空闲回调即首帧绘制完成
+                root.after_idle(lambda: self.mark("first_paint"))
+
+        def on_key(event):
+            if self.get_milestone("first_keystroke") is None:
+                self.mark("first_keystroke")
+                self.report()
+
+        root.bind("<Map>", on_map, add="+")
+        # 快捷键分发器同样绑定在根窗口标签上，执行动作后返回 "break" 会跳过 all 标签；
+        # 因此须在创建菜单管理器之前调用，使此处的绑定排在分发器之前
+        root.bind("<KeyPress>", on_key, add="+")
+        root.bind_all("<KeyPress>", on_key, add="+")  # 其他顶层窗口（对话框）中的按键
+
+    def to_dict(self) -> Dict:
+        """导出为可序列化的时间线"""
+        return {"components": list(self.records), "milestones": dict(self._milestones)}
+
+    def report(self) -> None:
+        """输出启动时间线；设置了环境变量时同时写入 JSON 文件"""
+        for record in sorted(self.records, key=lambda r: r["duration"], reverse=True):
+            logger.info(f"启动耗时: {record['name']:<24} {record['duration']:8.1f} ms")
+        for name, at in sorted(self._milestones.items(), key=lambda item: item[1]):
+            logger.info(f"启动里程碑: {name:<22} @ {at:8.1f} ms")
+
+        output_path = os.environ.get(PROFILE_ENV)
+        if output_path:
+            try:
+                with open(output_path, 'w', encoding='utf-8') as file:
+                    json.dump(self.to_dict(), file, indent=2)
+            except OSError as e:
+                logger.error(f"写入启动时间线失败: {e}")
@@ -31,9 +31,13 @@ def configure_logging(level: int = logging.INFO) -> None:
     root_logger.addHandler(console_handler)
 logger = logging.getLogger(__name__)
 
-from app import MarkdownEditorApp
-
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # 带子命令时以无界面模式运行（如 export），不导入任何 GUI 组件
+        from cli import main
+        sys.exit(main(sys.argv[1:]))
+
+    from app import MarkdownEditorApp
     configure_logging(logging.DEBUG)  # 设置日志级别为DEBUG
     app = MarkdownEditorApp()
     app.run()
\ No newline at end of file
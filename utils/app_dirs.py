@@ -0,0 +1,32 @@
+import os
+import sys
+
+APP_NAME = "berrypad"
+
+
+def get_cache_dir() -> str:
+    """获取应用缓存目录（不存在时自动创建）"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        path = os.path.join(base, APP_NAME, "Cache")
+    elif sys.platform == "darwin":
+        path = os.path.expanduser(f"~/Library/Caches/{APP_NAME}")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def get_config_dir() -> str:
+    """获取应用配置目录（不存在时自动创建）"""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+        path = os.path.join(base, APP_NAME)
+    elif sys.platform == "darwin":
+        path = os.path.expanduser(f"~/Library/Application Support/{APP_NAME}")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+        path = os.path.join(base, APP_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path